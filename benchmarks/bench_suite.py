@@ -0,0 +1,190 @@
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add src path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import feature_engineering as fe
+import anomaly_detection as ad
+import downsampling as ds
+from indicators import risk_score as rs
+from synthetic import synthetic_prices, synthetic_indicators, synthetic_volatility
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+FULL_ROWS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+FULL_COLS = [1, 10, 100, 1_000]
+QUICK_ROWS = [1_000, 10_000, 100_000]
+QUICK_COLS = [1, 10]
+
+
+# --- Benchmark cases ---
+# Each case maps (rows, cols) to a zero-argument callable. Per-series functions
+# are applied column by column, which is how callers use them on a panel today.
+
+def _per_column(func, df, *args):
+    return {col: func(df[col], *args) for col in df.columns}
+
+
+def _fitted_model(rows, cols):
+    return ad.train_isolation_forest(synthetic_volatility(min(rows, 100_000), cols))
+
+
+CASES = {
+    "feature_engineering.volatility_index": lambda r, c: (
+        lambda df=synthetic_prices(r, c): _per_column(fe.volatility_index, df)),
+    "feature_engineering.moving_average": lambda r, c: (
+        lambda df=synthetic_prices(r, c): _per_column(fe.moving_average, df)),
+    "feature_engineering.z_score": lambda r, c: (
+        lambda df=synthetic_prices(r, c): _per_column(fe.z_score, df)),
+    "feature_engineering.rolling_correlation": lambda r, c: (
+        lambda df=synthetic_prices(r, c), ref=synthetic_prices(r, 1, seed=7).iloc[:, 0]:
+            _per_column(fe.rolling_correlation, df, ref)),
+    "feature_engineering.panel_volatility_index": lambda r, c: (
+        lambda df=synthetic_prices(r, c): fe.panel_volatility_index(df)),
+    "feature_engineering.panel_moving_average": lambda r, c: (
+        lambda df=synthetic_prices(r, c): fe.panel_moving_average(df)),
+    "feature_engineering.panel_z_score": lambda r, c: (
+        lambda df=synthetic_prices(r, c): fe.panel_z_score(df)),
+    "feature_engineering.price_to_income_ratio": lambda r, c: (
+        lambda a=synthetic_indicators(r, c), b=synthetic_indicators(r, c, seed=3):
+            [fe.price_to_income_ratio(a[x], b[y]) for x, y in zip(a.columns, b.columns)]),
+    "feature_engineering.loan_to_value_ratio": lambda r, c: (
+        lambda a=synthetic_indicators(r, c), b=synthetic_indicators(r, c, seed=3):
+            [fe.loan_to_value_ratio(a[x], b[y]) for x, y in zip(a.columns, b.columns)]),
+    "anomaly_detection.train_isolation_forest": lambda r, c: (
+        lambda df=synthetic_volatility(r, c): ad.train_isolation_forest(df)),
+    "anomaly_detection.detect_anomalies": lambda r, c: (
+        lambda df=synthetic_volatility(r, c), model=_fitted_model(r, c): ad.detect_anomalies(model, df)),
+    "anomaly_detection.append_anomaly_column": lambda r, c: (
+        lambda df=synthetic_volatility(r, c), model=_fitted_model(r, c):
+            ad.append_anomaly_column(df.copy(), model, list(df.columns))),
+    "downsampling.downsample": lambda r, c: (
+        lambda df=synthetic_prices(r, c): _per_column(ds.downsample, df, 2000)),
+    "risk_score.normalize_df": lambda r, c: (
+        lambda df=synthetic_indicators(r, c): rs.normalize_df(df)),
+    "risk_score.compute_weighted_risk_index": lambda r, c: (
+        lambda df=synthetic_indicators(r, c): rs.compute_weighted_risk_index(df)),
+    "risk_score.attach_risk_score": lambda r, c: (
+        lambda df=synthetic_indicators(r, c): rs.attach_risk_score(df.copy())),
+    "risk_score.categorize_risk": lambda r, c: (
+        lambda s=pd.Series(np.random.default_rng(4).uniform(0, 100, r)): s.apply(rs.categorize_risk)),
+}
+
+# Functions that take a single series regardless of width
+SINGLE_COLUMN = {"risk_score.categorize_risk"}
+
+
+def measure(make_case, rows: int, cols: int, repeats: int) -> dict:
+    """
+    Best-of-`repeats` wall time, then one traced run for peak Python/NumPy memory.
+    """
+    run = make_case(rows, cols)
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mb": peak / 2 ** 20}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_suite(rows_list, cols_list, functions=None, repeats: int = 3, max_cells: float = 5e7) -> dict:
+    results = []
+    for name, make_case in CASES.items():
+        if functions and not any(f in name for f in functions):
+            continue
+        widths = [1] if name in SINGLE_COLUMN else cols_list
+        for rows in rows_list:
+            for cols in widths:
+                if rows * cols > max_cells:
+                    continue
+                record = {"function": name, "rows": rows, "cols": cols}
+                try:
+                    record.update(measure(make_case, rows, cols, repeats))
+                    print(f"{name:<45} {rows:>10} x {cols:<5} {record['seconds'] * 1000:10.2f} ms "
+                          f"{record['peak_mb']:10.1f} MB")
+                except MemoryError:
+                    record.update({"seconds": None, "peak_mb": None, "error": "MemoryError"})
+                    print(f"{name:<45} {rows:>10} x {cols:<5} MemoryError")
+                results.append(record)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(base: dict, head: dict) -> pd.DataFrame:
+    """
+    Join two result files on (function, rows, cols) and report time/memory ratios.
+    """
+    key = ["function", "rows", "cols"]
+    a = pd.DataFrame(base["results"]).set_index(key)
+    b = pd.DataFrame(head["results"]).set_index(key)
+    joined = a[["seconds", "peak_mb"]].join(b[["seconds", "peak_mb"]], lsuffix="_base", rsuffix="_head",
+                                             how="inner")
+    joined["speedup"] = joined["seconds_base"] / joined["seconds_head"]
+    joined["memory_ratio"] = joined["peak_mb_head"] / joined["peak_mb_base"]
+    return joined.reset_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks for feature, anomaly and risk hot paths")
+    parser.add_argument("--quick", action="store_true", help=f"Sweep rows {QUICK_ROWS} x cols {QUICK_COLS}")
+    parser.add_argument("--rows", type=int, nargs="+", help=f"Series lengths (default {FULL_ROWS})")
+    parser.add_argument("--cols", type=int, nargs="+", help=f"Widths (default {FULL_COLS})")
+    parser.add_argument("--functions", nargs="+", help="Substring filter on function names")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-cells", type=float, default=5e7,
+                        help="Skip (rows x cols) combinations larger than this")
+    parser.add_argument("--output", type=Path, help="Result file (default results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "HEAD"),
+                        help="Compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        base, head = (json.loads(p.read_text()) for p in args.compare)
+        print(f"base {base['commit']} vs head {head['commit']}")
+        print(compare(base, head).to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+        sys.exit(0)
+
+    rows_list = args.rows or (QUICK_ROWS if args.quick else FULL_ROWS)
+    cols_list = args.cols or (QUICK_COLS if args.quick else FULL_COLS)
+    report = run_suite(rows_list, cols_list, args.functions, args.repeats, args.max_cells)
+
+    output = args.output or RESULTS_DIR / f"{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
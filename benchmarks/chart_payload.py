@@ -0,0 +1,74 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add src path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from downsampling import downsample
+
+
+def intraday_volatility(points: int, anomaly_rate: float = 0.002, seed: int = 0) -> pd.DataFrame:
+    """
+    Minute-bar volatility with sparse anomaly flags, like detect_volatility_anomalies output.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2004-01-02 09:30", periods=points, freq="min", name="Date")
+    return pd.DataFrame({
+        "Volatility": np.abs(rng.normal(0, 0.01, points).cumsum()) + 0.1,
+        "anomaly": rng.choice([1, -1], size=points, p=[1 - anomaly_rate, anomaly_rate]),
+    }, index=index)
+
+
+def arrow_bytes(frame) -> int:
+    """
+    Size of the Arrow IPC stream st.line_chart sends for this data.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame.to_frame() if isinstance(frame, pd.Series) else frame)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def plotly_scatter(frame: pd.DataFrame):
+    """
+    The dashboard's anomaly chart for `frame`.
+    """
+    import plotly.express as px
+
+    return px.scatter(frame.reset_index(), x='Date', y='Volatility',
+                      color=frame['anomaly'].map({1: "Normal", -1: "Anomaly"}).to_numpy(),
+                      color_discrete_map={"Normal": "blue", "Anomaly": "red"})
+
+
+def measure(frame: pd.DataFrame, max_points) -> dict:
+    started = time.perf_counter()
+    shown = downsample(frame, max_points, column='Volatility', keep=frame['anomaly'] == -1)
+    thin_s = time.perf_counter() - started
+    started = time.perf_counter()
+    spec = plotly_scatter(shown).to_json()
+    plotly_s = time.perf_counter() - started
+    return {"points": len(shown), "anomalies": int((shown['anomaly'] == -1).sum()),
+            "plotly_mb": len(spec) / 2 ** 20, "line_chart_mb": arrow_bytes(shown['Volatility']) / 2 ** 20,
+            "downsample_s": thin_s, "build_json_s": plotly_s}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Browser payload of dashboard charts, raw vs downsampled")
+    parser.add_argument("--points", type=int, default=1_000_000, help="Raw points (~10 years of minute bars)")
+    parser.add_argument("--max-points", type=int, nargs="+", default=[500, 2000, 10000])
+    args = parser.parse_args()
+
+    frame = intraday_volatility(args.points)
+    rows = [{"max_points": "all", **measure(frame, None)}]
+    rows += [{"max_points": n, **measure(frame, n)} for n in args.max_points]
+    report = pd.DataFrame(rows).set_index("max_points")
+    print(f" {args.points:,} raw points, {int((frame['anomaly'] == -1).sum()):,} anomalies")
+    print(report.to_string(float_format=lambda x: f"{x:.3f}"))
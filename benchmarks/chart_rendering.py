@@ -0,0 +1,63 @@
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add src path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from visualization import MAX_PLOT_POINTS, render_anomaly_charts
+from config import default_workers
+
+
+def universe_table(tickers: int, days: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Long table shaped like universe_anomalies_forecast: Date, Ticker, Volatility, anomaly.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2000-01-03", periods=days, name="Date")
+    volatility = np.abs(rng.normal(0.15, 0.05, size=(days, tickers))).cumsum(axis=0) / np.arange(1, days + 1)[:, None]
+    return pd.DataFrame({
+        "Date": np.tile(dates, tickers),
+        "Ticker": np.repeat([f"T{i:04d}" for i in range(tickers)], days),
+        "Volatility": volatility.T.ravel(),
+        "anomaly": rng.choice([1, -1], size=days * tickers, p=[0.95, 0.05]),
+    })
+
+
+def timed_render(table: pd.DataFrame, max_points, workers: int) -> float:
+    output_dir = Path(tempfile.mkdtemp())
+    try:
+        started = time.perf_counter()
+        report = render_anomaly_charts(table, output_dir, max_points=max_points, max_workers=workers)
+        elapsed = time.perf_counter() - started
+        if report["error"].notna().any():
+            raise RuntimeError(report["error"].dropna().iloc[0])
+        return elapsed
+    finally:
+        shutil.rmtree(output_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless anomaly chart rendering for a ticker universe")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=5000, help="Trading days per ticker (~20 years)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-points", type=int, default=MAX_PLOT_POINTS)
+    parser.add_argument("--full", action="store_true", help="Also time rendering every point (slow)")
+    args = parser.parse_args()
+
+    workers = args.workers or default_workers()
+    table = universe_table(args.tickers, args.days)
+    print(f" {args.tickers} tickers x {args.days} days, {workers} workers")
+
+    seconds = timed_render(table, args.max_points, workers)
+    print(f"  max {args.max_points} points: {seconds:7.1f}s  ({args.tickers / seconds:.1f} charts/s)")
+    if args.full:
+        seconds = timed_render(table, None, workers)
+        print(f" every point:       {seconds:7.1f}s  ({args.tickers / seconds:.1f} charts/s)")
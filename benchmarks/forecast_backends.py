@@ -0,0 +1,62 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add src path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from time_series_model import FORECAST_BACKENDS
+
+
+# Deterministic geometric random walk resembling ~8 years of daily closes
+def synthetic_closes(n: int = 2000, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.011, n)
+    index = pd.bdate_range("2015-01-01", periods=n)
+    return pd.Series(2000 * np.exp(np.cumsum(returns)), index=index, name="Close")
+
+
+def benchmark(series: pd.Series, horizon: int = 90, repeats: int = 3) -> pd.DataFrame:
+    """
+    Fit every backend on all but the last `horizon` points and score the holdout.
+    """
+    train, test = series.iloc[:-horizon], series.iloc[-horizon:]
+    rows = []
+    for name, backend in FORECAST_BACKENDS.items():
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            # Business-day frequency so forecast rows line up with the holdout
+            forecast = backend(train, periods=horizon, freq="B")
+            timings.append(time.perf_counter() - started)
+
+        predicted = forecast.set_index("ds")["yhat"].reindex(test.index)
+        errors = predicted - test
+        rows.append({
+            "backend": name,
+            "fit_ms_median": 1000 * float(np.median(timings)),
+            "mae": float(errors.abs().mean()),
+            "mape_pct": float((errors.abs() / test).mean() * 100),
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare forecast backends on fit latency and holdout error")
+    parser.add_argument("--ticker", help="Use real closes from load_yahoo_data instead of synthetic data")
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--horizon", type=int, default=90)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.ticker:
+        from data_loader import load_yahoo_data
+        closes = load_yahoo_data(args.ticker, "2015-01-01", "2023-12-31")["Close"].tail(args.points)
+    else:
+        closes = synthetic_closes(args.points)
+
+    print(benchmark(closes, args.horizon, args.repeats).to_string(index=False))
@@ -0,0 +1,85 @@
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = BASE_DIR / "src"
+
+# Runs in a fresh interpreter: block every socket operation, then time one import
+PROBE = """
+import socket, sys, time, importlib
+def _blocked(*args, **kwargs):
+    raise RuntimeError("network I/O attempted during import")
+socket.socket.connect = _blocked
+socket.socket.connect_ex = _blocked
+socket.create_connection = _blocked
+socket.getaddrinfo = _blocked
+sys.path.insert(0, {src!r})
+started = time.perf_counter()
+importlib.import_module({module!r})
+print(time.perf_counter() - started)
+"""
+
+
+def discover_modules() -> list:
+    """
+    Every importable module under src/, e.g. 'data_sources.fred_loader'.
+    """
+    return sorted(
+        ".".join(path.relative_to(SRC_DIR).with_suffix("").parts)
+        for path in SRC_DIR.rglob("*.py")
+        if path.name != "__init__.py"
+    )
+
+
+def measure(module: str, repeats: int = 3) -> dict:
+    """
+    Cold-import a module in fresh interpreters and report the best time.
+
+    A module that fails to import (e.g. because it touched the network or
+    needs credentials) is reported with its error instead of a time.
+    """
+    timings = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(src=str(SRC_DIR), module=module)],
+            capture_output=True, text=True, cwd=BASE_DIR,
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            return {"module": module, "seconds": None, "error": error}
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return {"module": module, "seconds": min(timings), "error": None}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start import time and no-network check for src/ modules")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON from an earlier run (e.g. another commit)")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeats) for module in discover_modules()]
+    baseline = {}
+    if args.compare:
+        baseline = {r["module"]: r for r in json.loads(args.compare.read_text())}
+
+    failures = 0
+    for r in results:
+        if r["error"]:
+            failures += 1
+            print(f"{r['module']:<36} FAILED  {r['error']}")
+            continue
+        line = f"{r['module']:<36} {r['seconds'] * 1000:8.1f} ms"
+        before = baseline.get(r["module"])
+        if before and before["seconds"]:
+            line += f"   (was {before['seconds'] * 1000:8.1f} ms, {before['seconds'] / r['seconds']:.1f}x)"
+        elif before:
+            line += f"   (was FAILED: {before['error']})"
+        print(line)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    sys.exit(1 if failures else 0)
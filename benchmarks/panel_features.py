@@ -0,0 +1,70 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add src path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import feature_engineering as fe
+from synthetic import synthetic_prices
+
+# Per-series function -> panel equivalent
+PAIRS = {
+    "volatility_index": (fe.volatility_index, fe.panel_volatility_index),
+    "moving_average": (fe.moving_average, fe.panel_moving_average),
+    "z_score": (fe.z_score, fe.panel_z_score),
+}
+
+
+def best_of(func, repeats: int) -> tuple:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def run(tickers: int, days: int, repeats: int, nan_fraction: float, dtype) -> pd.DataFrame:
+    """
+    Times the column-by-column loop against the panel function on one wide
+    frame and checks that both give the same values (and NaN positions).
+    """
+    prices = synthetic_prices(days, tickers)
+    if nan_fraction:
+        rng = np.random.default_rng(5)
+        prices = prices.mask(rng.random(prices.shape) < nan_fraction)
+
+    rows = []
+    for name, (per_series, panel) in PAIRS.items():
+        loop_s, expected = best_of(lambda: pd.DataFrame({c: per_series(prices[c]) for c in prices.columns}), repeats)
+        panel_s, result = best_of(lambda: panel(prices, dtype=dtype), repeats)
+        tolerance = 1e-4 if dtype == np.float32 else 1e-6
+        same = np.allclose(result.to_numpy(np.float64), expected.to_numpy(np.float64),
+                           rtol=tolerance, atol=tolerance, equal_nan=True)
+        rows.append({"function": name, "loop_ms": loop_s * 1000, "panel_ms": panel_s * 1000,
+                     "speedup": loop_s / panel_s, "matches": same})
+        print(f" {name:<18} loop {loop_s * 1000:9.1f} ms  panel {panel_s * 1000:9.1f} ms  "
+              f"x{loop_s / panel_s:5.1f}  {'ok' if same else 'MISMATCH'}")
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-series loop vs vectorized panel features")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=252 * 20, help="Rows per series (default 20 trading years)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--nan-fraction", type=float, default=0.0, help="Share of prices blanked out")
+    parser.add_argument("--float32", action="store_true", help="Return float32 panels")
+    args = parser.parse_args()
+
+    print(f" {args.tickers} tickers x {args.days} days")
+    report = run(args.tickers, args.days, args.repeats, args.nan_fraction,
+                 np.float32 if args.float32 else np.float64)
+    if not report["matches"].all():
+        sys.exit(1)
@@ -0,0 +1,59 @@
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add src path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from sentiment import LEXICON, LexiconScorer, SentimentCache
+
+FILLER = ("the market today stocks traders said shares investors fed week earnings tech index "
+          "price news report analysts quarter company economy data bank energy").split()
+
+
+def synthetic_posts(n: int, words: int = 25, seed: int = 0) -> pd.DataFrame:
+    """
+    Reddit/Twitter-sized posts mixing filler words with ~10% lexicon terms.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array(FILLER * 4 + list(LEXICON))
+    tokens = rng.choice(vocab, size=(n, words))
+    texts = [" ".join(row) for row in tokens]
+    return pd.DataFrame({"id": [f"p{i}" for i in range(n)], "title": texts})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentiment scoring throughput (documents/hour)")
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--words", type=int, default=25, help="Words per document")
+    args = parser.parse_args()
+
+    posts = synthetic_posts(args.docs, args.words)
+    scorer = LexiconScorer()
+
+    started = time.perf_counter()
+    scorer.score(posts["title"])
+    cold = time.perf_counter() - started
+    print(f" scoring:      {args.docs / cold:12,.0f} docs/s  ({args.docs / cold * 3600:,.0f} docs/hour)")
+
+    cache_dir = Path(tempfile.mkdtemp())
+    try:
+        cache = SentimentCache(scorer, cache_dir=cache_dir)
+        started = time.perf_counter()
+        cache.score(posts, "title")
+        first = time.perf_counter() - started
+
+        cache = SentimentCache(scorer, cache_dir=cache_dir)
+        started = time.perf_counter()
+        cache.score(posts, "title")
+        cached = time.perf_counter() - started
+        print(f" cache, new:   {args.docs / first:12,.0f} docs/s  (scores written to disk)")
+        print(f" cache, hits:  {args.docs / cached:12,.0f} docs/s  ({cache.scored_last} rescored)")
+    finally:
+        shutil.rmtree(cache_dir)
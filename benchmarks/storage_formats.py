@@ -0,0 +1,74 @@
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add src path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from storage import write_table, read_table, table_path
+
+
+def multi_ticker_dataset(tickers: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Long-format daily table shaped like universe_anomalies_forecast: one row per (date, ticker).
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2014-01-01", periods=252 * years, name="Date")
+    n = len(dates) * tickers
+    returns = rng.normal(0.0003, 0.012, size=(len(dates), tickers))
+    close = 100 * np.exp(np.cumsum(returns, axis=0))
+    df = pd.DataFrame({
+        "Ticker": np.tile([f"T{i:04d}" for i in range(tickers)], len(dates)),
+        "Close": close.ravel(),
+        "Volume": rng.integers(10_000, 50_000_000, size=n),
+        "Volatility": np.abs(rng.normal(0.15, 0.05, size=n)),
+        "anomaly": rng.choice([1, -1], size=n, p=[0.95, 0.05]),
+    }, index=np.repeat(dates, tickers))
+    df.index.name = "Date"
+    return df
+
+
+def best_of(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV vs Parquet for data/ tables")
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    df = multi_ticker_dataset(args.tickers, args.years)
+    print(f" {len(df):,} rows ({args.tickers} tickers x {args.years} years)")
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        rows = []
+        for fmt in ["csv", "parquet"]:
+            path = table_path(workdir, "universe", fmt)
+            write_s = best_of(lambda: write_table(df, path, compact=(fmt == "parquet")), 1)
+            full_s = best_of(lambda: read_table(path), args.repeats)
+            # A typical dashboard read: one column for the last year
+            slice_s = best_of(lambda: read_table(path, columns=["Close"], start="2023-01-01"), args.repeats)
+            memory = read_table(path).memory_usage(deep=True).sum()
+            rows.append({"format": fmt, "size_mb": path.stat().st_size / 2 ** 20, "write_s": write_s,
+                         "read_s": full_s, "read_1col_1y_s": slice_s, "in_memory_mb": memory / 2 ** 20})
+        report = pd.DataFrame(rows).set_index("format")
+        print(report.to_string(float_format=lambda x: f"{x:.3f}"))
+        csv, pq = report.loc["csv"], report.loc["parquet"]
+        print(f"\n Parquet: {csv['size_mb'] / pq['size_mb']:.1f}x smaller, "
+              f"{csv['read_s'] / pq['read_s']:.1f}x faster full read, "
+              f"{csv['read_1col_1y_s'] / pq['read_1col_1y_s']:.1f}x faster column/date read")
+    finally:
+        shutil.rmtree(workdir)
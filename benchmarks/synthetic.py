@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# Deterministic, offline data generators for the benchmark suite.
+# A minute-frequency index is used so 10M-row frames stay within pandas' date range.
+
+
+def synthetic_index(n_rows: int, freq: str = "min") -> pd.DatetimeIndex:
+    return pd.date_range("2000-01-03", periods=n_rows, freq=freq, name="Date")
+
+
+def synthetic_prices(n_rows: int, n_cols: int = 1, seed: int = 0, dtype=np.float64) -> pd.DataFrame:
+    """
+    Geometric random walks, one column per synthetic ticker.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0002, 0.01, size=(n_rows, n_cols)).astype(dtype)
+    prices = 100.0 * np.exp(np.cumsum(returns, axis=0))
+    columns = [f"T{i:04d}" for i in range(n_cols)]
+    return pd.DataFrame(prices.astype(dtype), index=synthetic_index(n_rows), columns=columns)
+
+
+def synthetic_indicators(n_rows: int, n_cols: int = 5, seed: int = 1, nan_fraction: float = 0.01) -> pd.DataFrame:
+    """
+    Economic-indicator-like random walks on different scales with scattered gaps.
+    """
+    rng = np.random.default_rng(seed)
+    scales = 10.0 ** rng.integers(0, 5, size=n_cols)
+    levels = scales * (1 + np.cumsum(rng.normal(0, 0.001, size=(n_rows, n_cols)), axis=0))
+    mask = rng.random(size=levels.shape) < nan_fraction
+    mask[0] = False
+    levels[mask] = np.nan
+    columns = [f"IND{i:04d}" for i in range(n_cols)]
+    return pd.DataFrame(levels, index=synthetic_index(n_rows), columns=columns)
+
+
+def synthetic_volatility(n_rows: int, n_cols: int = 1, seed: int = 2) -> pd.DataFrame:
+    """
+    Positive, right-skewed features resembling the Volatility column, with rare spikes.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.gamma(2.0, 0.01, size=(n_rows, n_cols))
+    spikes = rng.random(size=values.shape) < 0.01
+    values[spikes] *= 5
+    columns = ["Volatility"] if n_cols == 1 else [f"Volatility{i}" for i in range(n_cols)]
+    return pd.DataFrame(values, index=synthetic_index(n_rows), columns=columns)
@@ -3,9 +3,7 @@ import pandas as pd
 import plotly.express as px
 import sys
 import os
-from io import BytesIO
-from datetime import datetime
-from fpdf import FPDF
+from concurrent.futures import ThreadPoolExecutor
 
 # # 🔐 --- Secret Debugger ---
 # st.title("🔐 Secret Debugger")
@@ -23,10 +21,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"
 
 from data_loader import load_yahoo_data
 from feature_engineering import volatility_index
-from anomaly_detection import train_isolation_forest, append_anomaly_column
-from time_series_model import forecast_with_prophet
-from data_sources.fred_loader import fetch_fred_data
+from anomaly_detection import load_or_train_isolation_forest, append_anomaly_column
+from time_series_model import forecast_series
+from alignment import align_asof
+from downsampling import downsample_window
+from data_sources.fred_loader import fetch_fred_data, publication_lags
 from indicators.risk_score import compute_weighted_risk_index as compute_risk_index
+from reports import build_report, data_version
 
 # --- Page Config ---
 st.set_page_config(page_title="CrashSentinel Dashboard", layout="wide", initial_sidebar_state="expanded")
@@ -40,7 +41,11 @@ ticker = st.sidebar.text_input("Ticker Symbol", "^GSPC")
 start_date = st.sidebar.date_input("Start Date", pd.to_datetime("2015-01-01"))
 end_date = st.sidebar.date_input("End Date", pd.to_datetime("2023-12-31"))
 forecast_days = st.sidebar.slider("Forecast Days (Prophet)", 30, 180, 90)
+forecast_backend = st.sidebar.selectbox("Forecast Model", ["prophet", "ets"],
+                                        format_func=lambda b: {"prophet": "Prophet", "ets": "Exponential Smoothing (fast)"}[b])
 theme = st.sidebar.selectbox("Theme", ["light", "dark"])
+max_points = st.sidebar.select_slider("Chart Points", [500, 1000, 2000, 5000, 10000], value=2000,
+                                      help="Most points sent to the browser per chart; zoom in for full detail")
 st.sidebar.markdown("---")
 st.sidebar.caption("📊 Powered by Yahoo Finance + FRED")
 
@@ -55,43 +60,130 @@ def apply_theme():
 
 apply_theme()
 
-# --- Load Data ---
-st.info(f"📥 Downloading data for `{ticker}`...")
-try:
-    data = load_yahoo_data(ticker, str(start_date), str(end_date))
+# --- Cache Layers ---
+# TTLs follow how often each source updates: daily bars can change intraday,
+# FRED series are revised at most daily.
+PRICE_TTL = 60 * 60
+FRED_TTL = 12 * 60 * 60
+FORECAST_TTL = 24 * 60 * 60
+
+@st.cache_data(ttl=PRICE_TTL, show_spinner="📥 Loading price data...")
+def load_prices(ticker: str, start: str, end: str) -> pd.DataFrame:
+    data = load_yahoo_data(ticker, start, end)
+    if data.empty:
+        raise ValueError(f"No data returned for {ticker}")
     if isinstance(data.columns, pd.MultiIndex):
         data.columns = [col[0] for col in data.columns]
+    data['Volatility'] = volatility_index(data['Close'])
+    return data
+
+@st.cache_resource(ttl=PRICE_TTL, show_spinner="🌲 Loading anomaly model...")
+def get_anomaly_model(ticker: str, start: str, end: str):
+    data_clean = load_prices(ticker, start, end).dropna(subset=['Volatility'])
+    return load_or_train_isolation_forest(data_clean[['Volatility']], name=ticker)
+
+@st.cache_data(ttl=PRICE_TTL, show_spinner="🚨 Scoring anomalies...")
+def detect_volatility_anomalies(ticker: str, start: str, end: str) -> pd.DataFrame:
+    data_clean = load_prices(ticker, start, end).dropna(subset=['Volatility'])
+    model = get_anomaly_model(ticker, start, end)
+    return append_anomaly_column(data_clean.copy(), model, ['Volatility'])
+
+@st.cache_data(ttl=FORECAST_TTL, show_spinner="🔮 Fitting forecast...")
+def run_forecast(ticker: str, start: str, end: str, days: int, backend: str) -> pd.DataFrame:
+    return forecast_series(load_prices(ticker, start, end)['Close'], periods=days, backend=backend)
+
+@st.cache_data(ttl=FRED_TTL, show_spinner="🏦 Fetching FRED indicators...")
+def load_fred_indicators() -> pd.DataFrame:
+    return fetch_fred_data()
+
+@st.cache_data(ttl=FRED_TTL)
+def risk_score(ticker: str, start: str, end: str) -> pd.DataFrame:
+    fred_data = load_fred_indicators()
+
+    # Align FRED indicators to the ticker's trading days as they were known at the time
+    indicators_df = align_asof(fred_data, load_prices(ticker, start, end).index, lags=publication_lags())
+
+    return pd.DataFrame(compute_risk_index(indicators_df))
+
+# --- Background Reports ---
+# PDF reports are built off the script thread and cached per (ticker, range,
+# forecast settings, data version), so they are only built when the Export
+# view asks for one and never twice for the same data.
+@st.cache_resource
+def report_executor() -> ThreadPoolExecutor:
+    # One worker: report requests queue up instead of competing with the UI for CPU
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="report")
+
+def generate_report(ticker: str, start: str, end: str, days: int, backend: str) -> bytes:
+    sections, errors = {}, {}
+    loaders = {
+        "anomalies": lambda: detect_volatility_anomalies(ticker, start, end),
+        "forecast": lambda: run_forecast(ticker, start, end, days, backend),
+        "risk": lambda: risk_score(ticker, start, end),
+    }
+    # A failing section is noted in the report rather than failing it
+    for name, load in loaders.items():
+        try:
+            sections[name] = load()
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+    return build_report(ticker, start, end, load_prices(ticker, start, end), errors=errors, **sections)
+
+@st.cache_resource(ttl=PRICE_TTL, max_entries=16)
+def report_job(ticker: str, start: str, end: str, days: int, backend: str, version: str):
+    # `version` only keys the cache: new data for the same range starts a new report
+    return report_executor().submit(generate_report, ticker, start, end, days, backend)
+
+# --- Load Data ---
+start, end = str(start_date), str(end_date)
+try:
+    data = load_prices(ticker, start, end)
 except Exception as e:
     st.error(f"❌ Data loading failed: {e}")
     st.stop()
 
-data['Volatility'] = volatility_index(data['Close'])
-data_clean = data.dropna(subset=['Volatility'])
-
-# --- Tabs ---
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+# --- Views ---
+# Only the selected view is computed; st.tabs would run every tab on each rerun
+view = st.radio("View", [
     "📈 Price & Volatility", "🚨 Anomaly Detection", "🔮 Forecasting", "📉 Risk Score", "📤 Export"
-])
+], horizontal=True, label_visibility="collapsed")
+
+# --- Viewport ---
+# Charts draw the zoomed range at up to `max_points` points each (anomalies are
+# always kept), so long or intraday histories stay light in the browser while
+# a narrower range shows full detail.
+data_start, data_end = data.index.min().to_pydatetime(), data.index.max().to_pydatetime()
+if view != "📤 Export" and data_start < data_end:
+    zoom = st.slider("Zoom", min_value=data_start, max_value=data_end, value=(data_start, data_end),
+                     format="YYYY-MM-DD", label_visibility="collapsed")
+else:
+    zoom = (data_start, data_end)
+
+def thin(frame, column: str = None, keep=None):
+    # An unzoomed right edge stays open so forecasts past the last price remain visible
+    end = None if zoom[1] >= data_end else zoom[1]
+    return downsample_window(frame, max_points, start=zoom[0], end=end, column=column, keep=keep)
 
 # --- Tab 1: Price & Volatility ---
-with tab1:
+if view == "📈 Price & Volatility":
     st.subheader("Closing Price")
-    st.line_chart(data['Close'], use_container_width=True)
+    st.line_chart(thin(data['Close']), use_container_width=True)
 
     st.subheader("Volatility Index")
-    st.line_chart(data['Volatility'], use_container_width=True)
+    st.line_chart(thin(data['Volatility'].dropna()), use_container_width=True)
 
 # --- Tab 2: Anomaly Detection ---
-with tab2:
+elif view == "🚨 Anomaly Detection":
     st.subheader("Detected Volatility Anomalies")
     try:
-        model = train_isolation_forest(data_clean[['Volatility']])
-        data_anomalies = append_anomaly_column(data_clean.copy(), model, ['Volatility'])
+        data_anomalies = detect_volatility_anomalies(ticker, start, end)
+        shown = thin(data_anomalies[['Volatility', 'anomaly']], 'Volatility',
+                     keep=data_anomalies['anomaly'] == -1)
 
         fig = px.scatter(
-            data_anomalies.reset_index(),
+            shown.rename_axis('Date').reset_index(),
             x='Date', y='Volatility',
-            color=data_anomalies['anomaly'].map({1: "Normal", -1: "Anomaly"}),
+            color=shown['anomaly'].map({1: "Normal", -1: "Anomaly"}).to_numpy(),
             title="Volatility Anomalies",
             color_discrete_map={"Normal": "blue", "Anomaly": "red"}
         )
@@ -100,63 +192,54 @@ with tab2:
         st.error(f"❌ Anomaly detection failed: {e}")
 
 # --- Tab 3: Forecasting ---
-with tab3:
-    st.subheader("Crash Forecast with Prophet")
+elif view == "🔮 Forecasting":
+    st.subheader("Crash Forecast")
     try:
-        forecast = forecast_with_prophet(data['Close'], periods=forecast_days)
-        fig = px.line(forecast, x='ds', y='yhat', title=f"{forecast_days}-Day Forecast")
+        forecast = run_forecast(ticker, start, end, forecast_days, forecast_backend)
+        shown = thin(forecast.set_index('ds')['yhat']).reset_index()
+        fig = px.line(shown, x='ds', y='yhat', title=f"{forecast_days}-Day Forecast")
         st.plotly_chart(fig, use_container_width=True)
     except Exception as e:
         st.error(f"❌ Forecasting failed: {e}")
 
 # --- Tab 4: Risk Score ---
-with tab4:
+elif view == "📉 Risk Score":
     st.subheader("📉 Market Risk Index")
     try:
-        fred_data = fetch_fred_data()
-
-        # Align FRED indicators to data's date range
-        indicators_df = pd.DataFrame(index=fred_data.index)
-        for col in fred_data.columns:
-            indicators_df[col] = fred_data[col]
-        indicators_df = indicators_df.loc[data.index.min():data.index.max()]
-
-        # Compute risk score
-        risk_series = compute_risk_index(indicators_df)
-        risk_df = pd.DataFrame(risk_series)
-        st.line_chart(risk_df['Market Risk Score'], use_container_width=True)
+        risk_df = risk_score(ticker, start, end)
+        st.line_chart(thin(risk_df['Market Risk Score'].dropna()), use_container_width=True)
     except Exception as e:
         st.error(f"❌ Risk score computation failed: {e}")
 
 # --- Tab 5: Export Options ---
-with tab5:
+else:
     st.subheader("📤 Export Data")
 
     # CSV Download
     csv = data.to_csv(index=True).encode('utf-8')
     st.download_button("Download CSV", csv, "market_data.csv", "text/csv")
 
-    # PDF Export
-    def create_pdf(df: pd.DataFrame) -> BytesIO:
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=10)
-        pdf.cell(200, 10, txt="CrashSentinel Market Report", ln=True, align='C')
-        pdf.ln(10)
-
-        for i, row in df.tail(20).iterrows():
-            try:
-                date_str = i.strftime("%Y-%m-%d") if isinstance(i, datetime) else str(i)
-                pdf.cell(200, 6, txt=f"{date_str} | Close: {row['Close']:.2f} | Vol: {row['Volatility']:.4f}", ln=True)
-            except:
-                continue
-
-        pdf_output = pdf.output(dest='S').encode('latin1')
-        buffer = BytesIO(pdf_output)
-        return buffer
-
-    pdf_buffer = create_pdf(data)
-    st.download_button("Download PDF", pdf_buffer, "market_report.pdf", mime="application/pdf")
+    # PDF Export: the button shows at once and is enabled when the report is ready
+    job = report_job(ticker, start, end, forecast_days, forecast_backend, data_version(data))
+    pending = not job.done()
+
+    @st.fragment(run_every=1 if pending else None)
+    def pdf_download():
+        if not job.done():
+            st.download_button("Download PDF", b"", "market_report.pdf", mime="application/pdf", disabled=True)
+            st.caption("⏳ Building the PDF report...")
+        elif pending:
+            # Finished while polling: rerun once so the page stops polling
+            st.rerun()
+        elif job.exception() is not None:
+            st.error(f"❌ Report generation failed: {job.exception()}")
+            if st.button("Retry"):
+                report_job.clear()
+                st.rerun()
+        else:
+            st.download_button("Download PDF", job.result(), "market_report.pdf", mime="application/pdf")
+
+    pdf_download()
 
 # --- Footer ---
 st.markdown("""
@@ -1,6 +1,7 @@
 import os
 import sys
-import json
+import argparse
+import time
 import pandas as pd
 from pathlib import Path
 
@@ -12,74 +13,259 @@ sys.path.append(str(SRC_DIR))
 # Local Imports
 from data_loader import load_yahoo_data
 from feature_engineering import volatility_index
-from anomaly_detection import train_isolation_forest, append_anomaly_column
+from anomaly_detection import load_or_train_isolation_forest, append_anomaly_column
 from time_series_model import forecast_with_prophet
-from visualization import plot_anomalies
-
-# Extended Modules
-from data_sources.fred_loader import fetch_fred_data
-from data_sources.zillow_loader import fetch_zillow_listings
-from data_sources.reddit_scraper import fetch_reddit_sentiment
-from data_sources.sec_scraper import download_sec_filings
-from indicators.risk_score import compute_risk_index
-from visualization import plot_risk_index
+from pipeline import Pipeline, Stage
+from storage import table_path, read_table, write_table, export_csv
 
 # --- Output Paths ---
 data_dir = BASE_DIR / "data"
 reports_dir = BASE_DIR / "reports"
 models_dir = BASE_DIR / "models"
 
-os.makedirs(data_dir, exist_ok=True)
-os.makedirs(reports_dir, exist_ok=True)
-os.makedirs(models_dir, exist_ok=True)
-
-# --- Step 1: Load Financial Market Data ---
-print("\n[1] Loading S&P 500 historical data...")
-sp500 = load_yahoo_data("^GSPC", "2015-01-01", "2023-12-31")
-sp500.columns = [col[0] for col in sp500.columns] if isinstance(sp500.columns, pd.MultiIndex) else sp500.columns
-sp500.to_csv(data_dir / "sp500_data.csv")
-
-# --- Step 2: Feature Engineering ---
-print("\n[2] Calculating volatility index...")
-sp500['Volatility'] = volatility_index(sp500['Close'])
-sp500_clean = sp500.dropna(subset=['Volatility'])
-
-# --- Step 3: Anomaly Detection ---
-print("\n[3] Detecting anomalies using Isolation Forest...")
-model = train_isolation_forest(sp500_clean[['Volatility']])
-sp500_anomalies = append_anomaly_column(sp500_clean, model, ['Volatility'])
-sp500_anomalies.to_csv(data_dir / "sp500_anomalies.csv")
-
-# --- Step 4: Forecasting ---
-print("\n[4] Forecasting future volatility using Prophet...")
-forecast_df = forecast_with_prophet(sp500['Close'], periods=90)
-forecast_df.to_csv(data_dir / "sp500_forecast.csv", index=False)
-
-# --- Step 5: Additional Economic Data Sources ---
-print("\n[5] Fetching FRED economic indicators...")
-fred_df = fetch_fred_data()
-fred_df.to_csv(data_dir / "fred_indicators.csv")
-
-print("\n[6] Fetching Zillow housing data...")
-zillow_df = fetch_zillow_listings(zipcode="90210", limit=10)
-zillow_df.to_csv(data_dir / "zillow_listings.csv", index=False)
-
-print("\n[7] Fetching Reddit sentiment data...")
-reddit_data = fetch_reddit_sentiment(subreddits=["stocks", "investing"], limit=100)
-with open(data_dir / "reddit_sentiment.json", "w") as f:
-    json.dump(reddit_data, f)
-
-print("\n[8] Downloading SEC Filings (AAPL)...")
-download_sec_filings("AAPL", "10-K", output_dir=data_dir / "sec_filings")
-
-# --- Step 6: Risk Score Computation ---
-print("\n[9] Calculating Market Risk Index...")
-risk_index = compute_risk_index(sp500, fred_df, zillow_df)
-risk_index.to_csv(data_dir / "market_risk_score.csv")
-
-# --- Step 7: Visualization ---
-print("\n[10] Plotting results...")
-plot_anomalies(sp500_anomalies, 'Volatility', 'anomaly', save_path=reports_dir / "volatility_anomalies.png")
-plot_risk_index(risk_index, save_path=reports_dir / "market_risk_index.png")
-
-print("\n All pipeline steps completed.")
+TICKER = "^GSPC"
+START_DATE = "2015-01-01"
+END_DATE = "2023-12-31"
+FORECAST_DAYS = 90
+RISK_NORMALIZER = "expanding"
+# Backtests replay a longer history than the live pipeline
+BACKTEST_START_DATE = "2004-01-01"
+
+# Stages pulling external data are refreshed once a day
+DAY = 24 * 60 * 60
+PIPELINE_WORKERS = 5
+
+
+def build_pipeline() -> Pipeline:
+    """
+    Declares the single-ticker pipeline. Each stage lists the files it reads and
+    writes; independent stages (the data sources) run concurrently.
+    """
+    prices_path = table_path(data_dir, "sp500_data")
+    anomalies_path = table_path(data_dir, "sp500_anomalies")
+    forecast_path = table_path(data_dir, "sp500_forecast")
+    fred_path = table_path(data_dir, "fred_indicators")
+    zillow_path = table_path(data_dir, "zillow_listings")
+    reddit_dir = data_dir / "reddit_posts"
+    sentiment_path = table_path(data_dir, "reddit_sentiment_daily")
+    sec_dir = data_dir / "sec_filings"
+    risk_path = table_path(data_dir, "market_risk_score")
+    risk_state = data_dir / "risk_normalizer_state.json"
+    anomaly_png = reports_dir / "volatility_anomalies.png"
+    risk_png = reports_dir / "market_risk_index.png"
+
+    # --- Step 1: Load Financial Market Data ---
+    def load_prices():
+        sp500 = load_yahoo_data(TICKER, START_DATE, END_DATE)
+        sp500.columns = [col[0] for col in sp500.columns] if isinstance(sp500.columns, pd.MultiIndex) else sp500.columns
+        write_table(sp500, prices_path)
+
+    # --- Step 2/3: Feature Engineering + Anomaly Detection ---
+    def detect_anomalies():
+        sp500 = read_table(prices_path)
+        sp500['Volatility'] = volatility_index(sp500['Close'])
+        sp500_clean = sp500.dropna(subset=['Volatility'])
+        model = load_or_train_isolation_forest(sp500_clean[['Volatility']], name=TICKER, models_dir=models_dir)
+        sp500_anomalies = append_anomaly_column(sp500_clean, model, ['Volatility'])
+        write_table(sp500_anomalies, anomalies_path)
+
+    # --- Step 4: Forecasting ---
+    def forecast():
+        forecast_df = forecast_with_prophet(read_table(prices_path, columns=['Close'])['Close'], periods=FORECAST_DAYS)
+        write_table(forecast_df, forecast_path)
+
+    # --- Step 5: Additional Economic Data Sources ---
+    def fetch_fred():
+        from data_sources.fred_loader import fetch_fred_data
+        write_table(fetch_fred_data(), fred_path)
+
+    def fetch_zillow():
+        from data_sources.zillow_loader import fetch_zillow_listings
+        write_table(fetch_zillow_listings(zipcode="90210", limit=10), zillow_path)
+
+    def fetch_reddit():
+        from data_sources.reddit_scraper import fetch_reddit_sentiment
+        # Appends only posts newer than the last run to the store
+        fetch_reddit_sentiment(subreddits=["stocks", "investing"], limit=100, store_dir=reddit_dir)
+
+    def fetch_sec():
+        from data_sources.sec_scraper import download_sec_filings
+        download_sec_filings("AAPL", "10-K", output_dir=sec_dir)
+
+    # --- Step 5b: Sentiment (each post is scored once, then aggregated per trading day) ---
+    def score_sentiment():
+        from data_sources.columnar_store import PartStore
+        from sentiment import SentimentCache, daily_sentiment
+        posts = PartStore(reddit_dir).read()
+        posts['sentiment_score'] = SentimentCache().score(posts, 'title')
+        # Posts are scraped live while the price history stops at END_DATE:
+        # extend the trading calendar with weekdays through the newest post's session
+        calendar = read_table(prices_path, columns=[]).index
+        if not posts.empty:
+            newest = pd.offsets.BDay().rollforward(pd.to_datetime(posts['created_utc']).max().normalize())
+            calendar = calendar.union(pd.bdate_range(calendar.max() + pd.Timedelta(days=1), newest))
+        write_table(daily_sentiment(posts, calendar), sentiment_path)
+
+    # --- Step 6: Risk Score Computation ---
+    def compute_risk():
+        from alignment import align_asof
+        from data_sources.fred_loader import publication_lags
+        from indicators.risk_score import compute_weighted_risk_index, load_normalizer
+        sp500 = read_table(prices_path, columns=[])
+        # Indicators as known on each trading day, honouring publication lags
+        fred_df = align_asof(read_table(fred_path), sp500.index, lags=publication_lags())
+        # Point-in-time scores: only dates after the last run are scored and appended
+        previous = read_table(risk_path)['Market Risk Score'] if risk_path.exists() else None
+        # Without stored scores there is nothing to resume, so start from scratch
+        scaler = load_normalizer(risk_state if previous is not None else None, RISK_NORMALIZER)
+        new_scores = compute_weighted_risk_index(fred_df, normalizer=RISK_NORMALIZER, state=scaler)
+        if previous is not None and not new_scores.empty:
+            previous = previous[previous.index < new_scores.index.min()]
+        risk_index = new_scores if previous is None else pd.concat([previous, new_scores])
+        write_table(risk_index, risk_path)
+        # Saved last: a run that dies before the scores are stored redoes those dates
+        scaler.save(risk_state)
+
+    # --- Step 7: Visualization ---
+    def plot():
+        from visualization import plot_anomalies, plot_risk_index
+        plot_anomalies(read_table(anomalies_path), 'Volatility', 'anomaly', save_path=anomaly_png)
+        plot_risk_index(read_table(risk_path)['Market Risk Score'], save_path=risk_png)
+
+    market = {"ticker": TICKER, "start": START_DATE, "end": END_DATE}
+    return Pipeline([
+        Stage("prices", load_prices, outputs=[prices_path], params=market, max_age=DAY),
+        Stage("anomalies", detect_anomalies, inputs=[prices_path], outputs=[anomalies_path],
+              params={"features": ["Volatility"], "contamination": 0.05}),
+        Stage("forecast", forecast, inputs=[prices_path], outputs=[forecast_path],
+              params={"periods": FORECAST_DAYS}),
+        Stage("fred", fetch_fred, outputs=[fred_path], max_age=DAY),
+        Stage("zillow", fetch_zillow, outputs=[zillow_path], params={"zipcode": "90210", "limit": 10}, max_age=DAY),
+        Stage("reddit", fetch_reddit, outputs=[reddit_dir],
+              params={"subreddits": ["stocks", "investing"], "limit": 100}, max_age=DAY),
+        Stage("sentiment", score_sentiment, inputs=[prices_path, reddit_dir], outputs=[sentiment_path]),
+        Stage("sec", fetch_sec, outputs=[sec_dir], params={"ticker": "AAPL", "form": "10-K"}, max_age=DAY),
+        Stage("risk", compute_risk, inputs=[prices_path, fred_path], outputs=[risk_path],
+              params={"normalizer": RISK_NORMALIZER}),
+        Stage("plots", plot, inputs=[anomalies_path, risk_path], outputs=[anomaly_png, risk_png]),
+    ], state_path=data_dir / ".pipeline_state.json", max_workers=PIPELINE_WORKERS)
+
+
+def run_single_ticker(only=None, start_from=None, force=False):
+    summary = build_pipeline().run(only=only, start_from=start_from, force=force)
+
+    print("\n Stage summary:")
+    print(summary.fillna({"error": ""}).to_string(index=False))
+    print(f"\n Wall time: {summary.attrs['wall_seconds']:.2f}s "
+          f"(sum of stage times: {summary['seconds'].sum():.2f}s)")
+    if (summary['status'].isin(["failed", "blocked"])).any():
+        print("\n Pipeline finished with failures.")
+    else:
+        print("\n All pipeline steps completed.")
+
+
+def run_universe_mode(tickers, workers=None, scaling=False, backend="prophet", charts=False):
+    from universe import run_universe, scaling_report
+
+    if scaling:
+        print(f"\n[U] Measuring throughput scaling over {len(tickers)} tickers...")
+        report = scaling_report(tickers, START_DATE, END_DATE, backend=backend)
+        print(report.to_string(index=False))
+        report.to_csv(reports_dir / "universe_scaling.csv", index=False)
+        return
+
+    print(f"\n[U] Running pipeline for {len(tickers)} tickers...")
+    table, errors, stats = run_universe(tickers, START_DATE, END_DATE, max_workers=workers,
+                                         models_dir=models_dir, backend=backend)
+    write_table(table, table_path(data_dir, "universe_anomalies_forecast"))
+    if errors:
+        write_table(pd.Series(errors, name="error").rename_axis("Ticker"), table_path(data_dir, "universe_errors"))
+
+    print(f"\n Processed {stats['succeeded']}/{stats['tickers']} tickers "
+          f"in {stats['seconds']:.1f}s with {stats['workers']} workers "
+          f"({stats['tickers_per_sec']:.2f} tickers/sec)")
+
+    if charts and not table.empty:
+        from visualization import render_anomaly_charts
+
+        started = time.perf_counter()
+        rendered = render_anomaly_charts(table, reports_dir / "universe_charts", max_workers=workers)
+        failed = rendered['error'].notna().sum()
+        print(f" Rendered {len(rendered) - failed} anomaly charts in {time.perf_counter() - started:.1f}s"
+              + (f" ({failed} failed)" if failed else ""))
+
+
+def run_backtest_mode(tickers, workers=None):
+    from data_loader import load_many
+    from backtest import run_backtest, signal_report
+    from data_sources.fred_loader import fetch_fred_data, publication_lags
+
+    print(f"\n[B] Walk-forward backtest for {len(tickers)} tickers from {BACKTEST_START_DATE}...")
+    prices = load_many(tickers, BACKTEST_START_DATE, END_DATE)
+    try:
+        indicators = fetch_fred_data(start_date=BACKTEST_START_DATE, end_date=END_DATE)
+    except Exception as e:
+        print(f" Skipping the risk signal, FRED data unavailable: {e}")
+        indicators = None
+
+    tables, errors, stats = run_backtest(prices, indicators, lags=publication_lags(), max_workers=workers,
+                                         output_dir=data_dir)
+    if errors:
+        write_table(pd.Series(errors, name="error").rename_axis("Ticker"), table_path(data_dir, "backtest_errors"))
+
+    print(f"\n Backtested {stats['succeeded']}/{stats['tickers']} tickers ({stats['folds']} folds) "
+          f"in {stats['seconds']:.1f}s with {stats['workers']} workers ({stats['folds_per_sec']:.1f} folds/sec)")
+    if not tables['summary'].empty:
+        print(signal_report(tables['summary']).to_string(float_format=lambda x: f"{x:.2f}"))
+
+
+def export_tables(export_dir: Path = data_dir / "export"):
+    """
+    Write a CSV copy of every stored table in data/.
+    """
+    for path in sorted(data_dir.glob("*.parquet")):
+        print(f" Exported {export_csv(path, export_dir / f'{path.stem}.csv')}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CrashSentinel pipeline")
+    parser.add_argument("--tickers", nargs="+", help="Run universe mode for these tickers")
+    parser.add_argument("--tickers-file", type=Path, help="File with one ticker per line (universe mode)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: available CPUs)")
+    parser.add_argument("--scaling-report", action="store_true",
+                        help="Report tickers/sec for increasing worker counts instead of writing results")
+    parser.add_argument("--only", nargs="+", metavar="STAGE", help="Run only these pipeline stages")
+    parser.add_argument("--from", dest="start_from", metavar="STAGE",
+                        help="Run this pipeline stage and everything downstream of it")
+    parser.add_argument("--force", action="store_true", help="Re-run stages even if their outputs are up to date")
+    parser.add_argument("--forecast-backend", choices=["prophet", "ets"], default="prophet",
+                        help="Forecasting backend for universe mode")
+    parser.add_argument("--charts", action="store_true",
+                        help="Universe mode: write one anomaly chart per ticker to reports/universe_charts/")
+    parser.add_argument("--backtest", action="store_true",
+                        help="Universe mode: walk-forward backtest of the crash signals instead of the pipeline")
+    parser.add_argument("--export-csv", action="store_true", help="Also write CSV copies of the data/ tables")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs(reports_dir, exist_ok=True)
+    os.makedirs(models_dir, exist_ok=True)
+
+    tickers = list(args.tickers or [])
+    if args.tickers_file:
+        tickers += [line.strip() for line in args.tickers_file.read_text().splitlines() if line.strip()]
+
+    if tickers and args.backtest:
+        run_backtest_mode(tickers, workers=args.workers)
+    elif tickers:
+        run_universe_mode(tickers, workers=args.workers, scaling=args.scaling_report,
+                          backend=args.forecast_backend, charts=args.charts)
+    else:
+        run_single_ticker(only=args.only, start_from=args.start_from, force=args.force)
+
+    if args.export_csv:
+        export_tables()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# As-of alignment of mixed-frequency series (daily, monthly, quarterly, annual)
+# onto one target calendar, e.g. the trading days returned by load_yahoo_data.
+# Each calendar date takes the latest observation that had been published by
+# then, so nothing from the future leaks into the past (unlike ffill().bfill()
+# on an outer-joined frame).
+
+
+# Normalize a lag given as days, a string or a Timedelta
+def _lag_ns(lag) -> int:
+    if lag is None:
+        return 0
+    if isinstance(lag, (int, np.integer, float, np.floating)):
+        lag = pd.Timedelta(days=lag)
+    return pd.Timedelta(lag).value
+
+
+# Split the input into {name: (sorted int64 timestamps, float values)} without NaNs
+def _observations(series) -> dict:
+    if isinstance(series, pd.DataFrame):
+        series = {col: series[col] for col in series.columns}
+    elif isinstance(series, pd.Series):
+        series = {series.name: series}
+
+    prepared = {}
+    for name, s in series.items():
+        index = pd.DatetimeIndex(s.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        values = s.to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        times, values = index.as_unit("ns").asi8[present], values[present]
+        if len(times) > 1 and not (np.diff(times) >= 0).all():
+            order = np.argsort(times, kind="stable")
+            times, values = times[order], values[order]
+        prepared[name] = (times, values)
+    return prepared
+
+
+def align_asof(series, calendar, lags: dict = None, default_lag=None, max_age=None,
+               dtype=np.float32) -> pd.DataFrame:
+    """
+    Align series onto a calendar with as-of (last published value) semantics.
+
+    Args:
+        series (dict | pd.DataFrame | pd.Series): {name: series indexed by
+            observation date}, or a (possibly sparse, outer-joined) wide frame.
+        calendar (pd.DatetimeIndex | pd.DataFrame | pd.Series): Target dates;
+            a frame or series contributes its index.
+        lags (dict): {name: publication lag} as days, a string like '45D' or a
+            Timedelta. An observation dated d is usable from d + lag onwards.
+        default_lag: Lag for series missing from `lags`.
+        max_age: Leave a value missing once its observation date is older
+            than this (days, string or Timedelta); None keeps it forever.
+        dtype: Output dtype; float32 halves memory for wide panels.
+
+    Returns:
+        pd.DataFrame: One row per calendar date, one column per series,
+        NaN before a series' first published value.
+    """
+    if isinstance(calendar, (pd.DataFrame, pd.Series)):
+        calendar = calendar.index
+    calendar = pd.DatetimeIndex(calendar)
+    naive = calendar.tz_localize(None) if calendar.tz is not None else calendar
+    # The calendar is converted and sorted once and shared by every series
+    cal_ns = naive.as_unit("ns").asi8
+    order = None
+    if len(cal_ns) > 1 and not (np.diff(cal_ns) >= 0).all():
+        order = np.argsort(cal_ns, kind="stable")
+        cal_ns = cal_ns[order]
+
+    lags = lags or {}
+    max_age_ns = None if max_age is None else _lag_ns(max_age)
+    observations = _observations(series)
+    out = np.full((len(cal_ns), len(observations)), np.nan, dtype=dtype, order="F")
+
+    for j, (name, (times, values)) in enumerate(observations.items()):
+        if len(times) == 0:
+            continue
+        available = times + _lag_ns(lags.get(name, default_lag))
+        # Position of the last observation available on or before each date
+        pos = np.searchsorted(available, cal_ns, side="right") - 1
+        valid = pos >= 0
+        if max_age_ns is not None:
+            valid &= cal_ns - times[np.maximum(pos, 0)] <= max_age_ns
+        out[valid, j] = values[pos[valid]]
+
+    if order is not None:
+        unsorted = np.empty_like(out)
+        unsorted[order] = out
+        out = unsorted
+    aligned = pd.DataFrame(out, index=calendar, columns=list(observations))
+    aligned.index.name = calendar.name or "Date"
+    return aligned
@@ -1,5 +1,25 @@
+from __future__ import annotations
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import IsolationForest
+
+# sklearn and joblib are imported where they are used to keep module import cheap
+if TYPE_CHECKING:
+    from sklearn.ensemble import IsolationForest
+
+# Default directory for persisted models (created by main.py)
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+
+# Retrain triggers used when the training data has changed
+MAX_MODEL_AGE_DAYS = 30
+DRIFT_THRESHOLD = 0.5
 
 # Train Isolation Forest model
 def train_isolation_forest(df: pd.DataFrame, contamination: float = 0.05) -> IsolationForest:
@@ -13,6 +33,8 @@ def train_isolation_forest(df: pd.DataFrame, contamination: float = 0.05) -> Iso
     Returns:
         IsolationForest: Trained model.
     """
+    from sklearn.ensemble import IsolationForest
+
     model = IsolationForest(contamination=contamination, random_state=42)
     model.fit(df)
     return model
@@ -33,7 +55,8 @@ def detect_anomalies(model: IsolationForest, df: pd.DataFrame) -> pd.Series:
     return pd.Series(predictions, index=df.index)
 
 # Add anomaly flag column to a DataFrame
-def append_anomaly_column(df: pd.DataFrame, model: IsolationForest, features: list, column_name: str = 'anomaly') -> pd.DataFrame:
+def append_anomaly_column(df: pd.DataFrame, model: IsolationForest, features: list, column_name: str = 'anomaly',
+                          incremental: bool = False) -> pd.DataFrame:
     """
     Append anomaly results to original DataFrame.
 
@@ -42,11 +65,162 @@ def append_anomaly_column(df: pd.DataFrame, model: IsolationForest, features: li
         model (IsolationForest): Trained model.
         features (list): Feature column names.
         column_name (str): Name of the new column.
+        incremental (bool): Only score rows whose label is still missing.
 
     Returns:
         pd.DataFrame: Updated DataFrame with anomaly flag.
     """
     subset = df[features].dropna()
+    if incremental and column_name in df.columns:
+        subset = subset[df.loc[subset.index, column_name].isna()]
+    if subset.empty:
+        return df
     anomalies = model.predict(subset)
     df.loc[subset.index, column_name] = anomalies
-    return df
\ No newline at end of file
+    return df
+
+# Fingerprint training data and hyperparameters
+def fingerprint(df: pd.DataFrame, params: dict) -> str:
+    """
+    Hash the training data (values, index and column names) together with the
+    model hyperparameters.
+
+    Args:
+        df (pd.DataFrame): Training data.
+        params (dict): Hyperparameters passed to the model.
+
+    Returns:
+        str: Hex digest identifying this (data, params) combination.
+    """
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(json.dumps({"columns": list(map(str, df.columns)), "params": params}, sort_keys=True).encode())
+    return h.hexdigest()
+
+# Measure how far new data has moved from the training data
+def feature_drift(df: pd.DataFrame, train_stats: dict) -> float:
+    """
+    Largest standardized mean shift of any feature versus the training data.
+
+    Args:
+        df (pd.DataFrame): New data.
+        train_stats (dict): {column: {"mean": ..., "std": ...}} stored with the model.
+
+    Returns:
+        float: max |mean_new - mean_train| / std_train across features.
+    """
+    shifts = []
+    for col, stats in train_stats.items():
+        std = stats["std"] or 1.0
+        shifts.append(abs(df[col].mean() - stats["mean"]) / std)
+    return float(np.nanmax(shifts)) if shifts else 0.0
+
+def _safe_name(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]', '_', name)
+
+def _model_paths(models_dir: Path, name: str, fp: str) -> tuple:
+    stem = f"iforest_{_safe_name(name)}_{fp[:16]}"
+    return Path(models_dir) / f"{stem}.joblib", Path(models_dir) / f"{stem}.json"
+
+def _compatible_models(models_dir: Path, name: str, features: list, params: dict):
+    """
+    Yield (metadata path, metadata) for every saved model trained for the
+    same name, features and params.
+    """
+    # Only this name's files; the name check below still rules out prefixes such as 'AA' vs 'AA_B'
+    for meta_path in Path(models_dir).glob(f"iforest_{_safe_name(name)}_*.json"):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            # Removed by another process meanwhile
+            continue
+        if meta["name"] == name and meta["features"] == features and meta["params"] == params:
+            yield meta_path, meta
+
+def _latest_compatible(models_dir: Path, name: str, features: list, params: dict):
+    """
+    Find the newest saved model trained for the same name, features and params.
+    """
+    best = None
+    for meta_path, meta in _compatible_models(models_dir, name, features, params):
+        if best is None or meta["trained_at"] > best[1]["trained_at"]:
+            best = (meta_path.with_suffix(".joblib"), meta)
+    return best
+
+def _prune_superseded(models_dir: Path, name: str, features: list, params: dict, keep: Path) -> None:
+    """
+    Delete the models a retrain replaced, so models/ holds one model per
+    (name, features, params) instead of one per retrain.
+    """
+    for meta_path, _ in _compatible_models(models_dir, name, features, params):
+        if meta_path != keep:
+            # Metadata first: a model without metadata is never looked up
+            meta_path.unlink(missing_ok=True)
+            meta_path.with_suffix(".joblib").unlink(missing_ok=True)
+
+# Load a persisted model or train (and persist) a new one
+def load_or_train_isolation_forest(df: pd.DataFrame, contamination: float = 0.05, name: str = "default",
+                                   models_dir: Path = MODELS_DIR, max_age_days: float = MAX_MODEL_AGE_DAYS,
+                                   drift_threshold: float = DRIFT_THRESHOLD) -> IsolationForest:
+    """
+    Reuse a saved Isolation Forest when possible, retraining only when needed.
+
+    A model saved for exactly this data and these hyperparameters is always
+    reused. If the data has changed, the newest model for the same name,
+    features and hyperparameters is still reused unless it is older than
+    `max_age_days` or the feature drift exceeds `drift_threshold`.
+
+    Args:
+        df (pd.DataFrame): Data to train on.
+        contamination (float): Expected proportion of anomalies.
+        name (str): Model family, e.g. the ticker the model is trained for.
+        models_dir (Path): Where models and their metadata are stored.
+        max_age_days (float): Age trigger for retraining (None disables it).
+        drift_threshold (float): Drift trigger for retraining (None disables it).
+
+    Returns:
+        IsolationForest: Trained model.
+    """
+    import joblib
+
+    params = {"contamination": contamination, "random_state": 42}
+    features = list(map(str, df.columns))
+    fp = fingerprint(df, params)
+    model_path, meta_path = _model_paths(models_dir, name, fp)
+
+    if model_path.exists():
+        return joblib.load(model_path)
+
+    previous = _latest_compatible(models_dir, name, features, params) if Path(models_dir).exists() else None
+    if previous is not None:
+        prev_path, meta = previous
+        age_days = (datetime.now() - datetime.fromisoformat(meta["trained_at"])).total_seconds() / 86400
+        too_old = max_age_days is not None and age_days > max_age_days
+        drifted = drift_threshold is not None and feature_drift(df, meta["train_stats"]) > drift_threshold
+        if not too_old and not drifted and prev_path.exists():
+            return joblib.load(prev_path)
+
+    model = train_isolation_forest(df, contamination=contamination)
+
+    # Write to temporary files and rename, so concurrent workers never read a
+    # half-written model or metadata file; the metadata goes last
+    Path(models_dir).mkdir(parents=True, exist_ok=True)
+    tmp_model = model_path.with_suffix(".joblib.tmp")
+    joblib.dump(model, tmp_model)
+    os.replace(tmp_model, model_path)
+    meta = {
+        "name": name,
+        "features": features,
+        "params": params,
+        "fingerprint": fp,
+        "trained_at": datetime.now().isoformat(),
+        "n_rows": len(df),
+        "train_stats": {col: {"mean": float(df[col].mean()), "std": float(df[col].std())} for col in df.columns},
+    }
+    tmp_meta = meta_path.with_suffix(".json.tmp")
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, meta_path)
+    _prune_superseded(models_dir, name, features, params, keep=meta_path)
+    return model
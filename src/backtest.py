@@ -0,0 +1,352 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from config import default_workers
+from feature_engineering import volatility_index
+from alignment import align_asof
+from anomaly_detection import train_isolation_forest, append_anomaly_column
+from indicators.risk_score import compute_weighted_risk_index
+from storage import write_table, table_path
+
+# Walk-forward backtest of the crash signals against forward drawdowns.
+#
+# Signals are rebuilt as they would have been seen at the time:
+#   - 'anomaly': an Isolation Forest is trained on the volatility history
+#     before each test fold only, then labels that fold;
+#   - 'risk': the Market Risk Score with the point-in-time ('expanding')
+#     normalizer over indicators aligned as of their publication dates.
+# Volatility itself only looks back, so it is computed once per ticker; the
+# risk score is computed once for all tickers, from the first indicator date.
+
+# Forward window (trading days) in which a drawdown counts as "followed"
+HORIZON_DAYS = 63
+
+# Fall from the alarm's close (or from the running peak, for crash events)
+DRAWDOWN = 0.15
+
+# Walk-forward folds: first test fold needs this much history, folds are this
+# long, and training uses the latest TRAIN_WINDOW_DAYS (None = all history)
+MIN_TRAIN_DAYS = 504
+FOLD_DAYS = 252
+TRAIN_WINDOW_DAYS = 1260
+
+# Risk score (0-100) that counts as an alarm: categorize_risk's "High Risk"
+RISK_THRESHOLD = 75
+
+# Flagged days closer than this to the previous flagged day belong to the same alarm
+COOLDOWN_DAYS = 21
+
+
+def walk_forward_folds(n: int, min_train: int = MIN_TRAIN_DAYS, step: int = FOLD_DAYS,
+                       train_window: int = TRAIN_WINDOW_DAYS) -> list:
+    """
+    Positions of the walk-forward folds over a series of length n.
+
+    Returns:
+        list: (train_start, test_start, test_end) tuples; training always
+        ends where its test fold starts.
+    """
+    folds = []
+    for test_start in range(min_train, n, step):
+        train_start = 0 if train_window is None else max(0, test_start - train_window)
+        folds.append((train_start, test_start, min(test_start + step, n)))
+    return folds
+
+
+# Train on one fold's history and label its test rows (executed inside a worker process)
+def _fold_labels(job: tuple) -> tuple:
+    ticker, test_start, train, test, contamination = job
+    try:
+        model = train_isolation_forest(pd.DataFrame({'Volatility': train}), contamination=contamination)
+        labelled = append_anomaly_column(pd.DataFrame({'Volatility': test}), model, ['Volatility'])
+        return ticker, test_start, labelled['anomaly'].to_numpy(dtype=np.int8), None
+    except Exception as e:
+        return ticker, test_start, None, f"{type(e).__name__}: {e}"
+
+
+def forward_drawdown(close: np.ndarray, horizon: int = HORIZON_DAYS) -> np.ndarray:
+    """
+    Worst close over the next `horizon` days relative to today's close.
+
+    Returns:
+        np.ndarray: min(close[t+1 .. t+horizon]) / close[t] - 1, NaN where
+        the window runs past the end of the data.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n > horizon:
+        out[:n - horizon] = sliding_window_view(close[1:], horizon).min(axis=1) / close[:n - horizon] - 1
+    return out
+
+
+def drawdown_events(close: np.ndarray, depth: float = DRAWDOWN) -> np.ndarray:
+    """
+    Positions where the close first falls `depth` below its running peak,
+    once per drawdown episode (an episode ends at a new peak).
+    """
+    dd = close / np.maximum.accumulate(close) - 1
+    episode = np.cumsum(dd >= 0)
+    below = np.flatnonzero(dd <= -depth)
+    if below.size == 0:
+        return below
+    return below[np.r_[True, episode[below[1:]] != episode[below[:-1]]]]
+
+
+def score_signal(close: np.ndarray, flags: np.ndarray, start: int = 0, horizon: int = HORIZON_DAYS,
+                 drawdown: float = DRAWDOWN, cooldown: int = COOLDOWN_DAYS) -> tuple:
+    """
+    Scores one signal against what the price did afterwards.
+
+    An alarm is a flagged day after at least `cooldown` unflagged days. It
+    is a hit when the close falls `drawdown` below the alarm's close within
+    `horizon` days, and a false alarm when it does not; alarms too close to
+    the end of the data to know are left unscored. A crash event (first fall
+    of `drawdown` below the running peak) is caught when any day in the
+    `horizon` days before it was flagged; its lead time runs from the first
+    such day.
+
+    Args:
+        close (np.ndarray): Closes.
+        flags (np.ndarray): Boolean signal per day.
+        start (int): First position to evaluate (the out-of-sample start).
+
+    Returns:
+        tuple: (alarms DataFrame, events DataFrame) keyed by position
+    """
+    flagged = np.flatnonzero(flags[start:]) + start
+    onsets = flagged[np.r_[True, np.diff(flagged) > cooldown]] if flagged.size else flagged
+
+    fwd = forward_drawdown(close, horizon)[onsets]
+    hit = fwd <= -drawdown
+    breach = np.full(len(onsets), np.nan)
+    for i in np.flatnonzero(hit):
+        p = onsets[i]
+        breach[i] = 1 + np.argmax(close[p + 1:p + horizon + 1] <= close[p] * (1 - drawdown))
+    alarms = pd.DataFrame({
+        'position': onsets, 'forward_drawdown': fwd,
+        'hit': pd.array(np.where(np.isnan(fwd), None, hit), dtype="boolean"), 'days_to_drawdown': breach,
+    })
+
+    # Only events whose whole look-back window lies in the evaluated period
+    events = drawdown_events(close, drawdown)
+    events = events[events - horizon >= start]
+    caught = np.zeros(len(events), dtype=bool)
+    lead = np.full(len(events), np.nan)
+    if flagged.size:
+        # First flagged day on or after the start of each event's look-back window
+        first = flagged[np.minimum(np.searchsorted(flagged, events - horizon), len(flagged) - 1)]
+        caught = (first >= events - horizon) & (first < events)
+        lead[caught] = (events - first)[caught]
+    events = pd.DataFrame({'position': events, 'caught': caught, 'lead_days': lead})
+    return alarms, events
+
+
+def _summarize(alarms: pd.DataFrame, events: pd.DataFrame, days: int, flagged_share: float,
+               base_rate: float) -> dict:
+    scored = alarms['hit'].notna()
+    hits = int(alarms['hit'].sum())
+    false_alarms = int(scored.sum()) - hits
+    years = days / 252
+    return {
+        'alarms': int(scored.sum()),
+        'hits': hits,
+        'false_alarms': false_alarms,
+        'precision': hits / scored.sum() if scored.any() else np.nan,
+        # Share of days followed by a drawdown: the precision of flagging at random
+        'base_rate': base_rate,
+        'events': len(events),
+        'caught': int(events['caught'].sum()),
+        'recall': events['caught'].mean() if len(events) else np.nan,
+        'median_lead_days': events['lead_days'].median() if len(events) else np.nan,
+        'false_alarms_per_year': false_alarms / years if years > 0 else np.nan,
+        # A signal that is always on catches every event; this shows what that cost
+        'flagged_share': flagged_share,
+        'years': years,
+    }
+
+
+def _close_series(prices) -> pd.Series:
+    close = prices
+    if isinstance(close, pd.DataFrame):
+        if 'Close' not in close.columns:
+            return pd.Series(dtype=np.float64)
+        close = close['Close']
+        # ('Close', ticker) columns left over from a yfinance download
+        if isinstance(close, pd.DataFrame):
+            close = close.iloc[:, 0]
+    return close.dropna().sort_index().astype(np.float64)
+
+
+# Calendars are compared without their timezone, as align_asof does
+def _naive(index) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def _risk_history(indicators, calendars, lags: dict = None) -> pd.Series:
+    """
+    Score the Market Risk Score once for every ticker in the backtest.
+
+    The calendar runs over business days from the first indicator observation
+    and includes every price date, so the expanding normalizer has seen the
+    indicators' published history before the first price date rather than
+    scoring any early new high at 100.
+
+    Args:
+        indicators (pd.DataFrame): Raw macro indicators
+        calendars (list): Price date indexes to cover
+        lags (dict): Publication lags (see alignment.align_asof)
+
+    Returns:
+        pd.Series: Risk score on the combined calendar
+    """
+    dates = _naive(calendars[0]).append([_naive(index) for index in calendars[1:]]).unique()
+    first = _naive(indicators.index).min()
+    if pd.notna(first):
+        dates = dates.union(pd.bdate_range(first, dates.max()))
+    aligned = align_asof(indicators, dates.sort_values(), lags=lags)
+    return compute_weighted_risk_index(aligned, normalizer="expanding")
+
+
+def run_backtest(prices: dict, indicators: pd.DataFrame = None, lags: dict = None,
+                 horizon: int = HORIZON_DAYS, drawdown: float = DRAWDOWN, contamination: float = 0.05,
+                 min_train: int = MIN_TRAIN_DAYS, step: int = FOLD_DAYS, train_window: int = TRAIN_WINDOW_DAYS,
+                 risk_threshold: float = RISK_THRESHOLD, cooldown: int = COOLDOWN_DAYS,
+                 max_workers: int = None, output_dir=None) -> tuple:
+    """
+    Walk-forward backtest of the anomaly and risk signals for many tickers.
+
+    Every (ticker, fold) model is trained in a process pool; scoring is
+    vectorized per ticker afterwards.
+
+    Args:
+        prices (dict | pd.DataFrame): {ticker: Close series or price frame},
+            or a wide frame with one Close column per ticker
+        indicators (pd.DataFrame): Raw macro indicators (e.g. fetch_fred_data());
+            None skips the risk signal
+        lags (dict): Publication lags for `indicators` (see alignment.align_asof)
+        horizon (int): Forward window in trading days
+        drawdown (float): Drawdown depth that counts as a crash
+        contamination (float): Isolation Forest contamination
+        min_train, step, train_window (int): Fold layout (see walk_forward_folds)
+        risk_threshold (float): Risk score alarm level
+        cooldown (int): Days separating alarms
+        max_workers (int): Worker processes, defaults to the available CPUs
+        output_dir (Path): Write backtest_summary / backtest_alarms / backtest_events here
+
+    Returns:
+        tuple: ({'summary', 'alarms', 'events'} DataFrames, {ticker: error}, stats dict)
+    """
+    max_workers = max_workers or default_workers()
+    started = time.perf_counter()
+    if isinstance(prices, pd.DataFrame):
+        prices = {ticker: prices[ticker] for ticker in prices.columns}
+
+    # --- Features and fold jobs ---
+    closes, volatility, jobs, errors = {}, {}, [], {}
+    for ticker, frame in prices.items():
+        close = _close_series(frame)
+        if close.empty:
+            errors[ticker] = "No price data"
+            continue
+        vol = volatility_index(close).dropna()
+        if len(vol) <= min_train:
+            errors[ticker] = f"only {len(vol)} days of volatility, need more than {min_train}"
+            continue
+        closes[ticker], volatility[ticker] = close, vol
+        values = vol.to_numpy(dtype=np.float64)
+        for train_start, test_start, test_end in walk_forward_folds(len(values), min_train, step, train_window):
+            jobs.append((ticker, test_start, values[train_start:test_start], values[test_start:test_end],
+                         contamination))
+
+    # --- Out-of-sample anomaly labels ---
+    if max_workers == 1:
+        results = [_fold_labels(job) for job in jobs]
+    else:
+        # Batches amortise the pickling round-trip over several folds
+        chunksize = max(1, len(jobs) // (max_workers * 8))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_fold_labels, jobs, chunksize=chunksize))
+
+    labels = {ticker: np.zeros(len(vol), dtype=np.int8) for ticker, vol in volatility.items()}
+    for ticker, test_start, fold, error in results:
+        if error:
+            errors.setdefault(ticker, error)
+        else:
+            labels[ticker][test_start:test_start + len(fold)] = fold
+
+    # --- Scoring ---
+    risk = None
+    if indicators is not None and closes:
+        risk = _risk_history(indicators, [close.index for close in closes.values()], lags)
+
+    summary, alarm_frames, event_frames = [], [], []
+    for ticker, close in closes.items():
+        if ticker in errors:
+            continue
+        vol = volatility[ticker]
+        values = close.to_numpy()
+        # Evaluate from the first out-of-sample day, the same period for every signal
+        start = close.index.get_loc(vol.index[min_train])
+        flags = {'anomaly': np.zeros(len(close), dtype=bool)}
+        flags['anomaly'][close.index.get_indexer(vol.index)] = labels[ticker] == -1
+        if risk is not None:
+            flags['risk'] = (risk.reindex(_naive(close.index)) >= risk_threshold).to_numpy()
+
+        fwd = forward_drawdown(values, horizon)[start:]
+        known = fwd[~np.isnan(fwd)]
+        base_rate = (known <= -drawdown).mean() if known.size else np.nan
+        for signal, flagged in flags.items():
+            alarms, events = score_signal(values, flagged, start, horizon, drawdown, cooldown)
+            summary.append({'Ticker': ticker, 'signal': signal,
+                            **_summarize(alarms, events, len(values) - start, flagged[start:].mean(), base_rate)})
+            for frame, out in ((alarms, alarm_frames), (events, event_frames)):
+                dates = close.index[frame['position'].to_numpy()]
+                out.append(frame.drop(columns='position').assign(Ticker=ticker, signal=signal, Date=dates))
+
+    columns = ['Ticker', 'signal', 'Date']
+    tables = {
+        'summary': pd.DataFrame(summary),
+        'alarms': pd.concat(alarm_frames, ignore_index=True) if alarm_frames else pd.DataFrame(columns=columns),
+        'events': pd.concat(event_frames, ignore_index=True) if event_frames else pd.DataFrame(columns=columns),
+    }
+    for name in ('alarms', 'events'):
+        table = tables[name]
+        tables[name] = table[columns + [c for c in table.columns if c not in columns]]
+
+    if output_dir is not None:
+        for name, table in tables.items():
+            write_table(table, table_path(Path(output_dir), f"backtest_{name}"))
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "tickers": len(prices),
+        "succeeded": sum(ticker not in errors for ticker in closes),
+        "failed": len(errors),
+        "folds": len(jobs),
+        "workers": max_workers,
+        "seconds": elapsed,
+        "folds_per_sec": len(jobs) / elapsed if elapsed > 0 else float('nan'),
+    }
+    return tables, errors, stats
+
+
+def signal_report(summary: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pools a run_backtest() summary over tickers, one row per signal.
+    """
+    pooled = summary.groupby('signal').agg(
+        tickers=('Ticker', 'nunique'), alarms=('alarms', 'sum'), hits=('hits', 'sum'),
+        false_alarms=('false_alarms', 'sum'), events=('events', 'sum'), caught=('caught', 'sum'),
+        median_lead_days=('median_lead_days', 'median'), flagged_share=('flagged_share', 'mean'),
+        base_rate=('base_rate', 'mean'), years=('years', 'sum'),
+    )
+    pooled['precision'] = pooled['hits'] / pooled['alarms']
+    pooled['recall'] = pooled['caught'] / pooled['events']
+    pooled['false_alarms_per_year'] = pooled['false_alarms'] / pooled['years']
+    return pooled.drop(columns='years')
@@ -0,0 +1,22 @@
+import os
+from pathlib import Path
+
+# Settings shared by several modules. Each module keeps its own tuning
+# constants; only what has to agree across modules lives here.
+
+# Root of the on-disk caches (override with CRASHSENTINEL_CACHE_DIR)
+CACHE_DIR = Path(os.getenv(
+    "CRASHSENTINEL_CACHE_DIR",
+    Path(__file__).resolve().parent.parent / "data" / "cache"
+))
+
+
+# Number of workers to use when none is given
+def default_workers() -> int:
+    """
+    Returns the number of CPUs this process may run on.
+    """
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
@@ -1,27 +1,127 @@
 import os
-import yfinance as yf
-from fredapi import Fred
 import pandas as pd
 from dotenv import load_dotenv
+from price_cache import read_cached_prices, write_cached_prices, missing_ranges, merge_prices, update_coverage
 
 load_dotenv()  # Load environment variables from .env
 
-def load_yahoo_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    try:
-        print(f" Downloading Yahoo data for {ticker}...")
-        df = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True)
-        df.dropna(inplace=True)
+# Flatten yfinance's (Price, Ticker) columns for a single ticker
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = [col[0] for col in df.columns]
+    return df
+
+# Slice a bar frame to the [start, end) window used by yf.download
+def _slice_range(df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    if df.empty:
         return df
+    return df[(df.index >= pd.Timestamp(start_date)) & (df.index < pd.Timestamp(end_date))]
+
+# Download the missing windows for one ticker and persist the merged result
+def _refresh_cache(ticker: str, cached: pd.DataFrame, meta: dict, ranges: list,
+                   interval: str, auto_adjust: bool, cache_dir=None) -> pd.DataFrame:
+    import yfinance as yf
+
+    changed = False
+    for start, end in ranges:
+        # yfinance reports most failures as an empty frame rather than raising;
+        # either way the window stays uncovered so the next call retries it
+        try:
+            fresh = yf.download(ticker, start=start, end=end, interval=interval,
+                                auto_adjust=auto_adjust, progress=False)
+        except Exception as e:
+            print(f" Error fetching Yahoo data for {ticker} ({start} to {end}): {e}")
+            continue
+        fresh = _flatten_columns(fresh).dropna()
+        if fresh.empty:
+            continue
+        cached = merge_prices(cached, fresh)
+        meta = update_coverage(meta, start, end)
+        changed = True
+    if changed:
+        write_cached_prices(cached, meta, ticker, interval, auto_adjust, cache_dir)
+    return cached
+
+def load_yahoo_data(ticker: str, start_date: str, end_date: str, interval: str = "1d",
+                    auto_adjust: bool = True, use_cache: bool = True, cache_dir=None) -> pd.DataFrame:
+    try:
+        if not use_cache:
+            import yfinance as yf
+
+            print(f" Downloading Yahoo data for {ticker}...")
+            df = yf.download(ticker, start=start_date, end=end_date, interval=interval, auto_adjust=auto_adjust)
+            df.dropna(inplace=True)
+            return df
+
+        cached, meta = read_cached_prices(ticker, interval, auto_adjust, cache_dir)
+        last_bar = cached.index.max() if not cached.empty else None
+        ranges = missing_ranges(meta, start_date, end_date, last_bar=last_bar)
+        if ranges:
+            print(f" Downloading Yahoo data for {ticker} ({len(ranges)} missing range(s))...")
+            cached = _refresh_cache(ticker, cached, meta, ranges, interval, auto_adjust, cache_dir)
+        else:
+            print(f" Loaded cached Yahoo data for {ticker}")
+        return _slice_range(cached, start_date, end_date)
     except Exception as e:
         print(f" Error fetching Yahoo data: {e}")
         return pd.DataFrame()
 
+def load_many(tickers: list, start_date: str, end_date: str, interval: str = "1d",
+              auto_adjust: bool = True, cache_dir=None) -> dict:
+    """
+    Load several tickers, serving cached ones from disk and downloading
+    all cache misses in a single batched yf.download call.
+
+    Returns:
+        dict: ticker -> price DataFrame (empty if the download failed)
+    """
+    frames, misses = {}, {}
+    for ticker in tickers:
+        cached, meta = read_cached_prices(ticker, interval, auto_adjust, cache_dir)
+        last_bar = cached.index.max() if not cached.empty else None
+        ranges = missing_ranges(meta, start_date, end_date, last_bar=last_bar)
+        if ranges:
+            misses[ticker] = (cached, meta, ranges)
+        else:
+            frames[ticker] = _slice_range(cached, start_date, end_date)
+
+    print(f" {len(frames)} ticker(s) served from cache, {len(misses)} to download")
+    if misses:
+        # One window spanning every gap keeps it to a single request
+        batch_start = min(r[0] for _, _, ranges in misses.values() for r in ranges)
+        batch_end = max(r[1] for _, _, ranges in misses.values() for r in ranges)
+        try:
+            import yfinance as yf
+            batch = yf.download(list(misses), start=batch_start, end=batch_end, interval=interval,
+                                auto_adjust=auto_adjust, group_by="ticker", progress=False)
+        except Exception as e:
+            print(f" Error fetching Yahoo data: {e}")
+            batch = pd.DataFrame()
+
+        for ticker, (cached, meta, ranges) in misses.items():
+            if isinstance(batch.columns, pd.MultiIndex) and ticker in batch.columns.get_level_values(0):
+                fresh = batch[ticker].dropna()
+            else:
+                fresh = pd.DataFrame()
+            if fresh.empty:
+                frames[ticker] = _slice_range(cached, start_date, end_date)
+                continue
+            fresh.columns.name = None
+            cached = merge_prices(cached, fresh)
+            meta = update_coverage(meta, batch_start, batch_end)
+            write_cached_prices(cached, meta, ticker, interval, auto_adjust, cache_dir)
+            frames[ticker] = _slice_range(cached, start_date, end_date)
+
+    return {ticker: frames[ticker] for ticker in tickers}
+
 def load_fred_data(series_id: str) -> pd.Series:
     try:
         fred_api_key = os.getenv("FRED_API_KEY")
         if not fred_api_key:
             raise ValueError("FRED_API_KEY not found in environment.")
         print(f"📊 Fetching FRED data for series: {series_id}...")
+        from fredapi import Fred
         fred = Fred(api_key=fred_api_key)
         series = fred.get_series(series_id)
         series.name = series_id
@@ -0,0 +1,79 @@
+import os
+import json
+import uuid
+import threading
+from pathlib import Path
+import pandas as pd
+
+# Append-only store of Parquet part files for scraped records. Each append
+# writes one new immutable file, so earlier data is never rewritten and a crash
+# can at worst lose the batch being written. A small JSON checkpoint kept next
+# to the parts lets scrapers resume where the previous run stopped.
+
+CHECKPOINT_FILE = "_checkpoint.json"
+
+
+class PartStore:
+    """
+    Directory of Parquet part files read back as one table.
+
+    Parameters:
+        directory (Path): Where part files and the checkpoint live.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def parts(self) -> list:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("part-*.parquet"))
+
+    def append(self, df: pd.DataFrame) -> Path:
+        """
+        Write `df` as a new part file; empty frames are ignored.
+
+        Returns:
+            Path: The part file written, or None.
+        """
+        if df.empty:
+            return None
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Zero-padded sequence keeps parts in write order; the suffix avoids clashes between processes
+            name = f"part-{len(self.parts()):06d}-{uuid.uuid4().hex[:8]}.parquet"
+            path = self.directory / name
+            # Leading dot: readers skip hidden files, so half-written parts are never seen
+            tmp_path = self.directory / f".{name}.tmp"
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        return path
+
+    def read(self, columns: list = None) -> pd.DataFrame:
+        """
+        Concatenate all parts (optionally only some columns) in write order.
+        """
+        parts = self.parts()
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat([pd.read_parquet(p, columns=columns) for p in parts], ignore_index=True)
+
+    def read_checkpoint(self) -> dict:
+        path = self.directory / CHECKPOINT_FILE
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def write_checkpoint(self, checkpoint: dict) -> None:
+        """
+        Atomically replace the checkpoint; call after the data it describes is appended.
+        """
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / CHECKPOINT_FILE
+            tmp_path = self.directory / f".{CHECKPOINT_FILE}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(checkpoint, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
@@ -0,0 +1,157 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from dotenv import load_dotenv
+
+from data_sources.http_utils import RateLimiter, build_session
+
+load_dotenv()
+
+# FRED REST endpoint (override with FRED_API_URL, e.g. to point at a local stub server)
+FRED_API_URL = os.getenv("FRED_API_URL", "https://api.stlouisfed.org/fred")
+
+# FRED allows 120 requests per minute per key
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 10
+DEFAULT_WORKERS = 8
+
+
+class FredEngine:
+    """
+    Concurrent FRED fetcher shared by every module that needs FRED series.
+
+    Concurrent callers asking for the same (series_id, start, end) while it is
+    in flight share one download. Finished requests are not memoized, so a
+    later call (e.g. after a dashboard cache TTL expires) sees fresh data.
+
+    Parameters:
+        api_key (str): FRED API key, defaults to the FRED_API_KEY environment variable.
+        base_url (str): FRED REST root, defaults to FRED_API_URL.
+        max_workers (int): Maximum concurrent HTTP requests.
+        rate (float): Sustained requests per second.
+        burst (int): Requests allowed back-to-back before throttling.
+        timeout (float): Per-request timeout in seconds.
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = FRED_API_URL, max_workers: int = DEFAULT_WORKERS,
+                 rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, timeout: float = 30):
+        self.api_key = api_key or os.getenv("FRED_API_KEY")
+        if not self.api_key:
+            raise ValueError("FRED_API_KEY not found. Please set it in a .env file or environment variable.")
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = build_session(pool_size=max_workers)
+        self.limiter = RateLimiter(rate, burst)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fred")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _download(self, series_id: str, start_date, end_date) -> pd.Series:
+        params = {"series_id": series_id, "api_key": self.api_key, "file_type": "json"}
+        if start_date:
+            params["observation_start"] = str(pd.Timestamp(start_date).date())
+        if end_date:
+            params["observation_end"] = str(pd.Timestamp(end_date).date())
+
+        self.limiter.acquire()
+        response = self.session.get(f"{self.base_url}/series/observations", params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to fetch FRED series {series_id}: {response.status_code}")
+
+        obs = response.json().get("observations", [])
+        index = pd.to_datetime([o["date"] for o in obs])
+        # FRED marks missing observations with "."
+        values = pd.to_numeric(pd.Series([o["value"] for o in obs], dtype="object"), errors="coerce")
+        return pd.Series(values.to_numpy(dtype="float64"), index=index, name=series_id)
+
+    def submit(self, series_id: str, start_date=None, end_date=None):
+        """
+        Schedule a series download, joining an identical request still in flight.
+
+        Returns:
+            concurrent.futures.Future: Resolves to a pd.Series indexed by date.
+        """
+        key = (series_id, start_date and str(start_date), end_date and str(end_date))
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._download, series_id, start_date, end_date)
+            self._futures[key] = future
+        # Registered outside the lock: it runs immediately if the download already finished
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key: tuple, future) -> None:
+        # Callers already hold the future; only the in-flight registry lets go of it
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    def get_series(self, series_id: str, start_date=None, end_date=None) -> pd.Series:
+        """
+        Fetch a single series (blocking).
+        """
+        return self.submit(series_id, start_date, end_date).result().copy()
+
+    def fetch(self, series, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Fetch several series concurrently and align them on one date index.
+
+        Args:
+            series (dict | list): {series_id: column name} or a list of series ids.
+            start_date, end_date: Observation window.
+
+        Returns:
+            pd.DataFrame: Outer-joined, date-sorted frame with a 'Date' index.
+        """
+        if not isinstance(series, dict):
+            series = {code: code for code in series}
+        futures = {name: self.submit(code, start_date, end_date) for code, name in series.items()}
+        return self._assemble(futures)
+
+    def fetch_many(self, requests: dict) -> dict:
+        """
+        Fetch several independent requests in one concurrent batch.
+
+        Args:
+            requests (dict): {name: (series, start_date, end_date)} where `series`
+                is accepted in the same forms as `fetch`.
+
+        Returns:
+            dict: {name: aligned pd.DataFrame}
+        """
+        pending = {}
+        # Submit everything before waiting so all requests overlap
+        for name, (series, start_date, end_date) in requests.items():
+            if not isinstance(series, dict):
+                series = {code: code for code in series}
+            pending[name] = {col: self.submit(code, start_date, end_date) for code, col in series.items()}
+        return {name: self._assemble(futures) for name, futures in pending.items()}
+
+    @staticmethod
+    def _assemble(futures: dict) -> pd.DataFrame:
+        frames = [future.result().rename(name) for name, future in futures.items()]
+        df = pd.concat(frames, axis=1).sort_index()
+        df.index.name = "Date"
+        return df
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_fred_engine(api_key: str = None) -> FredEngine:
+    """
+    Return the process-wide FredEngine, creating it on first use.
+    """
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = FredEngine(api_key=api_key)
+        return _ENGINE
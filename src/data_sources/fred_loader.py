@@ -1,17 +1,8 @@
-import streamlit as st
+import os
+import sys
+from functools import lru_cache
 import pandas as pd
-import requests
-from fredapi import Fred
-
-# --- Load FRED API key from Streamlit secrets (for deployment) ---
-try:
-    FRED_API_KEY = st.secrets["FRED_API_KEY"]
-except Exception:
-    st.error(" FRED_API_KEY not found in Streamlit secrets. Please add it via Settings > Secrets.")
-    st.stop()
-
-# --- Initialize FRED client ---
-fred = Fred(api_key=FRED_API_KEY)
+from data_sources.fred_engine import get_fred_engine
 
 # --- Indicator dictionary ---
 INDICATORS = {
@@ -22,42 +13,107 @@ INDICATORS = {
     "GDPC1": "Real GDP (Billions, Chained 2012 USD)"
 }
 
-# --- Fetch main FRED indicator time series ---
-def fetch_fred_data(indicators=INDICATORS, start_date="2010-01-01", end_date=None) -> pd.DataFrame:
-    st.info(" Fetching FRED economic indicators...")
-    data_frames = []
+# --- Approximate days from a series' observation date (period start) to its first release ---
+PUBLICATION_LAGS = {
+    "MEHOINUSA672N": 640,   # annual, published in September of the following year
+    "CPIAUCSL": 45,         # monthly, mid-way through the next month
+    "UNRATE": 37,           # monthly, first Friday of the next month
+    "FEDFUNDS": 32,         # monthly average, first business day of the next month
+    "GDPC1": 120,           # quarterly, advance estimate ~30 days after quarter end
+    "MSPUS": 115,           # quarterly, ~25 days after quarter end
+    "HHMSDODNS": 160,       # quarterly Z.1 release, ~10 weeks after quarter end
+}
+DEFAULT_DAILY_LAG = 1
+
+# --- Publication lags keyed by column name instead of series code ---
+def publication_lags(indicators=INDICATORS) -> dict:
+    return {name: PUBLICATION_LAGS.get(code, DEFAULT_DAILY_LAG) for code, name in indicators.items()}
+
+# --- Streamlit module when running inside the dashboard, else None ---
+def _streamlit():
+    # Only look at an already-imported streamlit so CLI runs never pay for importing it
+    st = sys.modules.get("streamlit")
+    if st is None:
+        return None
+    try:
+        from streamlit import runtime
+        return st if runtime.exists() else None
+    except ImportError:
+        return None
 
+# --- Report progress in the dashboard or on stdout ---
+def _status(message: str, info: bool = False) -> None:
+    st = _streamlit()
+    if st is None:
+        print(message)
+    elif info:
+        st.info(message)
+    else:
+        st.write(message)
+
+# --- Resolve the FRED API key (environment first, then Streamlit secrets) ---
+@lru_cache(maxsize=1)
+def get_fred_api_key() -> str:
+    api_key = os.getenv("FRED_API_KEY")
+    st = _streamlit()
+    if not api_key and st is not None:
+        try:
+            api_key = st.secrets["FRED_API_KEY"]
+        except Exception:
+            pass
+    if not api_key:
+        raise ValueError("FRED_API_KEY not found. Set it in the environment or in Streamlit secrets (Settings > Secrets).")
+    return api_key
+
+# --- FRED client for search/category endpoints, built on first use ---
+@lru_cache(maxsize=1)
+def get_fred_client():
+    from fredapi import Fred
+    return Fred(api_key=get_fred_api_key())
+
+# --- Fetch main FRED indicator time series ---
+def fetch_fred_data(indicators=INDICATORS, start_date="2010-01-01", end_date=None, calendar=None) -> pd.DataFrame:
+    """
+    Without a calendar, returns the series outer-joined on their observation
+    dates. With a calendar (e.g. trading days), returns one row per calendar
+    date holding the latest value already published on that date.
+    """
+    _status(" Fetching FRED economic indicators...", info=True)
     for code, desc in indicators.items():
-        st.write(f"• {desc} ({code})")
-        series = fred.get_series(code, observation_start=start_date, observation_end=end_date)
-        df = series.to_frame(name=desc)
-        df.index.name = "Date"
-        data_frames.append(df)
+        _status(f"• {desc} ({code})")
+
+    # All series are downloaded concurrently through the shared engine
+    engine = get_fred_engine(get_fred_api_key())
+    if calendar is None:
+        return engine.fetch(indicators, start_date, end_date)
 
-    return pd.concat(data_frames, axis=1)
+    from alignment import align_asof
+    futures = {name: engine.submit(code, start_date, end_date) for code, name in indicators.items()}
+    return align_asof({name: f.result() for name, f in futures.items()}, calendar,
+                      lags=publication_lags(indicators))
 
 # --- Search for series by keyword ---
 def search_series_by_keyword(keyword: str, limit=10) -> pd.DataFrame:
-    st.write(f" Searching FRED for: '{keyword}'")
-    results = fred.search(keyword, limit=limit)
+    _status(f" Searching FRED for: '{keyword}'")
+    results = get_fred_client().search(keyword, limit=limit)
     return results[['id', 'title']]
 
 # --- Get series in a given category ---
 def get_series_by_category(category_id: int) -> pd.DataFrame:
-    st.write(f" Getting series from category ID: {category_id}")
-    df = fred.get_series_in_category(category_id)
+    _status(f" Getting series from category ID: {category_id}")
+    df = get_fred_client().get_series_in_category(category_id)
     return df[['id', 'title']]
 
 # --- Get release dates for a series ---
 def get_series_release_dates(series_id: str) -> pd.DataFrame:
-    st.write(f" Fetching release dates for series: {series_id}")
-    url = "https://api.stlouisfed.org/fred/series/observations"
+    _status(f" Fetching release dates for series: {series_id}")
+    engine = get_fred_engine(get_fred_api_key())
     params = {
         "series_id": series_id,
-        "api_key": FRED_API_KEY,
+        "api_key": engine.api_key,
         "file_type": "json"
     }
-    r = requests.get(url, params=params)
+    r = engine.session.get(f"{engine.base_url}/series/observations", params=params, timeout=engine.timeout)
     if r.status_code != 200:
         raise Exception(f"Failed to fetch observations: {r.status_code}")
     obs = r.json()["observations"]
@@ -67,6 +123,5 @@ def get_series_release_dates(series_id: str) -> pd.DataFrame:
 if __name__ == "__main__":
     df = fetch_fred_data()
     print(df.tail())
-    import os
     os.makedirs("../../data", exist_ok=True)
     df.to_csv("../../data/fred_indicators.csv")
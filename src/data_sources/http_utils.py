@@ -0,0 +1,104 @@
+import time
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Longest Retry-After honoured, in seconds
+MAX_RETRY_AFTER = 120
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by all workers talking to one host.
+
+    Parameters:
+        rate (float): Sustained requests per second.
+        burst (int): Requests allowed back-to-back before throttling kicks in.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve a token even when short, so later callers queue behind us
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            self._tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+
+
+def build_session(pool_size: int = 10, retries: int = 3, headers: dict = None,
+                  status_retries: bool = True) -> requests.Session:
+    """
+    Create a requests.Session with a connection pool sized for `pool_size`
+    concurrent workers and retry/backoff on transient HTTP errors.
+
+    urllib3 re-sends retried requests inside session.get(), behind any rate
+    limiter's back. For hosts with a hard request cap pass
+    status_retries=False (only connection errors are retried) and retry
+    429/5xx replies with get_with_retry() instead.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=list(RETRY_STATUSES) if status_retries else [],
+        allowed_methods=["GET", "HEAD"],
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+# Seconds to wait as asked by a Retry-After header (delay or HTTP date), or None
+def retry_after_seconds(response: requests.Response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def get_with_retry(session: requests.Session, limiter: RateLimiter, url: str, retries: int = 3,
+                   backoff: float = 0.5, **kwargs) -> requests.Response:
+    """
+    GET through `limiter`, retrying 429/5xx replies with every attempt
+    taking a fresh token, so retries count against the rate cap too.
+
+    The wait before a retry is the server's Retry-After when given, else an
+    exponential backoff. The last response is returned whatever its status.
+    """
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        response = session.get(url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        wait = retry_after_seconds(response)
+        response.close()
+        time.sleep(backoff * 2 ** attempt if wait is None else wait)
@@ -6,12 +6,6 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Quandl API key
-QUANDL_API_KEY = os.getenv("QUANDL_API_KEY")
-
-if not QUANDL_API_KEY:
-    raise EnvironmentError("QUANDL_API_KEY not found. Please set it in a .env file or environment variable.")
-
 # Base URL for Quandl API
 QUANDL_BASE_URL = "https://www.quandl.com/api/v3/datasets"
 
@@ -28,6 +22,10 @@ def fetch_quandl_data(indicators=QUANDL_INDICATORS, start_date="2010-01-01", end
     """
     Fetch multiple economic indicators from Quandl and return as a merged DataFrame.
     """
+    api_key = os.getenv("QUANDL_API_KEY")
+    if not api_key:
+        raise EnvironmentError("QUANDL_API_KEY not found. Please set it in a .env file or environment variable.")
+
     print("\✨ Fetching Quandl economic indicators...")
     dfs = []
 
@@ -35,7 +33,7 @@ def fetch_quandl_data(indicators=QUANDL_INDICATORS, start_date="2010-01-01", end
         print(f"  • {desc} ({code})")
         url = f"{QUANDL_BASE_URL}/{code}.json"
         params = {
-            "api_key": QUANDL_API_KEY,
+            "api_key": api_key,
             "start_date": start_date
         }
         if end_date:
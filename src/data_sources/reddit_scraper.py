@@ -1,26 +1,52 @@
 import os
+from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-import praw
 from dotenv import load_dotenv
 from datetime import datetime
 
+from data_sources.columnar_store import PartStore
+
 # Load environment variables (Reddit credentials)
 load_dotenv()
 
-# Load Reddit API credentials from .env
-REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
-REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
-REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT", "crashsentinel-agent")
+# Default location of the append-only post store
+REDDIT_STORE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "reddit_posts"
+
+# Compact column types for stored posts
+POST_DTYPES = {
+    "subreddit": "category",
+    "id": "string",
+    "title": "string",
+    "score": np.int32,
+    "num_comments": np.int32,
+    "created_utc": "datetime64[s]",
+    "url": "string",
+}
+
+
+@lru_cache(maxsize=1)
+def get_reddit_client():
+    """
+    Build the praw.Reddit client on first use from credentials in the environment.
+    """
+    import praw
 
-if not all([REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT]):
-    raise ValueError("Reddit API credentials missing in environment variables.")
+    client_id = os.getenv("REDDIT_CLIENT_ID")
+    client_secret = os.getenv("REDDIT_CLIENT_SECRET")
+    user_agent = os.getenv("REDDIT_USER_AGENT", "crashsentinel-agent")
+
+    if not all([client_id, client_secret, user_agent]):
+        raise ValueError("Reddit API credentials missing in environment variables.")
+
+    return praw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent
+    )
 
-# Initialize Reddit client
-reddit = praw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_CLIENT_SECRET,
-    user_agent=REDDIT_USER_AGENT
-)
 
 def scrape_reddit_posts(subreddit_name="wallstreetbets", query="market crash", limit=100):
     """
@@ -35,7 +61,7 @@ def scrape_reddit_posts(subreddit_name="wallstreetbets", query="market crash", l
         pd.DataFrame: DataFrame of post titles, dates, scores, and comments.
     """
     print(f" Scraping r/{subreddit_name} for '{query}' (limit={limit})...")
-    subreddit = reddit.subreddit(subreddit_name)
+    subreddit = get_reddit_client().subreddit(subreddit_name)
     posts = subreddit.search(query, limit=limit, sort="new")
 
     records = []
@@ -52,6 +78,135 @@ def scrape_reddit_posts(subreddit_name="wallstreetbets", query="market crash", l
     return pd.DataFrame(records)
 
 
+# Pull posts newer than a checkpoint from one subreddit
+def _fetch_new_posts(client, subreddit_name: str, query: str, limit: int, since: float, seen_at_since: set,
+                     after: str = None) -> tuple:
+    """
+    Results are sorted newest first, so paging stops at the first post that
+    is not newer than the checkpoint instead of walking the whole listing.
+    `after` resumes the listing below a post fetched by an earlier run.
+
+    Returns:
+        tuple: (records, reached, oldest) where `reached` says whether paging
+        got back to the checkpoint (or the end of the listing) and `oldest`
+        is the fullname of the last post seen
+    """
+    paging = {"params": {"after": after}} if after else {}
+    posts = client.subreddit(subreddit_name).search(query, limit=limit, sort="new", **paging)
+    records, seen, oldest = [], 0, after
+    for post in posts:
+        created = float(post.created_utc)
+        if created < since:
+            return records, True, oldest
+        seen += 1
+        oldest = post.fullname
+        if created == since and post.id in seen_at_since:
+            continue
+        records.append({
+            "subreddit": subreddit_name,
+            "id": post.id,
+            "title": post.title,
+            "score": post.score,
+            "num_comments": post.num_comments,
+            "created_utc": created,
+            "url": post.url,
+        })
+    # A short page means the listing ran out before the limit
+    return records, limit is None or seen < limit or since == float("-inf"), oldest
+
+
+# Checkpoint mark for the newest of `posts`, merged with `mark` when they share a second
+def _newest_mark(posts: list, mark: dict) -> dict:
+    newest = max(post["created_utc"] for post in posts)
+    ids = [post["id"] for post in posts if post["created_utc"] == newest]
+    if mark.get("created_utc") == newest:
+        ids = sorted(set(ids) | set(mark.get("ids", [])))
+    return {"created_utc": newest, "ids": ids}
+
+
+# Next checkpoint state for one subreddit after a fetch
+def _next_checkpoint(state: dict, posts: list, reached: bool, oldest: str) -> dict:
+    """
+    The checkpoint only moves once everything down to it has been stored.
+    When `limit` cuts a run short, the newest post is parked under 'pending'
+    and 'after' records where paging stopped; later runs continue from there
+    until they reach the old checkpoint, then promote 'pending'.
+    """
+    mark = {"created_utc": state["created_utc"], "ids": state.get("ids", [])} if "created_utc" in state else {}
+    pending = state.get("pending")
+    if posts and pending is None:
+        pending = _newest_mark(posts, mark)
+    if reached:
+        return pending or mark
+    return {**mark, "pending": pending, "after": oldest}
+
+
+def fetch_reddit_sentiment(subreddits=["wallstreetbets"], query="market crash", limit=100,
+                           store_dir=REDDIT_STORE_DIR, client=None, max_workers=None) -> pd.DataFrame:
+    """
+    Ingest new posts from several subreddits into the append-only post store.
+
+    Subreddits are searched concurrently, and one failing subreddit is
+    reported without affecting the others. The newest `created_utc` seen per
+    subreddit (and the ids posted at that second) is checkpointed, so later
+    runs only fetch posts published since; when `limit` stops a run short of
+    the checkpoint, the next runs first page back through the gap (see
+    _next_checkpoint). Posts are de-duplicated by `id` (a cross-post can
+    match several subreddits) and appended as one part file.
+
+    Parameters:
+        subreddits (list): Subreddits to search.
+        query (str): Search keyword.
+        limit (int): Maximum posts to request per subreddit.
+        store_dir (Path): PartStore directory.
+        client: praw.Reddit-compatible client (defaults to get_reddit_client()).
+        max_workers (int): Concurrent subreddit searches (default: one per subreddit).
+
+    Returns:
+        pd.DataFrame: The newly stored posts.
+    """
+    client = client or get_reddit_client()
+    store = PartStore(store_dir)
+    checkpoint = store.read_checkpoint()
+    key = lambda name: f"{name}|{query}"
+
+    def fetch(name):
+        state = checkpoint.get(key(name), {})
+        try:
+            return name, _fetch_new_posts(client, name, query, limit, state.get("created_utc", float("-inf")),
+                                          set(state.get("ids", [])), after=state.get("after"))
+        except Exception as e:
+            print(f" Failed to fetch r/{name}: {type(e).__name__}: {e}")
+            return name, None
+
+    print(f" Fetching r/{', r/'.join(subreddits)} for '{query}' (limit={limit})...")
+    with ThreadPoolExecutor(max_workers=max_workers or len(subreddits) or 1, thread_name_prefix="reddit") as pool:
+        results = {name: result for name, result in pool.map(fetch, subreddits) if result is not None}
+
+    records = [record for name in subreddits if name in results for record in results[name][0]]
+    df = pd.DataFrame(records)
+    if records:
+        df = df.drop_duplicates(subset="id", keep="first")
+        known = store.read(columns=["id"])["id"] if store.parts() else pd.Series(dtype="string")
+        df = df[~df["id"].isin(set(known))]
+        df["created_utc"] = pd.to_datetime(df["created_utc"], unit="s")
+        df = df.astype(POST_DTYPES).reset_index(drop=True)
+        store.append(df)
+
+    # Advance each subreddit's checkpoint only after its posts are on disk
+    for name, (posts, reached, oldest) in results.items():
+        state = checkpoint.get(key(name), {})
+        if posts or not reached or "after" in state:
+            checkpoint[key(name)] = _next_checkpoint(state, posts, reached, oldest)
+    store.write_checkpoint(checkpoint)
+
+    if not records:
+        print(" No new posts.")
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in POST_DTYPES.items()})
+    print(f" Stored {len(df)} new posts in {store.directory}")
+    return df
+
+
 # CLI test
 if __name__ == "__main__":
     df = scrape_reddit_posts(query="recession", limit=50)
@@ -1,54 +1,220 @@
 import os
+import json
+import time
+import threading
+from pathlib import Path
+from functools import lru_cache
 import requests
 import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 
+from config import CACHE_DIR
+from data_sources.http_utils import RateLimiter, build_session, get_with_retry
+
 # Load environment variables (e.g., custom headers)
 load_dotenv()
 EMAIL_CONTACT = os.getenv("SEC_EMAIL", "your_email@example.com")  # SEC requires a contact
 
-# SEC API base
-SEC_SEARCH_URL = "https://data.sec.gov/submissions/CIK{}.json"
+# SEC API base (override SEC_DATA_URL to point at a local stand-in server)
+SEC_DATA_URL = os.getenv("SEC_DATA_URL", "https://data.sec.gov").rstrip("/")
+SEC_SEARCH_URL = SEC_DATA_URL + "/submissions/CIK{}.json"
+# Older filings overflow into extra pages listed under filings.files
+SEC_SUBMISSIONS_PAGE_URL = SEC_DATA_URL + "/submissions/{}"
 SEC_HEADER = {
     "User-Agent": f"CrashSentinel/1.0 ({EMAIL_CONTACT})"
 }
 
 
-def get_cik_from_ticker(ticker: str) -> str:
+# SEC site roots (override to point at a local stand-in server)
+SEC_WWW_URL = os.getenv("SEC_WWW_URL", "https://www.sec.gov").rstrip("/")
+SEC_TICKERS_URL = f"{SEC_WWW_URL}/files/company_tickers.json"
+SEC_ARCHIVES_URL = f"{SEC_WWW_URL}/Archives/edgar/data"
+
+# SEC fair-access policy allows at most 10 requests per second; keep a margin for jitter
+SEC_RATE = 9.0
+
+# Ticker -> CIK index kept on disk and revalidated with a conditional GET once it is this old
+CIK_INDEX_PATH = CACHE_DIR / "sec" / "company_tickers.json"
+CIK_INDEX_MAX_AGE = 24 * 60 * 60
+# After a failed revalidation the local copy is served this long before trying again
+CIK_INDEX_RETRY = 5 * 60
+
+
+# Shared HTTP session and rate limiter for every request to SEC hosts. 429/5xx
+# replies are retried by _sec_get through the limiter, not inside the session
+@lru_cache(maxsize=1)
+def get_sec_session() -> requests.Session:
+    return build_session(pool_size=10, headers=SEC_HEADER, status_retries=False)
+
+
+# No burst allowance: requests are spaced evenly so no one-second window exceeds the limit
+SEC_LIMITER = RateLimiter(SEC_RATE, burst=1)
+
+
+# GET from an SEC host; every attempt, retries included, waits for the limiter
+def _sec_get(url: str, **kwargs) -> requests.Response:
+    return get_with_retry(get_sec_session(), SEC_LIMITER, url, **kwargs)
+
+# Bulk harvesting
+HARVEST_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+
+class CikIndex:
     """
-    Get Central Index Key (CIK) for a given stock ticker.
+    Ticker -> CIK and CIK -> company name lookups backed by company_tickers.json.
+
+    The file is downloaded once and stored on disk together with its ETag and
+    Last-Modified headers. Lookups hit in-memory dicts; the network is only
+    touched when the local copy is older than `max_age`, and then with a
+    conditional GET that costs no download if SEC's file has not changed.
+    If that request fails while a local copy exists, the copy keeps being
+    served and the request is retried after CIK_INDEX_RETRY seconds.
+
+    Parameters:
+        path (Path): On-disk index location.
+        url (str): company_tickers.json location.
+        max_age (float): Seconds before the local copy is revalidated.
     """
-    cik_url = f"https://www.sec.gov/files/company_tickers.json"
-    response = requests.get(cik_url, headers=SEC_HEADER)
 
-    if response.status_code != 200:
-        raise Exception(f"Failed to retrieve CIKs: {response.status_code}")
+    def __init__(self, path: Path = CIK_INDEX_PATH, url: str = SEC_TICKERS_URL, max_age: float = CIK_INDEX_MAX_AGE):
+        self.path = Path(path)
+        self.url = url
+        self.max_age = max_age
+        self.tickers = {}
+        self.names = {}
+        self.meta = {}
+        self.requests_made = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._load_disk()
+
+    def _load_disk(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            stored = json.load(f)
+        self.tickers, self.names, self.meta = stored["tickers"], stored["names"], stored["meta"]
+
+    def _save_disk(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"meta": self.meta, "tickers": self.tickers, "names": self.names}, f)
+        os.replace(tmp_path, self.path)
 
-    data = response.json()
-    for company in data.values():
-        if company["ticker"].lower() == ticker.lower():
-            return str(company["cik_str"]).zfill(10)
+    def is_fresh(self) -> bool:
+        checked = self.meta.get("checked_at")
+        return bool(self.tickers) and checked is not None and time.time() - checked < self.max_age
 
-    raise ValueError(f"CIK not found for ticker: {ticker}")
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Revalidate the index against SEC.
 
+        Returns:
+            bool: True if a new copy was downloaded, False if the local copy was kept.
+        """
+        with self._lock:
+            if not force and (self.is_fresh() or (self.tickers and time.time() < self._retry_at)):
+                return False
+            try:
+                return self._revalidate()
+            except Exception as e:
+                if not self.tickers:
+                    raise
+                print(f" CIK index revalidation failed ({e}), using the copy from {self.path}")
+                self._retry_at = time.time() + CIK_INDEX_RETRY
+                return False
 
-def get_recent_filings(cik: str, filing_types=["10-K", "10-Q"], limit=10) -> pd.DataFrame:
+    def _revalidate(self) -> bool:
+        # Conditional GET; the caller holds the lock
+        headers = {}
+        if self.tickers and self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.tickers and self.meta.get("last_modified"):
+            headers["If-Modified-Since"] = self.meta["last_modified"]
+
+        response = _sec_get(self.url, headers=headers, timeout=30)
+        self.requests_made += 1
+
+        if response.status_code == 304:
+            self.meta["checked_at"] = time.time()
+            self._save_disk()
+            return False
+        if response.status_code != 200:
+            raise Exception(f"Failed to retrieve CIKs: {response.status_code}")
+
+        tickers, names = {}, {}
+        for company in response.json().values():
+            cik = str(company["cik_str"]).zfill(10)
+            # Keep the first listing when a ticker appears twice, as the linear scan did
+            tickers.setdefault(company["ticker"].upper(), cik)
+            names.setdefault(cik, company["title"])
+        self.tickers, self.names = tickers, names
+        self.meta = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        }
+        self._save_disk()
+        return True
+
+    def cik(self, ticker: str):
+        """
+        CIK (10-digit string) for a ticker, or None if SEC does not list it.
+        """
+        self.refresh()
+        return self.tickers.get(ticker.upper())
+
+    def name(self, cik) -> str:
+        self.refresh()
+        return self.names.get(str(cik).zfill(10))
+
+    def resolve(self, tickers: list) -> dict:
+        self.refresh()
+        return {ticker: self.tickers.get(ticker.upper()) for ticker in tickers}
+
+
+# Process-wide index, loaded from disk on first use
+@lru_cache(maxsize=1)
+def get_cik_index() -> CikIndex:
+    return CikIndex()
+
+
+def get_cik_from_ticker(ticker: str) -> str:
     """
-    Fetch recent SEC filings (10-K, 10-Q, etc.) for a given CIK.
+    Get Central Index Key (CIK) for a given stock ticker.
     """
-    print(f" Fetching recent filings for CIK: {cik}")
-    url = SEC_SEARCH_URL.format(cik)
-    response = requests.get(url, headers=SEC_HEADER)
+    cik = get_cik_index().cik(ticker)
+    if cik is None:
+        raise ValueError(f"CIK not found for ticker: {ticker}")
+    return cik
+
+
+def resolve_ciks(tickers: list) -> dict:
+    """
+    Map many tickers to CIKs with at most one (conditional) request to SEC.
+
+    Returns:
+        dict: {ticker: 10-digit CIK, or None when the ticker is unknown}
+    """
+    return get_cik_index().resolve(tickers)
+
+
+# GET a submissions JSON document through the shared session and limiter
+def _get_submissions(url: str) -> dict:
+    response = _sec_get(url, timeout=30)
 
     if response.status_code != 200:
         raise Exception(f"Failed to fetch filings: {response.status_code}")
+    return response.json()
 
-    data = response.json()
-    filings = data.get("filings", {}).get("recent", {})
 
+# Matching filings from one columnar block of a submissions feed
+def _filing_records(filings: dict, cik: str, filing_types: list) -> list:
     records = []
-    for i in range(len(filings["accessionNumber"])):
+    for i in range(len(filings.get("accessionNumber", []))):
         if filings["form"][i] not in filing_types:
             continue
 
@@ -56,15 +222,169 @@ def get_recent_filings(cik: str, filing_types=["10-K", "10-Q"], limit=10) -> pd.
             "form": filings["form"][i],
             "date_filed": filings["filingDate"][i],
             "accession_number": filings["accessionNumber"][i],
-            "report_url": f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{filings['accessionNumber'][i].replace('-', '')}/{filings['primaryDocument'][i]}"
+            "primary_document": filings["primaryDocument"][i],
+            "report_url": f"{SEC_ARCHIVES_URL}/{int(cik)}/{filings['accessionNumber'][i].replace('-', '')}/{filings['primaryDocument'][i]}"
         })
+    return records
+
+
+def get_recent_filings(cik: str, filing_types=["10-K", "10-Q"], limit=10, full_history: bool = False) -> pd.DataFrame:
+    """
+    Fetch recent SEC filings (10-K, 10-Q, etc.) for a given CIK.
+    Pass limit=None to return every matching filing in the submissions feed.
+
+    The feed itself only carries a company's latest ~1,000 filings; with
+    full_history=True the older pages listed under `filings.files` are
+    fetched too (one request each, newest first) until `limit` is met.
+    """
+    print(f" Fetching recent filings for CIK: {cik}")
+    data = _get_submissions(SEC_SEARCH_URL.format(str(cik).zfill(10)))
+    filings = data.get("filings", {})
 
-        if len(records) >= limit:
-            break
+    records = _filing_records(filings.get("recent", {}), cik, filing_types)
+    if full_history:
+        for page in filings.get("files", []):
+            if limit is not None and len(records) >= limit:
+                break
+            older = _get_submissions(SEC_SUBMISSIONS_PAGE_URL.format(page["name"]))
+            records += _filing_records(older, cik, filing_types)
 
+    if limit is not None:
+        records = records[:limit]
     return pd.DataFrame(records)
 
 
+def download_file(url: str, path: Path, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> str:
+    """
+    Stream a document to disk, resuming a previous partial download.
+
+    Bytes go to `<path>.part` first and the file is renamed only once complete,
+    so an existing `path` always means a finished download.
+
+    Returns:
+        str: 'exists', 'downloaded' or 'resumed'
+    """
+    path = Path(path)
+    if path.exists():
+        return "exists"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(path.name + ".part")
+
+    offset = part.stat().st_size if part.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with _sec_get(url, headers=headers, stream=True, timeout=60) as response:
+        if response.status_code == 416:
+            # The partial file already holds every byte
+            os.replace(part, path)
+            return "resumed"
+        if response.status_code not in (200, 206):
+            raise Exception(f"Failed to download {url}: {response.status_code}")
+        # A 200 means the server ignored the Range header, so start over
+        resumed = response.status_code == 206
+        with open(part, "ab" if resumed else "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+    os.replace(part, path)
+    return "resumed" if resumed else "downloaded"
+
+
+# Accession numbers that already have a finished document under a company's directory
+def _downloaded_accessions(company_dir: Path) -> set:
+    if not company_dir.exists():
+        return set()
+    return {p.name.split("_", 1)[0] for p in company_dir.iterdir() if not p.name.endswith(".part")}
+
+
+def harvest_filings(companies: list, filing_types=["10-K", "10-Q"], output_dir="data/sec_filings",
+                    limit=None, max_workers: int = HARVEST_WORKERS) -> pd.DataFrame:
+    """
+    Download the primary documents of many companies' filings.
+
+    Submissions feeds (including their older pages) and documents are fetched
+    concurrently by a thread pool, with every request going through the
+    shared 10 req/s limiter. Tickers sharing a CIK (share classes such as
+    GOOG/GOOGL) are listed and downloaded once. Documents
+    are stored as `<output_dir>/<CIK>/<accession>_<document>`; accession
+    numbers already on disk are skipped and `.part` files are resumed, so an
+    interrupted run can simply be restarted.
+
+    Args:
+        companies (list): Tickers or numeric CIKs.
+        filing_types (list): Forms to keep, e.g. ['10-K', '10-Q'].
+        output_dir (str | Path): Root directory for the documents.
+        limit (int): Filings per company (None for all in the feed).
+        max_workers (int): Concurrent requests (the limiter still caps the rate).
+
+    Returns:
+        pd.DataFrame: One row per filing with its local path and status
+        ('exists', 'downloaded', 'resumed', 'skipped' or 'failed: ...').
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    output_dir = Path(output_dir)
+    tickers = [c for c in companies if not str(c).isdigit()]
+    ciks = resolve_ciks(tickers) if tickers else {}
+    ciks.update({c: str(c).zfill(10) for c in companies if str(c).isdigit()})
+
+    records, companies_by_cik = [], {}
+    for company, cik in ciks.items():
+        if cik is None:
+            print(f" No CIK for {company}, skipping")
+            records.append({"company": company, "cik": None, "status": "failed: unknown ticker"})
+        else:
+            companies_by_cik.setdefault(cik, []).append(str(company))
+
+    def list_filings(company, cik):
+        filings = get_recent_filings(cik, filing_types=filing_types, limit=limit, full_history=True)
+        filings.insert(0, "cik", cik)
+        filings.insert(0, "company", company)
+        return filings
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sec") as pool:
+        # One listing per CIK, so two share classes never write the same file at once
+        futures = {pool.submit(list_filings, ", ".join(names), cik): cik for cik, names in companies_by_cik.items()}
+        listings = []
+        for future in as_completed(futures):
+            try:
+                listings.append(future.result())
+            except Exception as e:
+                cik = futures[future]
+                records.append({"company": ", ".join(companies_by_cik[cik]), "cik": cik, "status": f"failed: {e}"})
+
+        jobs = {}
+        for filings in listings:
+            if filings.empty:
+                continue
+            cik = filings["cik"].iloc[0]
+            on_disk = _downloaded_accessions(output_dir / cik)
+            for row in filings.to_dict("records"):
+                row["path"] = str(output_dir / cik / f"{row['accession_number']}_{row['primary_document']}")
+                if row["accession_number"] in on_disk:
+                    records.append({**row, "status": "skipped"})
+                    continue
+                jobs[pool.submit(download_file, row["report_url"], row["path"])] = row
+
+        for future in as_completed(jobs):
+            row = jobs[future]
+            try:
+                records.append({**row, "status": future.result()})
+            except Exception as e:
+                records.append({**row, "status": f"failed: {e}"})
+
+    report = pd.DataFrame(records)
+    if not report.empty:
+        counts = report["status"].str.split(":").str[0].value_counts().to_dict()
+        print(f" SEC harvest: {counts}")
+    return report
+
+
+def download_sec_filings(ticker: str, form: str = "10-K", output_dir="data/sec_filings", limit=None) -> pd.DataFrame:
+    """
+    Download every `form` filing in a company's submissions feed (see harvest_filings).
+    """
+    return harvest_filings([ticker], filing_types=[form], output_dir=output_dir, limit=limit)
+
+
 # CLI test
 if __name__ == "__main__":
     ticker = "AAPL"
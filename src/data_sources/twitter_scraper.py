@@ -1,8 +1,10 @@
 import os
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime
-import snscrape.modules.twitter as sntwitter
+
+from data_sources.columnar_store import PartStore
 
 # Load environment variables
 load_dotenv()
@@ -10,8 +12,115 @@ load_dotenv()
 # Optional: Customize default keywords
 DEFAULT_QUERY = "stock market crash OR recession OR inflation"
 DEFAULT_LIMIT = 100
+DEFAULT_BATCH_SIZE = 1000
+
+# Compact column types for streamed tweets
+TWEET_DTYPES = {
+    "id": np.int64,
+    "date": "datetime64[s, UTC]",
+    "username": "string",
+    "display_name": "string",
+    "content": "string",
+    "retweets": np.int32,
+    "likes": np.int32,
+    "replies": np.int32,
+    "url": "string",
+}
+
+
+# Default scraper: snscrape's search, newest tweets first
+def _search_items(query: str):
+    import snscrape.modules.twitter as sntwitter
+    return sntwitter.TwitterSearchScraper(query).get_items()
+
+
+def _to_frame(records: list) -> pd.DataFrame:
+    if not records:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in TWEET_DTYPES.items()})
+    return pd.DataFrame(records, columns=list(TWEET_DTYPES)).astype(TWEET_DTYPES)
+
+
+def stream_tweets(query=DEFAULT_QUERY, limit=DEFAULT_LIMIT, lang="en", since="2023-01-01",
+                  batch_size=DEFAULT_BATCH_SIZE, store_dir=None, search=_search_items):
+    """
+    Yield tweets as DataFrames of at most `batch_size` rows.
+
+    Only one batch is held in memory at a time, so memory stays flat whatever
+    the limit. With `store_dir`, each batch is appended to a PartStore and a
+    cursor (oldest id stored so far) is checkpointed after it. A pull that
+    stopped early then resumes below that id. Once a pull completes, the next
+    one only collects tweets newer than it, and it stays open until it has
+    paged back down to the previous pull: when `limit` cuts a call short,
+    later calls continue below the oldest stored id (up to `limit` tweets
+    each) so no tweet between two pulls is skipped. The very first pull has
+    nothing to reach and is simply capped at `limit` in total.
+
+    Parameters:
+        query, limit, lang, since: As for scrape_tweets.
+        batch_size (int): Rows per yielded/stored batch.
+        store_dir (Path): PartStore directory; None disables persistence.
+        search (callable): query string -> iterable of tweets, newest first
+            (snscrape by default).
 
-def scrape_tweets(query=DEFAULT_QUERY, limit=DEFAULT_LIMIT, lang="en", since="2023-01-01") -> pd.DataFrame:
+    Yields:
+        pd.DataFrame: One batch of tweets with compact dtypes.
+    """
+    store = PartStore(store_dir) if store_dir is not None else None
+    checkpoint = store.read_checkpoint() if store else {}
+    key = f"{query}|{lang}|{since}"
+    cursor = checkpoint.get(key, {})
+
+    full_query = f"{query} lang:{lang} since:{since}"
+    if cursor and not cursor.get("done"):
+        # Resume the interrupted pull just below the oldest stored tweet
+        remaining = limit - cursor["count"] if cursor["floor_id"] is None else limit
+        full_query += f" max_id:{cursor['oldest_id'] - 1}"
+        print(f" Resuming Twitter pull for: '{query}' ({cursor['count']} stored, up to {remaining} more)")
+    else:
+        # New pull, stopping where the previous completed pull began
+        floor = max(cursor.get("newest_id") or 0, cursor.get("floor_id") or 0) or None
+        cursor = {"floor_id": floor, "newest_id": None, "oldest_id": None, "count": 0, "done": False}
+        remaining = limit
+        print(f" Scraping Twitter for: '{query}' (limit={limit}, lang={lang})")
+
+    def flush(batch):
+        df = _to_frame(batch)
+        if store:
+            store.append(df)
+            cursor["newest_id"] = cursor["newest_id"] or int(df["id"].iloc[0])
+            cursor["oldest_id"] = int(df["id"].iloc[-1])
+            cursor["count"] += len(df)
+            checkpoint[key] = cursor
+            store.write_checkpoint(checkpoint)
+        return df
+
+    # Whether the pull got back down to floor_id (or ran out of tweets)
+    reached = True
+    batch = []
+    if remaining > 0:
+        for tweet in search(full_query):
+            if cursor["floor_id"] is not None and tweet.id <= cursor["floor_id"]:
+                break
+            batch.append((tweet.id, tweet.date, tweet.user.username, tweet.user.displayname, tweet.content,
+                          tweet.retweetCount, tweet.likeCount, tweet.replyCount, tweet.url))
+            remaining -= 1
+            if len(batch) >= batch_size:
+                yield flush(batch)
+                batch = []
+            if remaining <= 0:
+                reached = cursor["floor_id"] is None
+                break
+    if batch:
+        yield flush(batch)
+
+    if store and reached:
+        cursor["done"] = True
+        checkpoint[key] = cursor
+        store.write_checkpoint(checkpoint)
+
+
+def scrape_tweets(query=DEFAULT_QUERY, limit=DEFAULT_LIMIT, lang="en", since="2023-01-01",
+                  store_dir=None, batch_size=DEFAULT_BATCH_SIZE) -> pd.DataFrame:
     """
     Scrape recent tweets matching the query using snscrape.
     
@@ -20,31 +129,14 @@ def scrape_tweets(query=DEFAULT_QUERY, limit=DEFAULT_LIMIT, lang="en", since="20
         limit (int): Max number of tweets to retrieve.
         lang (str): Language filter (e.g., "en" for English).
         since (str): ISO start date for tweets.
+        store_dir (Path): Also persist batches here (see stream_tweets).
+        batch_size (int): Rows per batch.
     
     Returns:
         pd.DataFrame: DataFrame containing tweets with metadata.
     """
-    print(f" Scraping Twitter for: '{query}' (limit={limit}, lang={lang})")
-    
-    full_query = f"{query} lang:{lang} since:{since}"
-    tweets = []
-    
-    for i, tweet in enumerate(sntwitter.TwitterSearchScraper(full_query).get_items()):
-        if i >= limit:
-            break
-        tweets.append({
-            "date": tweet.date,
-            "username": tweet.user.username,
-            "display_name": tweet.user.displayname,
-            "content": tweet.content,
-            "retweets": tweet.retweetCount,
-            "likes": tweet.likeCount,
-            "replies": tweet.replyCount,
-            "url": tweet.url
-        })
-    
-    df = pd.DataFrame(tweets)
-    return df
+    batches = list(stream_tweets(query, limit, lang, since, batch_size=batch_size, store_dir=store_dir))
+    return pd.concat(batches, ignore_index=True) if batches else _to_frame([])
 
 # CLI Test
 if __name__ == "__main__":
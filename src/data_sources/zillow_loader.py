@@ -1,63 +1,108 @@
 import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import requests
 import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 
+from config import CACHE_DIR
+from data_sources.http_utils import RateLimiter, build_session
+
 #  Load .env file for secure API key handling
 load_dotenv()
 
-#  Get Zillow API Key from environment variable
-ZWSID = os.getenv("ZILLOW_API_KEY")
-if not ZWSID:
-    raise EnvironmentError(" ZILLOW_API_KEY not found. Please set it in a .env file or as an environment variable.")
+#  Base URL for RapidAPI Zillow endpoint (override ZILLOW_API_URL, e.g. for a local stub server)
+ZILLOW_BASE_URL = os.getenv("ZILLOW_API_URL", "https://zillow-com1.p.rapidapi.com/propertyExtendedSearch")
+
+#  Requests per second allowed by the RapidAPI plan, shared by all workers
+ZILLOW_RATE = float(os.getenv("ZILLOW_RATE", "2"))
+ZILLOW_LIMITER = RateLimiter(ZILLOW_RATE, burst=1)
+ZILLOW_WORKERS = 8
 
-#  Base URL for RapidAPI Zillow endpoint
-ZILLOW_BASE_URL = "https://zillow-com1.p.rapidapi.com/propertyExtendedSearch"
+#  Responses are reused for this long before the API is asked again
+ZILLOW_CACHE_TTL = 12 * 60 * 60
+ZILLOW_CACHE_DIR = CACHE_DIR / "zillow"
 
-#  Request headers using the RapidAPI key
-HEADERS = {
-    "X-RapidAPI-Key": ZWSID,
-    "X-RapidAPI-Host": "zillow-com1.p.rapidapi.com"
+#  Compact column types for listings
+LISTING_DTYPES = {
+    "zipcode": "category",
+    "address": "string",
+    "price": np.float32,
+    "bedrooms": np.float32,
+    "bathrooms": np.float32,
+    "area_sqft": np.float32,
+    "listing_date": "datetime64[s]",
+    "zpid": "Int64",
+    "latitude": np.float32,
+    "longitude": np.float32,
 }
 
-def fetch_zillow_listings(zipcode="10001", property_type="houses", limit=20) -> pd.DataFrame:
+
+def get_headers() -> dict:
     """
-    Fetch property listings from Zillow via RapidAPI based on zip code and type.
-    Returns a DataFrame with selected property details.
+    Build RapidAPI request headers, reading the API key at call time.
     """
-    print(f" Fetching Zillow listings for ZIP: {zipcode}, Type: {property_type}")
-
-    params = {
-        "location": zipcode,
-        "home_type": property_type,
-        "sort": "newest",
-        "status_type": "for_sale",
-        "limit": limit
+    zwsid = os.getenv("ZILLOW_API_KEY")
+    if not zwsid:
+        raise EnvironmentError(" ZILLOW_API_KEY not found. Please set it in a .env file or as an environment variable.")
+    return {
+        "X-RapidAPI-Key": zwsid,
+        "X-RapidAPI-Host": "zillow-com1.p.rapidapi.com"
     }
 
+@lru_cache(maxsize=1)
+def get_zillow_session() -> requests.Session:
+    return build_session(pool_size=ZILLOW_WORKERS)
+
+
+def _cache_file(params: dict, cache_dir: Path) -> Path:
+    key = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    return Path(cache_dir) / f"{key}.json"
+
+
+def fetch_zillow_page(params: dict, ttl: float = ZILLOW_CACHE_TTL, cache_dir: Path = ZILLOW_CACHE_DIR) -> dict:
+    """
+    One propertyExtendedSearch response, served from the on-disk cache when a
+    response for the same params is younger than `ttl` seconds.
+    """
+    path = _cache_file(params, cache_dir)
+    if ttl and path.exists() and time.time() - path.stat().st_mtime < ttl:
+        with open(path) as f:
+            return json.load(f)
+
+    ZILLOW_LIMITER.acquire()
     try:
-        response = requests.get(ZILLOW_BASE_URL, headers=HEADERS, params=params)
+        response = get_zillow_session().get(ZILLOW_BASE_URL, headers=get_headers(), params=params, timeout=30)
         response.raise_for_status()
     except requests.RequestException as e:
         raise RuntimeError(f" Failed to fetch Zillow data: {e}")
-
     data = response.json()
-    properties = data.get("props", [])
 
-    if not properties:
-        print(" No properties found.")
-        return pd.DataFrame()
+    if ttl:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    return data
+
 
-    #  Parse and structure response into a DataFrame
-    listings = [
+def _parse_listings(properties: list, zipcode: str) -> list:
+    return [
         {
+            "zipcode": zipcode,
             "address": p.get("address"),
             "price": p.get("price"),
             "bedrooms": p.get("bedrooms"),
             "bathrooms": p.get("bathrooms"),
             "area_sqft": p.get("livingArea"),
-            "listing_date": datetime.utcfromtimestamp(p.get("listingDate") / 1000).date() if p.get("listingDate") else None,
+            "listing_date": datetime.utcfromtimestamp(p.get("listingDate") / 1000) if p.get("listingDate") else None,
             "zpid": p.get("zpid"),
             "latitude": p.get("latitude"),
             "longitude": p.get("longitude")
@@ -65,7 +110,90 @@ def fetch_zillow_listings(zipcode="10001", property_type="houses", limit=20) ->
         for p in properties
     ]
 
-    return pd.DataFrame(listings)
+
+def _to_frame(records: list) -> pd.DataFrame:
+    df = pd.DataFrame(records, columns=list(LISTING_DTYPES))
+    for col in ["price", "bedrooms", "bathrooms", "area_sqft", "zpid", "latitude", "longitude"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df["listing_date"] = pd.to_datetime(df["listing_date"])
+    df = df.astype(LISTING_DTYPES)
+    # One row per property, even when it shows up on two pages or for two zip codes
+    return df[~(df["zpid"].duplicated() & df["zpid"].notna())].reset_index(drop=True)
+
+
+def _fetch_zip(zipcode: str, property_type: str, limit: int, ttl: float, cache_dir: Path) -> list:
+    """
+    Follow pages for one zip code until `limit` distinct listings or the last page.
+
+    With sort=newest, new listings push older ones onto later pages between
+    requests (and pages are cached separately), so a property can show up on
+    two pages; repeats are dropped here so they do not use up the limit.
+    """
+    records, seen, page = [], set(), 1
+    while len(records) < limit:
+        params = {
+            "location": zipcode,
+            "home_type": property_type,
+            "sort": "newest",
+            "status_type": "for_sale",
+            "page": page,
+        }
+        data = fetch_zillow_page(params, ttl=ttl, cache_dir=cache_dir)
+        properties = data.get("props", [])
+        for record in _parse_listings(properties, zipcode):
+            zpid = record["zpid"]
+            if zpid is not None and zpid in seen:
+                continue
+            seen.add(zpid)
+            records.append(record)
+        if not properties or page >= int(data.get("totalPages") or 1):
+            break
+        page += 1
+    return records[:limit]
+
+
+def fetch_zillow_listings(zipcode="10001", property_type="houses", limit=20,
+                          ttl: float = ZILLOW_CACHE_TTL, cache_dir: Path = ZILLOW_CACHE_DIR) -> pd.DataFrame:
+    """
+    Fetch property listings from Zillow via RapidAPI based on zip code and type.
+    Follows result pages until `limit` listings (or the last page) are collected.
+    Returns a DataFrame with selected property details.
+    """
+    print(f" Fetching Zillow listings for ZIP: {zipcode}, Type: {property_type}")
+    records = _fetch_zip(zipcode, property_type, limit, ttl, cache_dir)
+    if not records:
+        print(" No properties found.")
+    return _to_frame(records)
+
+
+def fetch_zillow_bulk(zipcodes: list, property_type="houses", limit_per_zip=100, max_workers: int = ZILLOW_WORKERS,
+                      ttl: float = ZILLOW_CACHE_TTL, cache_dir: Path = ZILLOW_CACHE_DIR) -> pd.DataFrame:
+    """
+    Fetch listings for many zip codes concurrently.
+
+    Zip codes are fetched in parallel (each paginating on its own) while the
+    shared limiter keeps the whole batch under ZILLOW_RATE requests/second.
+    Responses are cached per query for `ttl` seconds and listings are
+    de-duplicated by zpid.
+
+    Returns:
+        pd.DataFrame: Listings with compact dtypes and a 'zipcode' column.
+    """
+    print(f" Fetching Zillow listings for {len(zipcodes)} ZIP codes, Type: {property_type}")
+    failed = {}
+
+    def fetch(zipcode):
+        try:
+            return _fetch_zip(str(zipcode), property_type, limit_per_zip, ttl, cache_dir)
+        except Exception as e:
+            failed[zipcode] = str(e)
+            return []
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zillow") as pool:
+        batches = list(pool.map(fetch, zipcodes))
+    for zipcode, error in failed.items():
+        print(f" ZIP {zipcode} failed: {error}")
+    return _to_frame([record for batch in batches for record in batch])
 
 
 #  CLI Test Execution
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+# Shape-preserving downsampling for drawing long series. A chart is only ~1k
+# pixels wide, so beyond a few thousand points (intraday bars, long
+# histories) extra points only add payload to vector and interactive charts
+# without changing what the reader sees.
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection.
+
+    The first and last points are kept. The rest are split into n_out - 2
+    buckets, and from each bucket the point forming the largest triangle with
+    the previously kept point and the next bucket's mean is kept. Peaks and
+    troughs survive, unlike with every-nth-point sampling.
+
+    Args:
+        x (np.ndarray): Increasing x values (e.g. int64 timestamps).
+        y (np.ndarray): Values, no NaNs.
+        n_out (int): Number of points to keep (>= 3).
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Relative x keeps nanosecond timestamps well inside float64 precision
+    x = np.asarray(x, dtype=np.float64) - float(x[0])
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the interior points 1 .. n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Means of each bucket, computed at once from cumulative sums
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    starts, stops = edges[:-1], edges[1:]
+    mean_x = (cx[stops] - cx[starts]) / (stops - starts)
+    mean_y = (cy[stops] - cy[starts]) / (stops - starts)
+    # The bucket after the last one is the final point
+    mean_x = np.append(mean_x, x[-1])
+    mean_y = np.append(mean_y, y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = starts[i], stops[i]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample(data, n_out: int, column: str = None, keep=None):
+    """
+    Reduce a Series/DataFrame to about `n_out` rows for plotting.
+
+    Rows are chosen by LTTB on `column` (or the Series values). Rows flagged
+    in `keep`, such as anomalies, are always kept on top of that, so the
+    result can exceed n_out by the number of flagged rows.
+
+    Args:
+        data (pd.Series | pd.DataFrame): Series indexed by date (or number).
+        n_out (int): Target number of points; None or <= 0 disables.
+        column (str): Column driving the selection for DataFrames.
+        keep (array-like of bool): Rows that must be kept.
+
+    Returns:
+        Same type as `data`, in the original order.
+    """
+    if not n_out or n_out <= 0 or len(data) <= n_out:
+        return data
+
+    values = data[column] if isinstance(data, pd.DataFrame) else data
+    y = values.to_numpy(dtype=np.float64)
+    index = data.index
+    x = index.as_unit("ns").asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(data))
+
+    finite = np.flatnonzero(~np.isnan(y))
+    chosen = finite[lttb_indices(x[finite], y[finite], n_out)] if len(finite) else finite
+    mask = np.zeros(len(data), dtype=bool)
+    mask[chosen] = True
+    if keep is not None:
+        mask |= np.asarray(keep, dtype=bool)
+    return data[mask]
+
+
+def downsample_window(data, n_out: int, start=None, end=None, column: str = None, keep=None):
+    """
+    Slice to the visible [start, end] range, then downsample() it.
+
+    The point budget is spent on the visible range only, so narrowing the
+    window (zooming in) brings back raw detail until every point is shown.
+
+    Args:
+        data (pd.Series | pd.DataFrame): Sorted, date-indexed series.
+        n_out (int): Target number of points for the window.
+        start, end: Visible range (None = open-ended).
+        column (str): Column driving the selection for DataFrames.
+        keep (array-like of bool): Rows that must be kept, aligned with `data`.
+
+    Returns:
+        Same type as `data`.
+    """
+    window = data.index.slice_indexer(start, end)
+    if keep is not None:
+        keep = np.asarray(keep, dtype=bool)[window]
+    return downsample(data.iloc[window], n_out, column=column, keep=keep)
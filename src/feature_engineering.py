@@ -1,3 +1,4 @@
+import warnings
 import pandas as pd
 import numpy as np
 
@@ -44,4 +45,122 @@ def rolling_correlation(series1: pd.Series, series2: pd.Series, window: int = 30
     """
     Measures relationship between two time-series over time.
     """
-    return series1.rolling(window).corr(series2)
\ No newline at end of file
+    return series1.rolling(window).corr(series2)
+
+# --- Panel (wide) feature computation ---
+# The panel_* functions take a 2-D array or wide DataFrame (one column per
+# series) and compute a feature for every column in one vectorized pass.
+# Windows follow pandas' rolling defaults: min_periods == window, sample std
+# (ddof=1), and any NaN inside a window gives NaN, so results match the
+# per-series functions above.
+
+PANEL_CHUNK_ROWS = 8192
+
+# Rolling mean (and optionally variance) for every column using chunked cumulative sums
+def _panel_rolling_moments(values: np.ndarray, window: int, need_var: bool = True,
+                           chunk_rows: int = PANEL_CHUNK_ROWS):
+    """
+    Each chunk is re-centered on its own column means before the cumulative
+    sums are taken, which bounds the cancellation error of the sum-of-squares
+    formula even for very long or trending series.
+    """
+    # Column-major layout keeps every per-column cumulative sum contiguous
+    values = np.asfortranarray(values)
+    n_rows, n_cols = values.shape
+    mean = np.full((n_rows, n_cols), np.nan, order="F")
+    var = np.full((n_rows, n_cols), np.nan, order="F") if need_var else None
+    if n_rows < window:
+        return mean, var
+
+    for start in range(window - 1, n_rows, chunk_rows):
+        stop = min(n_rows, start + chunk_rows)
+        block = values[start - window + 1:stop]
+        missing = np.isnan(block)
+        has_missing = missing.any()
+
+        if has_missing:
+            with np.errstate(invalid="ignore"), warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                anchor = np.nan_to_num(np.nanmean(block, axis=0))
+            centered = block - anchor
+            centered[missing] = 0.0
+        else:
+            anchor = block.mean(axis=0)
+            centered = block - anchor
+
+        # Window sums are differences of cumulative sums: S[i] - S[i - window]
+        squares = centered * centered if need_var else None
+        np.cumsum(centered, axis=0, out=centered)
+        w_sum = centered[window - 1:].copy()
+        w_sum[1:] -= centered[:-window]
+
+        out_mean = mean[start:stop]
+        np.divide(w_sum, window, out=out_mean)
+        out_mean += anchor
+
+        if need_var:
+            np.cumsum(squares, axis=0, out=squares)
+            w_sq = squares[window - 1:].copy()
+            w_sq[1:] -= squares[:-window]
+            # Sum of squared deviations from the window mean, clipped at 0 for rounding
+            w_sum *= w_sum
+            w_sum /= window
+            w_sq -= w_sum
+            np.maximum(w_sq, 0.0, out=w_sq)
+            if window > 1:
+                np.divide(w_sq, window - 1, out=var[start:stop])
+
+        if has_missing:
+            counts = np.cumsum(missing, axis=0, dtype=np.int32)
+            in_window = counts[window - 1:].copy()
+            in_window[1:] -= counts[:-window]
+            has_nan = in_window > 0
+            out_mean[has_nan] = np.nan
+            if need_var:
+                var[start:stop][has_nan] = np.nan
+
+    return mean, var
+
+# Convert panel input to a float64 2-D array, remembering how to wrap the result
+def _as_panel(panel):
+    if isinstance(panel, pd.DataFrame):
+        return panel.to_numpy(dtype=np.float64), lambda out: pd.DataFrame(out, index=panel.index, columns=panel.columns)
+    if isinstance(panel, pd.Series):
+        return panel.to_numpy(dtype=np.float64)[:, None], lambda out: pd.Series(out[:, 0], index=panel.index, name=panel.name)
+    values = np.asarray(panel, dtype=np.float64)
+    if values.ndim == 1:
+        return values[:, None], lambda out: out[:, 0]
+    return values, lambda out: out
+
+# Panel Moving Average
+def panel_moving_average(prices, window: int = 20, dtype=np.float64):
+    """
+    moving_average for every column of a wide DataFrame or 2-D array.
+    Pass dtype=np.float32 to halve the memory of the result.
+    """
+    values, wrap = _as_panel(prices)
+    mean, _ = _panel_rolling_moments(values, window, need_var=False)
+    return wrap(mean.astype(dtype, copy=False))
+
+# Panel Volatility Index
+def panel_volatility_index(prices, window: int = 30, dtype=np.float64):
+    """
+    volatility_index for every column of a wide DataFrame or 2-D array.
+    """
+    values, wrap = _as_panel(prices)
+    returns = np.full_like(values, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = values[1:] / values[:-1] - 1
+    _, var = _panel_rolling_moments(returns, window)
+    return wrap((np.sqrt(var) * np.sqrt(window)).astype(dtype, copy=False))
+
+# Panel Z-score
+def panel_z_score(series, window: int = 30, dtype=np.float64):
+    """
+    z_score for every column of a wide DataFrame or 2-D array.
+    """
+    values, wrap = _as_panel(series)
+    mean, var = _panel_rolling_moments(values, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (values - mean) / np.sqrt(var)
+    return wrap(z.astype(dtype, copy=False))
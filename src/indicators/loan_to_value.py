@@ -1,19 +1,11 @@
 import os
 import pandas as pd
-from fredapi import Fred
+from data_sources.fred_engine import get_fred_engine
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Get FRED API Key
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-if not FRED_API_KEY:
-    raise ValueError("FRED_API_KEY not found. Please set it in a .env file.")
-
-# Initialize FRED
-fred = Fred(api_key=FRED_API_KEY)
-
 # FRED Series IDs
 # Mortgage Debt Outstanding for Households and Nonprofit Organizations
 MORTGAGE_DEBT_SERIES = "HHMSDODNS"  # or "MDOTHNWMVBSN"
@@ -25,18 +17,12 @@ def fetch_loan_to_value_ratio(start_date="2000-01-01", end_date=None) -> pd.Data
     Fetches mortgage debt and home price series from FRED and computes Loan-to-Value Ratio.
     LTV = Mortgage Debt / Median Home Price
     """
-    print(" Fetching Mortgage Debt Outstanding...")
-    debt_series = fred.get_series(MORTGAGE_DEBT_SERIES, observation_start=start_date, observation_end=end_date)
-    debt_df = debt_series.to_frame(name="Mortgage Debt")
-    debt_df.index.name = "Date"
-
-    print(" Fetching Median Home Prices...")
-    price_series = fred.get_series(HOME_PRICE_SERIES, observation_start=start_date, observation_end=end_date)
-    price_df = price_series.to_frame(name="Median Home Price")
-    price_df.index.name = "Date"
-
-    # Merge on index (Date)
-    df = pd.merge(debt_df, price_df, left_index=True, right_index=True, how="outer").sort_index()
+    print(" Fetching Mortgage Debt Outstanding and Median Home Prices...")
+    # Both series are fetched concurrently and outer-joined on Date
+    df = get_fred_engine().fetch(
+        {MORTGAGE_DEBT_SERIES: "Mortgage Debt", HOME_PRICE_SERIES: "Median Home Price"},
+        start_date, end_date
+    )
 
     # Compute Loan-to-Value Ratio
     df["Loan-to-Value Ratio"] = df["Mortgage Debt"] / df["Median Home Price"]
@@ -1,19 +1,180 @@
+import os
+import json
+from pathlib import Path
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+
+NORMALIZERS = ("global", "expanding", "rolling")
 
 def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize each column in the DataFrame to a 0–100 scale using Min-Max scaling.
     """
+    from sklearn.preprocessing import MinMaxScaler
+
     scaler = MinMaxScaler(feature_range=(0, 100))
     scaled = scaler.fit_transform(df.ffill().bfill())
     return pd.DataFrame(scaled, index=df.index, columns=df.columns)
 
 
-def compute_weighted_risk_index(df: pd.DataFrame, weights: dict = None) -> pd.Series:
+class IncrementalMinMaxNormalizer:
+    """
+    Point-in-time Min-Max scaling to 0–100 with running state.
+
+    Each row is scaled with the min/max of the history up to and including
+    that row (expanding mode) or of the last `window` rows (rolling mode), and
+    gaps are only forward-filled, so a score never depends on later data and
+    never changes once emitted. update() only processes rows after the last
+    one seen, in O(new rows), and the state can be saved to resume later.
+
+    Args:
+        mode (str): 'expanding' or 'rolling'.
+        window (int): Rows in the rolling window (rolling mode only).
+    """
+
+    def __init__(self, mode: str = "expanding", window: int = None):
+        if mode not in ("expanding", "rolling"):
+            raise ValueError(f"Unknown normalizer mode: {mode}")
+        if mode == "rolling" and not window:
+            raise ValueError("Rolling mode needs a window")
+        self.mode = mode
+        self.window = window if mode == "rolling" else None
+        self.columns = None
+        self.last_index = None
+        self.last = None    # last forward-filled row
+        self.min = None     # running min/max (expanding mode)
+        self.max = None
+        self.tail = None    # previous window - 1 filled rows (rolling mode)
+
+    def _init_state(self, columns: list) -> None:
+        n = len(columns)
+        self.columns = list(columns)
+        self.last = np.full(n, np.nan)
+        self.min = np.full(n, np.nan)
+        self.max = np.full(n, np.nan)
+        self.tail = np.empty((0, n))
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scale the rows of `df` newer than anything seen so far.
+
+        Args:
+            df (pd.DataFrame): Indicator levels indexed by date; may include
+                already-processed history, which is skipped.
+
+        Returns:
+            pd.DataFrame: 0–100 scores for the new rows only (NaN until a column
+            has its first observation).
+        """
+        if self.columns is None:
+            self._init_state(df.columns)
+        elif list(df.columns) != self.columns:
+            raise ValueError(f"Columns changed: expected {self.columns}, got {list(df.columns)}")
+
+        if self.last_index is not None:
+            df = df[df.index > self.last_index]
+        if df.empty:
+            return pd.DataFrame(columns=self.columns, index=df.index, dtype=float)
+
+        # Forward-fill only, continuing from the last row of the previous update
+        seeded = np.vstack([self.last, df.to_numpy(dtype=np.float64)])
+        filled = pd.DataFrame(seeded).ffill().to_numpy()[1:]
+
+        if self.mode == "expanding":
+            lo = np.fmin.accumulate(np.vstack([self.min, filled]), axis=0)[1:]
+            hi = np.fmax.accumulate(np.vstack([self.max, filled]), axis=0)[1:]
+            self.min, self.max = lo[-1], hi[-1]
+        else:
+            stacked = np.vstack([self.tail, filled])
+            rolling = pd.DataFrame(stacked).rolling(self.window, min_periods=1)
+            lo = rolling.min().to_numpy()[len(self.tail):]
+            hi = rolling.max().to_numpy()[len(self.tail):]
+            self.tail = stacked[len(stacked) - (self.window - 1):]
+
+        span = hi - lo
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # A constant history scales to 0, as MinMaxScaler does
+            scaled = np.where(span > 0, (filled - lo) / span, 0.0) * 100
+        scaled[np.isnan(filled)] = np.nan
+
+        self.last = filled[-1]
+        self.last_index = df.index[-1]
+        return pd.DataFrame(scaled, index=df.index, columns=self.columns)
+
+    def to_dict(self) -> dict:
+        def floats(a):
+            return [None if np.isnan(x) else float(x) for x in np.ravel(a)]
+
+        return {
+            "mode": self.mode,
+            "window": self.window,
+            "columns": self.columns,
+            "last_index": None if self.last_index is None else pd.Timestamp(self.last_index).isoformat(),
+            "last": None if self.last is None else floats(self.last),
+            "min": None if self.min is None else floats(self.min),
+            "max": None if self.max is None else floats(self.max),
+            "tail": None if self.tail is None else [floats(row) for row in self.tail],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "IncrementalMinMaxNormalizer":
+        norm = cls(state["mode"], state["window"])
+        if state["columns"] is None:
+            return norm
+
+        def array(values):
+            return np.array([np.nan if x is None else x for x in values], dtype=np.float64)
+
+        norm._init_state(state["columns"])
+        norm.last_index = None if state["last_index"] is None else pd.Timestamp(state["last_index"])
+        norm.last, norm.min, norm.max = array(state["last"]), array(state["min"]), array(state["max"])
+        if state["tail"]:
+            norm.tail = np.vstack([array(row) for row in state["tail"]])
+        return norm
+
+    def save(self, path) -> None:
+        """
+        Persist the state as JSON so the next refresh only processes new rows.
+
+        Save only once the scores from the last update() are stored: the
+        saved state skips every date up to `last_index`.
+        """
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path) -> "IncrementalMinMaxNormalizer":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def load_normalizer(path, mode: str = "expanding", window: int = None) -> IncrementalMinMaxNormalizer:
+    """
+    Resume the normalizer saved at `path`, or start a fresh one when there is
+    no saved state or it was built with other settings.
+    """
+    if path is not None and Path(path).exists():
+        scaler = IncrementalMinMaxNormalizer.load(path)
+        if (scaler.mode, scaler.window) == (mode, window if mode == "rolling" else None):
+            return scaler
+    return IncrementalMinMaxNormalizer(mode, window)
+
+
+def compute_weighted_risk_index(df: pd.DataFrame, weights: dict = None, normalizer: str = "global",
+                                window: int = None, state=None) -> pd.Series:
     """
     Compute a single Market Risk Index (0–100) as a weighted average of selected indicators.
+
+    normalizer='global' rescales over the whole history (scores can change as
+    data arrives). 'expanding' and 'rolling' are point-in-time: only rows after
+    the last processed date are scored, and an indicator with no data yet is
+    left out of the average. `state` is an IncrementalMinMaxNormalizer,
+    updated in place; callers that store the scores should save it only
+    after the scores are written (see load_normalizer). A path to a JSON
+    state is also accepted and saved back immediately.
     """
     if weights is None:
         weights = {col: 1.0 for col in df.columns}
@@ -21,15 +182,35 @@ def compute_weighted_risk_index(df: pd.DataFrame, weights: dict = None) -> pd.Se
     # Ensure weights cover only existing columns
     valid_cols = [col for col in df.columns if col in weights]
     df = df[valid_cols]
+    weight_array = np.array([weights[col] for col in valid_cols])
 
-    # Normalize
-    norm_df = normalize_df(df)
+    if normalizer == "global":
+        # Normalize
+        norm_df = normalize_df(df)
 
-    # Weighting
-    weight_array = np.array([weights[col] for col in valid_cols])
-    weighted_risk = norm_df.dot(weight_array) / weight_array.sum()
+        # Weighting
+        weighted_risk = norm_df.dot(weight_array) / weight_array.sum()
+        return weighted_risk.rename("Market Risk Score")
+
+    if normalizer not in NORMALIZERS:
+        raise ValueError(f"Unknown normalizer: {normalizer}")
+
+    state_path = None
+    if isinstance(state, IncrementalMinMaxNormalizer):
+        scaler = state
+    else:
+        state_path = state
+        scaler = load_normalizer(state_path, normalizer, window)
+
+    norm_df = scaler.update(df)
+    if state_path is not None:
+        scaler.save(state_path)
 
-    return weighted_risk.rename("Market Risk Score")
+    present = norm_df.notna().to_numpy()
+    weighted = np.nan_to_num(norm_df.to_numpy()) @ weight_array
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weighted_risk = weighted / (present @ weight_array)
+    return pd.Series(weighted_risk, index=norm_df.index, name="Market Risk Score")
 
 
 def categorize_risk(score: float) -> str:
@@ -0,0 +1,252 @@
+import json
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+# Streaming counterparts of feature_engineering: each update costs O(1)
+# regardless of history length. Windows follow pandas' rolling defaults
+# (min_periods == window, sample std with ddof=1), so results match the
+# batch functions to floating-point tolerance.
+
+
+class RollingStats:
+    """
+    Sliding-window mean/variance using Welford's add/remove updates.
+
+    A window that contains a NaN yields NaN, like pandas' rolling(window).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.count = 0      # finite values in the window
+        self.nan_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0       # sum of squared deviations from the mean
+
+    def _add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self.mean, self.m2 = 0.0, 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (x - self.mean), 0.0)
+
+    def update(self, x: float) -> None:
+        """
+        Push one observation, evicting the oldest once the window is full.
+        """
+        x = float(x)
+        self.values.append(x)
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            self._add(x)
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self._remove(old)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def get_mean(self) -> float:
+        return self.mean if self.ready else np.nan
+
+    def get_var(self) -> float:
+        if not self.ready or self.window < 2:
+            return np.nan
+        return self.m2 / (self.count - 1)
+
+    def get_std(self) -> float:
+        return math.sqrt(self.get_var())
+
+    def to_dict(self) -> dict:
+        return {"window": self.window, "values": list(self.values)}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "RollingStats":
+        # Rebuilding from the raw window avoids carrying accumulated drift across restarts
+        stats = cls(state["window"])
+        for x in state["values"]:
+            stats.update(x)
+        return stats
+
+
+class RollingCorrelation:
+    """
+    Sliding-window Pearson correlation from running co-moments.
+
+    A window where either side has a NaN yields NaN.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.pairs = deque()
+        self.count = 0
+        self.nan_count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0     # co-moment: sum of (x - mean_x) * (y - mean_y)
+
+    def _add(self, x: float, y: float) -> None:
+        self.count += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.count
+        self.mean_y += dy / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def _remove(self, x: float, y: float) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self.mean_x = self.mean_y = self.m2_x = self.m2_y = self.c_xy = 0.0
+            return
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x -= dx / self.count
+        self.mean_y -= dy / self.count
+        self.m2_x = max(self.m2_x - dx * (x - self.mean_x), 0.0)
+        self.m2_y = max(self.m2_y - dy * (y - self.mean_y), 0.0)
+        self.c_xy -= dx * (y - self.mean_y)
+
+    def update(self, x: float, y: float) -> None:
+        x, y = float(x), float(y)
+        self.pairs.append((x, y))
+        if math.isnan(x) or math.isnan(y):
+            self.nan_count += 1
+        else:
+            self._add(x, y)
+
+        if len(self.pairs) > self.window:
+            ox, oy = self.pairs.popleft()
+            if math.isnan(ox) or math.isnan(oy):
+                self.nan_count -= 1
+            else:
+                self._remove(ox, oy)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.pairs) == self.window and self.nan_count == 0
+
+    def get_corr(self) -> float:
+        if not self.ready:
+            return np.nan
+        denom = math.sqrt(self.m2_x * self.m2_y)
+        return self.c_xy / denom if denom > 0 else np.nan
+
+    def to_dict(self) -> dict:
+        return {"window": self.window, "pairs": [list(p) for p in self.pairs]}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "RollingCorrelation":
+        corr = cls(state["window"])
+        for x, y in state["pairs"]:
+            corr.update(x, y)
+        return corr
+
+
+class FeatureState:
+    """
+    Streaming feature engine for one price series.
+
+    Each call to `update` consumes a new bar and returns the latest
+    volatility index, moving average, z-score and (if a second series is
+    passed) rolling correlation, mirroring the functions in feature_engineering.
+
+    Parameters:
+        vol_window (int): Window for volatility_index.
+        ma_window (int): Window for moving_average.
+        z_window (int): Window for z_score.
+        corr_window (int): Window for rolling_correlation.
+    """
+
+    def __init__(self, vol_window: int = 30, ma_window: int = 20, z_window: int = 30, corr_window: int = 30):
+        self.returns = RollingStats(vol_window)
+        self.ma = RollingStats(ma_window)
+        self.z = RollingStats(z_window)
+        self.corr = RollingCorrelation(corr_window)
+        self.last_price = np.nan
+
+    def update(self, price: float, other: float = np.nan) -> dict:
+        """
+        Consume one observation and return the current feature values.
+
+        Args:
+            price (float): New price (or value) of the primary series.
+            other (float): New value of the series to correlate against.
+
+        Returns:
+            dict: Volatility, MovingAverage, ZScore and Correlation
+        """
+        price = float(price)
+        ret = price / self.last_price - 1 if self.last_price else np.nan
+        self.last_price = price
+
+        self.returns.update(ret)
+        self.ma.update(price)
+        self.z.update(price)
+        self.corr.update(price, other)
+
+        z_std = self.z.get_std()
+        return {
+            "Volatility": self.returns.get_std() * math.sqrt(self.returns.window),
+            "MovingAverage": self.ma.get_mean(),
+            "ZScore": (price - self.z.get_mean()) / z_std if z_std else np.nan,
+            "Correlation": self.corr.get_corr(),
+        }
+
+    def update_many(self, prices: pd.Series, other: pd.Series = None) -> pd.DataFrame:
+        """
+        Feed a batch of observations in order and return one row per input.
+        """
+        others = other.reindex(prices.index).to_numpy() if other is not None else np.full(len(prices), np.nan)
+        rows = [self.update(p, o) for p, o in zip(prices.to_numpy(), others)]
+        return pd.DataFrame(rows, index=prices.index)
+
+    def to_dict(self) -> dict:
+        return {
+            "returns": self.returns.to_dict(),
+            "ma": self.ma.to_dict(),
+            "z": self.z.to_dict(),
+            "corr": self.corr.to_dict(),
+            "last_price": self.last_price,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "FeatureState":
+        fs = cls.__new__(cls)
+        fs.returns = RollingStats.from_dict(state["returns"])
+        fs.ma = RollingStats.from_dict(state["ma"])
+        fs.z = RollingStats.from_dict(state["z"])
+        fs.corr = RollingCorrelation.from_dict(state["corr"])
+        fs.last_price = state["last_price"]
+        return fs
+
+    def save(self, path) -> None:
+        """
+        Persist the state as JSON so a restarted process can resume.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path) -> "FeatureState":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
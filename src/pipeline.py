@@ -0,0 +1,209 @@
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline.
+
+    Stages exchange data through files: a stage reads its `inputs` and writes
+    its `outputs`, and it depends on every stage that produces one of its
+    inputs.
+
+    Attributes:
+        name (str): Unique stage name used by --only/--from.
+        func (Callable): Called with no arguments to produce the outputs.
+        inputs (list): Files the stage reads.
+        outputs (list): Files (or directories) the stage writes.
+        params (dict): Settings that invalidate the outputs when changed.
+        max_age (float): Seconds after which outputs count as stale even if
+            nothing upstream changed (for stages that pull external data).
+    """
+    name: str
+    func: Callable
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+    max_age: float = None
+
+    def params_hash(self) -> str:
+        return hashlib.sha256(json.dumps(self.params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Pipeline:
+    """
+    Runs stages concurrently in dependency order, skipping up-to-date ones.
+
+    A stage is skipped, make-style, when all its outputs exist, are newer
+    than all its inputs, are younger than `max_age`, and its params match
+    the ones recorded the last time it ran.
+
+    Args:
+        stages (list): Stage objects; dependencies are inferred from files.
+        state_path (Path): JSON file recording each stage's last params hash.
+        max_workers (int): Stages allowed to run at the same time.
+    """
+
+    def __init__(self, stages: list, state_path: Path, max_workers: int = 4):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = Path(state_path)
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+        producers = {}
+        for stage in stages:
+            for output in stage.outputs:
+                producers[str(output)] = stage.name
+        self.deps = {
+            stage.name: sorted({producers[str(i)] for i in stage.inputs if str(i) in producers} - {stage.name})
+            for stage in stages
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def descendants(self, name: str) -> set:
+        """
+        The stage itself and every stage downstream of it.
+        """
+        found = {name}
+        changed = True
+        while changed:
+            changed = False
+            for stage, deps in self.deps.items():
+                if stage not in found and found.intersection(deps):
+                    found.add(stage)
+                    changed = True
+        return found
+
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            return json.loads(self.state_path.read_text())
+        return {}
+
+    def _save_state(self, state: dict) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+    def is_up_to_date(self, stage: Stage, state: dict) -> bool:
+        if not stage.outputs or state.get(stage.name) != stage.params_hash():
+            return False
+        outputs = [Path(p) for p in stage.outputs]
+        if not all(p.exists() for p in outputs):
+            return False
+        oldest_output = min(p.stat().st_mtime for p in outputs)
+        if stage.max_age is not None and time.time() - oldest_output > stage.max_age:
+            return False
+        inputs = [Path(p) for p in stage.inputs]
+        if any(not p.exists() for p in inputs):
+            return False
+        newest_input = max((p.stat().st_mtime for p in inputs), default=0)
+        return oldest_output >= newest_input
+
+    def run(self, only: list = None, start_from: str = None, force: bool = False) -> pd.DataFrame:
+        """
+        Execute the pipeline.
+
+        Args:
+            only (list): Run just these stages (forced).
+            start_from (str): Run this stage (forced) and everything downstream of it.
+            force (bool): Ignore up-to-date checks for every selected stage.
+
+        Returns:
+            pd.DataFrame: Per-stage status and timing summary.
+        """
+        for name in (only or []) + ([start_from] if start_from else []):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+
+        if only:
+            selected, forced = set(only), set(only)
+        elif start_from:
+            selected, forced = self.descendants(start_from), {start_from}
+        else:
+            selected, forced = set(self.stages), set()
+        if force:
+            forced = set(selected)
+
+        state = self._load_state()
+        results = {}
+        pending = set(selected)
+        running = {}
+        started = time.perf_counter()
+
+        def execute(stage):
+            t0 = time.perf_counter()
+            stage.func()
+            return time.perf_counter() - t0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as pool:
+            while pending or running:
+                # Stages outside the selection are treated as already satisfied
+                for name in sorted(pending):
+                    deps = [d for d in self.deps[name] if d in selected]
+                    if any(results.get(d, {}).get("status") in ("failed", "blocked") for d in deps):
+                        pending.discard(name)
+                        results[name] = {"status": "blocked", "seconds": 0.0, "error": "upstream stage failed"}
+                        continue
+                    if not all(d in results for d in deps):
+                        continue
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    if name not in forced and self.is_up_to_date(stage, state):
+                        results[name] = {"status": "skipped", "seconds": 0.0, "error": None}
+                        print(f" [{name}] up to date, skipped")
+                        continue
+                    print(f" [{name}] running...")
+                    running[pool.submit(execute, stage)] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        seconds = future.result()
+                        results[name] = {"status": "ran", "seconds": seconds, "error": None}
+                        with self._lock:
+                            state[name] = self.stages[name].params_hash()
+                            self._save_state(state)
+                        print(f" [{name}] done in {seconds:.2f}s")
+                    except Exception as e:
+                        results[name] = {"status": "failed", "seconds": 0.0, "error": f"{type(e).__name__}: {e}"}
+                        # Outputs may be partially written, so never treat them as up to date
+                        with self._lock:
+                            state.pop(name, None)
+                            self._save_state(state)
+                        print(f" [{name}] FAILED: {type(e).__name__}: {e}")
+
+        summary = pd.DataFrame(
+            [{"stage": name, **results[name]} for name in self.stages if name in results]
+        )
+        summary.attrs["wall_seconds"] = time.perf_counter() - started
+        return summary
@@ -0,0 +1,153 @@
+import os
+import re
+import json
+from pathlib import Path
+from datetime import datetime, timedelta
+import pandas as pd
+
+from config import CACHE_DIR
+
+# How long the most recent (possibly still forming) bar is trusted before a refetch
+STALE_AFTER = timedelta(hours=1)
+
+
+# Build the on-disk location for one (ticker, interval, auto_adjust) key
+def cache_path(ticker: str, interval: str = "1d", auto_adjust: bool = True, cache_dir: Path = None) -> Path:
+    """
+    Returns the Parquet file path for a cache key.
+
+    Args:
+        ticker (str): Ticker symbol (e.g. '^GSPC')
+        interval (str): Bar interval passed to yfinance
+        auto_adjust (bool): Whether prices are split/dividend adjusted
+        cache_dir (Path): Cache root, defaults to CACHE_DIR
+
+    Returns:
+        Path: Path of the Parquet file holding the cached bars
+    """
+    safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+    adjusted = "adj" if auto_adjust else "raw"
+    return Path(cache_dir or CACHE_DIR) / "prices" / f"{safe_ticker}_{interval}_{adjusted}.parquet"
+
+
+# Read cached bars and coverage metadata
+def read_cached_prices(ticker: str, interval: str = "1d", auto_adjust: bool = True, cache_dir: Path = None):
+    """
+    Loads cached bars for a key together with the date range they cover.
+
+    Returns:
+        tuple: (DataFrame, metadata dict) or (empty DataFrame, None) on a miss
+    """
+    path = cache_path(ticker, interval, auto_adjust, cache_dir)
+    meta_path = path.with_suffix(".json")
+    if not path.exists() or not meta_path.exists():
+        return pd.DataFrame(), None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    df = pd.read_parquet(path)
+    return df, meta
+
+
+# Persist bars and coverage metadata
+def write_cached_prices(df: pd.DataFrame, meta: dict, ticker: str, interval: str = "1d",
+                        auto_adjust: bool = True, cache_dir: Path = None) -> None:
+    """
+    Writes bars to Parquet and the covered range to a JSON sidecar.
+
+    The metadata is written last so a crash never leaves a sidecar that
+    describes data which is not on disk.
+    """
+    path = cache_path(ticker, interval, auto_adjust, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+    meta_path = path.with_suffix(".json")
+    tmp_meta = meta_path.with_suffix(".json.tmp")
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path)
+
+
+# Work out which date windows still need to be downloaded
+def missing_ranges(meta: dict, start, end, now: datetime = None, stale_after: timedelta = STALE_AFTER,
+                   last_bar=None) -> list:
+    """
+    Compares a requested [start, end) window with the cached coverage.
+
+    Args:
+        meta (dict): Coverage metadata from read_cached_prices (None on a miss)
+        start, end: Requested window, end exclusive as in yf.download
+        now (datetime): Reference time, defaults to the current time
+        stale_after (timedelta): Age after which the latest bar is refetched
+        last_bar: Timestamp of the newest cached bar
+
+    Returns:
+        list: (start, end) Timestamp pairs to download, possibly empty
+    """
+    now = pd.Timestamp(now or datetime.now())
+    start = pd.Timestamp(start).normalize()
+    # Nothing beyond tomorrow can exist yet, so never count it as missing
+    end = min(pd.Timestamp(end).normalize(), now.normalize() + pd.Timedelta(days=1))
+
+    if meta is None:
+        return [(start, end)] if start < end else []
+
+    covered_start = pd.Timestamp(meta["start"])
+    covered_end = pd.Timestamp(meta["end"])
+    fetched_at = pd.Timestamp(meta["fetched_at"])
+
+    # Gaps are always fetched up to the cached edge so coverage stays contiguous
+    ranges = []
+    if start < covered_start:
+        ranges.append((start, covered_start))
+
+    tail_start = covered_end
+    # Coverage reaching the fetch day means the newest bar may have been incomplete
+    if covered_end > fetched_at.normalize() and now - fetched_at > stale_after and last_bar is not None:
+        tail_start = min(tail_start, pd.Timestamp(last_bar).normalize())
+    if end > tail_start:
+        ranges.append((tail_start, end))
+
+    return ranges
+
+
+# Combine cached bars with freshly downloaded ones
+def merge_prices(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merges two bar frames, preferring fresh rows where dates overlap.
+    """
+    if cached.empty:
+        return fresh.sort_index()
+    if fresh.empty:
+        return cached
+    merged = pd.concat([cached, fresh])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+# Widen the covered range after a successful fetch
+def update_coverage(meta: dict, start, end, now: datetime = None) -> dict:
+    """
+    Returns metadata covering the union of the old and newly fetched range.
+
+    The end is clipped to tomorrow because future dates cannot hold bars yet.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    start = pd.Timestamp(start).normalize()
+    end = min(pd.Timestamp(end).normalize(), now.normalize() + pd.Timedelta(days=1))
+    fetched_at = now
+    if meta is not None:
+        # A head-only fetch leaves the newest bar as old as it was
+        if end < pd.Timestamp(meta["end"]):
+            fetched_at = pd.Timestamp(meta["fetched_at"])
+        start = min(start, pd.Timestamp(meta["start"]))
+        end = max(end, pd.Timestamp(meta["end"]))
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "fetched_at": fetched_at.isoformat(),
+    }
@@ -0,0 +1,174 @@
+import hashlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from visualization import plot_anomalies, plot_forecast, plot_risk_index
+
+# Multi-page PDF market report: a summary page, the anomaly, forecast and
+# risk charts, and a table of recent rows. Charts are drawn headless to PNG
+# and embedded, so building a report needs no display and can run in a
+# background thread.
+
+# Most recent rows listed in the report table (about one trading year)
+REPORT_TABLE_ROWS = 252
+
+# Printed width (mm) of an A4 page inside the default margins
+PAGE_WIDTH = 190
+
+# Table columns: source column -> (header, printf format, width)
+TABLE_COLUMNS = {
+    'Close': ("Close", "%.2f", 12),
+    'Volatility': ("Volatility", "%.4f", 12),
+    'anomaly': ("Anomaly", None, 9),
+    'Market Risk Score': ("Risk", "%.1f", 8),
+}
+
+
+# Identify a table's contents, for cache keys
+def data_version(df: pd.DataFrame) -> str:
+    """
+    Returns a short hash of the values and index, so a report cached for one
+    version of the data is never served for another.
+    """
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+# Fixed-width text rows for a table, one formatting pass per column
+def format_rows(df: pd.DataFrame, columns: dict = TABLE_COLUMNS, date_format: str = "%Y-%m-%d") -> list:
+    """
+    Formats a date-indexed table as aligned text lines.
+
+    Every column is converted with a single vectorized call and the columns
+    are joined as arrays; missing values print as "-".
+
+    Args:
+        df (pd.DataFrame): Table with a DateTime index
+        columns (dict): {column: (header, printf format or None for flags, width)};
+            columns missing from df are skipped
+        date_format (str): Format of the date column
+
+    Returns:
+        list: Header line followed by one line per row
+    """
+    present = {col: spec for col, spec in columns.items() if col in df.columns}
+    header = "Date".ljust(10) + "".join(h.rjust(w) for h, _, w in present.values())
+
+    lines = np.asarray(pd.DatetimeIndex(df.index).strftime(date_format), dtype=str)
+    for col, (_, fmt, width) in present.items():
+        values = df[col].to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+        if fmt is None:
+            text = np.where(values == -1, "yes", "")
+        else:
+            text = np.char.mod(fmt, np.where(missing, 0.0, values))
+        text = np.where(missing, "-", text)
+        lines = np.char.add(lines, np.char.rjust(text.astype(str), width))
+    return [header] + lines.tolist()
+
+
+# Section title on the current page
+def _heading(pdf, text: str) -> None:
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, txt=text, ln=True)
+    pdf.set_font("Arial", size=10)
+
+
+def _pdf_bytes(pdf) -> bytes:
+    # PyFPDF returns a latin-1 str, fpdf2 a bytearray
+    out = pdf.output(dest='S')
+    return out.encode('latin1') if isinstance(out, str) else bytes(out)
+
+
+def build_report(ticker: str, start, end, prices: pd.DataFrame, anomalies: pd.DataFrame = None,
+                 forecast: pd.DataFrame = None, risk: pd.DataFrame = None, errors: dict = None,
+                 table_rows: int = REPORT_TABLE_ROWS) -> bytes:
+    """
+    Builds the PDF market report.
+
+    Sections whose data is missing are replaced by a note (with the reason
+    from `errors`, if given) instead of failing the whole report.
+
+    Args:
+        ticker (str): Ticker symbol
+        start, end: Date range of the report
+        prices (pd.DataFrame): Close and Volatility with DateTime index
+        anomalies (pd.DataFrame): Volatility with 'anomaly' flags (-1/1)
+        forecast (pd.DataFrame): forecast_series() output
+        risk (pd.DataFrame): 'Market Risk Score' with DateTime index
+        errors (dict): {'anomalies' | 'forecast' | 'risk': reason} for missing sections
+        table_rows (int): Most recent rows to list
+
+    Returns:
+        bytes: The PDF document
+    """
+    from fpdf import FPDF
+
+    errors = errors or {}
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+
+    # --- Summary ---
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 12, txt="CrashSentinel Market Report", ln=True, align='C')
+    pdf.set_font("Arial", size=11)
+    summary = [
+        f"Ticker: {ticker}",
+        f"Period: {pd.Timestamp(start):%Y-%m-%d} to {pd.Timestamp(end):%Y-%m-%d} ({len(prices)} trading days)",
+        f"Last close: {prices['Close'].iloc[-1]:.2f}",
+        f"Generated: {datetime.now():%Y-%m-%d %H:%M} (data version {data_version(prices)})",
+    ]
+    if anomalies is not None:
+        flagged = anomalies.index[anomalies['anomaly'] == -1]
+        last = f", most recent {flagged[-1]:%Y-%m-%d}" if len(flagged) else ""
+        summary.append(f"Volatility anomalies: {len(flagged)}{last}")
+    if risk is not None and risk['Market Risk Score'].notna().any():
+        latest = risk['Market Risk Score'].dropna()
+        summary.append(f"Market risk score: {latest.iloc[-1]:.1f} / 100 on {latest.index[-1]:%Y-%m-%d}")
+    if forecast is not None:
+        summary.append(f"Forecast for {forecast['ds'].iloc[-1]:%Y-%m-%d}: {forecast['yhat'].iloc[-1]:.2f} "
+                       f"({forecast['yhat_lower'].iloc[-1]:.2f} - {forecast['yhat_upper'].iloc[-1]:.2f})")
+    pdf.ln(4)
+    for line in summary:
+        pdf.cell(0, 7, txt=line, ln=True)
+
+    # --- Charts ---
+    with tempfile.TemporaryDirectory() as tmp:
+        charts = [
+            ("Volatility Anomalies", 'anomalies', anomalies, lambda path: plot_anomalies(
+                anomalies, 'Volatility', 'anomaly', title=f"{ticker} Volatility Anomalies", save_path=path)),
+            ("Forecast", 'forecast', forecast, lambda path: plot_forecast(
+                forecast, history=prices['Close'], title=f"{ticker} Forecast", save_path=path)),
+            ("Market Risk Index", 'risk', risk, lambda path: plot_risk_index(
+                risk['Market Risk Score'], save_path=path)),
+        ]
+        for title, name, frame, draw in charts:
+            pdf.add_page()
+            _heading(pdf, title)
+            if frame is None or frame.empty:
+                pdf.multi_cell(0, 6, txt=f"Not available: {errors.get(name, 'no data')}")
+                continue
+            path = draw(Path(tmp) / f"{name}.png")
+            pdf.image(str(path), x=10, w=PAGE_WIDTH)
+
+    # --- Recent data ---
+    table = prices[['Close', 'Volatility']]
+    if anomalies is not None:
+        table = table.join(anomalies[['anomaly']])
+    if risk is not None:
+        table = table.join(risk[['Market Risk Score']])
+    lines = format_rows(table.tail(table_rows).iloc[::-1])
+
+    pdf.add_page()
+    _heading(pdf, f"Recent Data (last {len(lines) - 1} trading days)")
+    pdf.set_font("Courier", "B", 9)
+    pdf.cell(0, 5, txt=lines[0], ln=True)
+    pdf.set_font("Courier", size=9)
+    for line in lines[1:]:
+        pdf.cell(0, 4.5, txt=line, ln=True)
+
+    return _pdf_bytes(pdf)
@@ -0,0 +1,196 @@
+import hashlib
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from config import CACHE_DIR
+from data_sources.columnar_store import PartStore
+
+# Lexicon-based sentiment for scraped posts and tweets. Texts are tokenized
+# into a sparse document x term count matrix over a fixed vocabulary, so a
+# whole batch is scored with one sparse matrix-vector product.
+
+# Market-flavoured polarity lexicon (-1 very negative .. +1 very positive)
+LEXICON = {
+    # negative
+    "crash": -1.0, "crashes": -1.0, "crashing": -1.0, "collapse": -1.0, "panic": -1.0,
+    "recession": -0.8, "depression": -0.9, "bankrupt": -1.0, "bankruptcy": -1.0, "default": -0.8,
+    "selloff": -0.8, "sell-off": -0.8, "plunge": -0.9, "plunges": -0.9, "plummet": -0.9,
+    "tank": -0.7, "tanking": -0.7, "bubble": -0.6, "bear": -0.6, "bearish": -0.7,
+    "fear": -0.6, "fears": -0.6, "risk": -0.3, "risky": -0.4, "inflation": -0.4,
+    "layoffs": -0.6, "unemployment": -0.4, "downturn": -0.7, "loss": -0.5, "losses": -0.5,
+    "drop": -0.4, "drops": -0.4, "decline": -0.4, "declines": -0.4, "falling": -0.4,
+    "weak": -0.4, "weakness": -0.4, "volatile": -0.3, "volatility": -0.3, "crisis": -0.9,
+    "contagion": -0.8, "downgrade": -0.6, "overvalued": -0.5, "hike": -0.3, "hikes": -0.3,
+    "margin call": -0.8, "rate hike": -0.5, "bank run": -1.0, "hard landing": -0.7,
+    # positive
+    "rally": 0.8, "rallies": 0.8, "surge": 0.7, "surges": 0.7, "soar": 0.8, "soars": 0.8,
+    "bull": 0.6, "bullish": 0.7, "recovery": 0.7, "recover": 0.6, "growth": 0.5,
+    "gain": 0.5, "gains": 0.5, "profit": 0.5, "profits": 0.5, "strong": 0.4, "strength": 0.4,
+    "beat": 0.5, "beats": 0.5, "upgrade": 0.6, "optimism": 0.6, "optimistic": 0.6,
+    "record high": 0.7, "all-time high": 0.7, "boom": 0.7, "rebound": 0.6, "stable": 0.3,
+    "undervalued": 0.4, "buy": 0.3, "rate cut": 0.5, "soft landing": 0.6, "cut": 0.1,
+}
+
+# Words, keeping inner hyphens ("sell-off", "all-time")
+TOKEN_PATTERN = r"(?u)\b\w[\w-]*\w\b|\b\w\b"
+
+SCORE_BATCH_SIZE = 50_000
+
+# Part of the cache key next to the lexicon; bump when the scoring rule changes
+SCORING_VERSION = 2
+
+SENTIMENT_CACHE_DIR = CACHE_DIR / "sentiment"
+
+
+class LexiconScorer:
+    """
+    Scores texts as the average polarity of the lexicon terms they contain.
+
+    Unigrams and bigrams in the lexicon are counted by a CountVectorizer with
+    a fixed vocabulary (nothing is fitted), so scoring is stateless and any
+    batch size gives identical results. A word matched as part of a lexicon
+    bigram is not counted again on its own: "rate hike" scores as the
+    bigram only, not as "rate hike" plus "hike".
+
+    Args:
+        lexicon (dict): {term: polarity}; terms may be one or two words.
+    """
+
+    def __init__(self, lexicon: dict = LEXICON):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.lexicon = {term.lower(): float(w) for term, w in lexicon.items()}
+        terms = sorted(self.lexicon)
+        max_words = max(len(term.split()) for term in terms)
+        self.vectorizer = CountVectorizer(vocabulary=terms, lowercase=True, token_pattern=TOKEN_PATTERN,
+                                          ngram_range=(1, max_words), dtype=np.float32)
+        weights = np.array([self.lexicon[term] for term in terms], dtype=np.float64)
+
+        # overlap[i, j] = times lexicon term j occurs inside multi-word term i.
+        # Each match of term i also counted its words, so folding the overlap
+        # into per-term weights (and per-term match counts) takes them out again
+        position = {term: i for i, term in enumerate(terms)}
+        overlap = np.zeros((len(terms), len(terms)))
+        for i, term in enumerate(terms):
+            words = term.split()
+            for n in range(1, len(words)):
+                for k in range(len(words) - n + 1):
+                    j = position.get(" ".join(words[k:k + n]))
+                    if j is not None:
+                        overlap[i, j] += 1
+        self.weights = (weights - overlap @ weights).astype(np.float32)
+        self.matches = (1 - overlap.sum(axis=1)).astype(np.float32)
+
+    @property
+    def version(self) -> str:
+        """
+        Hash of the lexicon, used to key cached scores.
+        """
+        blob = repr((SCORING_VERSION, sorted(self.lexicon.items()))).encode()
+        return hashlib.sha256(blob).hexdigest()[:16]
+
+    def score(self, texts, batch_size: int = SCORE_BATCH_SIZE) -> np.ndarray:
+        """
+        Args:
+            texts (iterable): Documents; None/NaN count as empty.
+
+        Returns:
+            np.ndarray: float32 scores in [-1, 1], 0 when no lexicon term occurs.
+        """
+        texts = ["" if t is None or t != t else str(t) for t in texts]
+        scores = np.zeros(len(texts), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            counts = self.vectorizer.transform(texts[start:start + batch_size])
+            total = counts @ self.weights
+            matched = counts @ self.matches
+            np.divide(total, matched, out=scores[start:start + batch_size], where=matched > 0)
+        return scores
+
+
+class SentimentCache:
+    """
+    Scores documents by id, scoring each id at most once per lexicon.
+
+    Scores are appended to a PartStore under `<cache_dir>/<lexicon version>`,
+    and the in-memory index is loaded once from disk.
+
+    Args:
+        scorer (LexiconScorer): Scorer to use for unseen documents.
+        cache_dir (Path): Root of the on-disk score cache.
+    """
+
+    def __init__(self, scorer: LexiconScorer = None, cache_dir=SENTIMENT_CACHE_DIR):
+        self.scorer = scorer or LexiconScorer()
+        self.store = PartStore(Path(cache_dir) / self.scorer.version)
+        cached = self.store.read(columns=["id", "sentiment_score"])
+        self.scores = pd.Series(cached["sentiment_score"].to_numpy(dtype=np.float32),
+                                index=cached["id"].astype(str).to_numpy())
+        self.scored_last = 0
+
+    def score(self, df: pd.DataFrame, text_col: str, id_col: str = "id") -> pd.Series:
+        """
+        Sentiment for every row of `df`, scoring only ids not seen before.
+
+        Returns:
+            pd.Series: float32 'sentiment_score' aligned to df.index.
+        """
+        ids = df[id_col].astype(str)
+        unseen = ~ids.isin(self.scores.index) & ~ids.duplicated()
+        self.scored_last = int(unseen.sum())
+        if self.scored_last:
+            fresh = pd.Series(self.scorer.score(df.loc[unseen, text_col].tolist()),
+                              index=ids[unseen].to_numpy())
+            self.store.append(pd.DataFrame({"id": fresh.index, "sentiment_score": fresh.to_numpy()}))
+            self.scores = pd.concat([self.scores, fresh])
+        values = self.scores.reindex(ids.to_numpy()).to_numpy(dtype=np.float32)
+        return pd.Series(values, index=df.index, name="sentiment_score")
+
+
+def daily_sentiment(df: pd.DataFrame, calendar, date_col: str = "created_utc",
+                    score_col: str = "sentiment_score") -> pd.DataFrame:
+    """
+    Aggregate document scores into one row per trading day.
+
+    A document counts towards the first calendar day on or after its date, so
+    weekend and holiday posts land on the next session and nothing is
+    attributed to a day before it was written. Documents dated before the
+    first or after the last calendar day are left out (and counted in a
+    message) rather than piled onto the edge days.
+
+    Args:
+        df (pd.DataFrame): Scored documents.
+        calendar (pd.DatetimeIndex | pd.DataFrame): Target days, e.g. the price index.
+        date_col (str): Document timestamp column.
+        score_col (str): Score column.
+
+    Returns:
+        pd.DataFrame: 'sentiment_score' (mean) and 'documents' (count) per
+        calendar day; days without documents have NaN / 0.
+    """
+    if isinstance(calendar, (pd.DataFrame, pd.Series)):
+        calendar = calendar.index
+    calendar = pd.DatetimeIndex(calendar)
+    days = calendar.normalize().as_unit("ns").asi8
+
+    dates = pd.to_datetime(df[date_col])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert(None)
+    doc_days = dates.dt.normalize().dt.as_unit("ns").to_numpy().astype(np.int64)
+
+    pos = np.searchsorted(days, doc_days, side="left")
+    inside = (pos < len(days)) & (doc_days >= (days[0] if len(days) else 0))
+    outside = int((~inside).sum())
+    if outside:
+        span = f"{calendar.min():%Y-%m-%d} to {calendar.max():%Y-%m-%d}" if len(days) else "empty"
+        print(f" {outside} of {len(doc_days)} document(s) fall outside the calendar ({span}) and were left out")
+    scores = df[score_col].to_numpy(dtype=np.float64)
+    valid = inside & ~np.isnan(scores)
+
+    totals = np.bincount(pos[valid], weights=scores[valid], minlength=len(days))
+    counts = np.bincount(pos[valid], minlength=len(days))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (totals / counts).astype(np.float32)
+    out = pd.DataFrame({"sentiment_score": mean, "documents": counts.astype(np.int32)}, index=calendar)
+    out.index.name = calendar.name or "Date"
+    return out
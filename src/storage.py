@@ -0,0 +1,182 @@
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Storage layer for the tables main.py and the dashboard exchange through
+# data/. Parquet is the default: it keeps the index and dtypes, and readers
+# can memory-map the file and load only the columns and dates they need. CSV
+# stays available as a format and as an export.
+
+# Default format for new tables (override with CRASHSENTINEL_STORAGE_FORMAT)
+STORAGE_FORMAT = os.getenv("CRASHSENTINEL_STORAGE_FORMAT", "parquet")
+
+# Largest share of distinct values for a text column to become categorical
+CATEGORY_MAX_RATIO = 0.5
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+FLOAT32_TINY = float(np.finfo(np.float32).tiny)
+
+
+# Shrink dtypes without changing what the values mean
+def downcast(df: pd.DataFrame, float32: bool = True, categories: bool = True) -> pd.DataFrame:
+    """
+    Integers go to the smallest type holding their range, repetitive text
+    columns to categoricals, and float64 columns to float32 only when every
+    value survives the round trip exactly (small integers, flags, values on
+    a binary grid). Measured data such as prices usually does not: float32
+    keeps ~7 significant digits, so 612345.67 would come back as 612345.6875
+    and every feature computed from it would shift. Those columns stay
+    float64.
+
+    Args:
+        df (pd.DataFrame): Table to shrink (not modified).
+        float32 (bool): Allow float64 -> float32.
+        categories (bool): Allow text -> category.
+
+    Returns:
+        pd.DataFrame: Table with compact dtypes.
+    """
+    out = df.copy()
+    for col in out.columns:
+        s = out[col]
+        if pd.api.types.is_bool_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(s) and s.dtype.kind in "iu":
+            out[col] = pd.to_numeric(s, downcast="integer" if s.dtype.kind == "i" else "unsigned")
+        elif float32 and s.dtype == np.float64:
+            values = s.to_numpy()
+            magnitudes = np.abs(values[np.isfinite(values) & (values != 0)])
+            if magnitudes.size and (magnitudes.max() > FLOAT32_MAX or magnitudes.min() < FLOAT32_TINY):
+                continue
+            narrowed = values.astype(np.float32)
+            if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                out[col] = narrowed
+        elif categories and (s.dtype == object or pd.api.types.is_string_dtype(s)):
+            if len(s) and s.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(s):
+                out[col] = s.astype("category")
+    return out
+
+
+# --- Parquet ---
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    df.to_parquet(path, index=True)
+
+
+def _index_column(path: Path) -> str:
+    import pyarrow.parquet as pq
+
+    meta = pq.read_schema(path).pandas_metadata or {}
+    names = [c for c in meta.get("index_columns", []) if isinstance(c, str)]
+    return names[0] if names else None
+
+
+def _read_parquet(path: Path, columns: list = None, start=None, end=None, memory_map: bool = True) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    filters = []
+    if start is not None or end is not None:
+        index_col = _index_column(path)
+        if index_col is None:
+            raise ValueError(f"{path} has no stored index to filter dates on")
+        if start is not None:
+            filters.append((index_col, ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append((index_col, "<=", pd.Timestamp(end)))
+    # Projection and row-group filtering happen in Arrow, before pandas sees the data
+    table = pq.read_table(path, columns=columns, filters=filters or None, memory_map=memory_map,
+                          use_pandas_metadata=True)
+    return table.to_pandas()
+
+
+# --- CSV ---
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    df.to_csv(path, index=True)
+
+
+def _read_csv(path: Path, columns: list = None, start=None, end=None, memory_map: bool = True) -> pd.DataFrame:
+    usecols = None
+    if columns is not None:
+        # The first column holds the index and is always needed
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [header[0]] + [c for c in header[1:] if c in set(columns)]
+    df = pd.read_csv(path, usecols=usecols, index_col=0, memory_map=memory_map)
+    if not pd.api.types.is_numeric_dtype(df.index):
+        try:
+            df.index = pd.to_datetime(df.index, format="ISO8601")
+        except (ValueError, TypeError):
+            pass
+    if start is not None or end is not None:
+        df = df.loc[start:end]
+    return df
+
+
+FORMATS = {
+    "parquet": (".parquet", _write_parquet, _read_parquet),
+    "csv": (".csv", _write_csv, _read_csv),
+}
+
+
+def _format_of(path: Path) -> str:
+    for name, (suffix, _, _) in FORMATS.items():
+        if Path(path).suffix == suffix:
+            return name
+    raise ValueError(f"Unknown table format for {path}")
+
+
+def table_path(directory, name: str, fmt: str = None) -> Path:
+    """
+    Location of table `name` in `directory` for the given (or default) format.
+    """
+    return Path(directory) / f"{name}{FORMATS[fmt or STORAGE_FORMAT][0]}"
+
+
+def write_table(data, path, compact: bool = True) -> Path:
+    """
+    Write a DataFrame (or Series) in the format given by the path's suffix.
+
+    The file is written next to its destination and moved into place, so
+    readers never see a partial table.
+
+    Args:
+        data (pd.DataFrame | pd.Series): Table to write; the index is kept.
+        path (Path): Destination, e.g. from table_path().
+        compact (bool): Apply downcast() first.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    df = data.to_frame() if isinstance(data, pd.Series) else data
+    if compact:
+        df = downcast(df)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    FORMATS[_format_of(path)][1](df, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_table(path, columns: list = None, start=None, end=None, memory_map: bool = True) -> pd.DataFrame:
+    """
+    Read a table written by write_table (or a plain CSV with a date index).
+
+    Args:
+        path (Path): Table file.
+        columns (list): Only load these columns (the index is always loaded).
+        start, end: Only load rows whose index lies in [start, end].
+        memory_map (bool): Memory-map the file instead of reading it into a buffer.
+
+    Returns:
+        pd.DataFrame: The table with its stored index and dtypes.
+    """
+    return FORMATS[_format_of(path)][2](Path(path), columns=columns, start=start, end=end, memory_map=memory_map)
+
+
+def export_csv(path, csv_path=None) -> Path:
+    """
+    Write a copy of a stored table as CSV (defaults to the same name with .csv).
+    """
+    path = Path(path)
+    csv_path = Path(csv_path) if csv_path else path.with_suffix(".csv")
+    write_table(read_table(path), csv_path, compact=False)
+    return csv_path
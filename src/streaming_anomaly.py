@@ -0,0 +1,216 @@
+import time
+import bisect
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from anomaly_detection import train_isolation_forest
+
+# Long-lived Isolation Forest scoring for intraday monitoring. Observations are
+# scored one at a time against the current model while a background thread
+# retrains on a sliding window and swaps the new model in.
+
+LATENCY_SAMPLES = 10_000
+
+
+# Exact per-value lookup for a single-feature forest
+def build_score_table(model) -> tuple:
+    """
+    With one feature, every tree splits on the same axis, so the anomaly score
+    is a step function of the value that only changes at split thresholds.
+    Scoring each interval between consecutive thresholds once turns a forest
+    evaluation into a binary search.
+
+    Trees compare float32-cast inputs against float64 thresholds (`x <= t`
+    goes left), so each interval is represented by a float32 value inside it
+    and callers must look up float32(x) to reproduce model.predict exactly.
+
+    Args:
+        model (IsolationForest): Forest fitted on exactly one feature.
+
+    Returns:
+        tuple: (sorted thresholds list, decision_function value per interval list)
+    """
+    thresholds = np.unique(np.concatenate([
+        tree.tree_.threshold[tree.tree_.children_left != -1] for tree in model.estimators_
+    ]))
+
+    # Interval i holds values in (t[i-1], t[i]]; its representative is the
+    # largest float32 not above t[i]. The last interval is (t[-1], inf).
+    reps = thresholds.astype(np.float32)
+    above = reps.astype(np.float64) > thresholds
+    reps[above] = np.nextafter(reps[above], np.float32(-np.inf))
+    last = np.float32(thresholds[-1]) if len(thresholds) else np.float32(0)
+    if len(thresholds) and last <= thresholds[-1]:
+        last = np.nextafter(last, np.float32(np.inf))
+    reps = np.append(reps, last)
+
+    columns = getattr(model, "feature_names_in_", None)
+    scores = model.decision_function(pd.DataFrame(reps.astype(np.float64).reshape(-1, 1), columns=columns))
+    return thresholds.tolist(), scores.tolist()
+
+
+class StreamingAnomalyScorer:
+    """
+    Scores observations one at a time and refreshes its model in the background.
+
+    Labels follow IsolationForest.predict (-1 anomaly, 1 normal), so replaying
+    history gives the same column as append_anomaly_column with the same model.
+    Single-feature models are scored through a threshold lookup table in a few
+    microseconds; multi-feature models fall back to decision_function.
+
+    Args:
+        history (pd.DataFrame): Past observations used to seed the window.
+        features (list): Feature columns, defaults to all columns of `history`.
+        contamination (float): Expected proportion of anomalies.
+        window (int): Observations kept for retraining.
+        retrain_every (int): Retrain after this many new observations (None disables).
+        model (IsolationForest): Start from this model instead of training one.
+    """
+
+    def __init__(self, history: pd.DataFrame, features: list = None, contamination: float = 0.05,
+                 window: int = 2520, retrain_every: int = None, model=None):
+        self.features = list(features or history.columns)
+        self.contamination = contamination
+        self.retrain_every = retrain_every
+        self._window = deque(history[self.features].dropna().to_numpy(dtype=np.float64)[-window:],
+                             maxlen=window)
+        self._lock = threading.Lock()
+        self._since_train = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.retrain_count = 0
+        self.last_error = None
+
+        if model is None:
+            model = train_isolation_forest(self._snapshot(), contamination=contamination)
+        self._current = self._prepare(model)
+
+    def _snapshot(self) -> pd.DataFrame:
+        with self._lock:
+            values = np.array(self._window)
+        return pd.DataFrame(values, columns=self.features)
+
+    def _prepare(self, model) -> tuple:
+        table = build_score_table(model) if len(self.features) == 1 else None
+        return model, table
+
+    @property
+    def model(self):
+        return self._current[0]
+
+    def swap_model(self, model) -> None:
+        """
+        Replace the model; in-flight score() calls finish on the old one.
+        """
+        # A single attribute assignment, so readers never see a half-built table
+        self._current = self._prepare(model)
+
+    def refresh(self) -> None:
+        """
+        Retrain on the current window and swap the new model in.
+        """
+        model = train_isolation_forest(self._snapshot(), contamination=self.contamination)
+        self.swap_model(model)
+        self.retrain_count += 1
+
+    def score(self, observation) -> tuple:
+        """
+        Score one observation and add it to the retraining window.
+
+        Args:
+            observation: A scalar for single-feature models, else a sequence or
+                dict of feature values.
+
+        Returns:
+            tuple: (label, decision score); (None, nan) if any feature is NaN.
+        """
+        started = time.perf_counter_ns()
+        if isinstance(observation, dict):
+            values = [float(observation[f]) for f in self.features]
+        elif np.ndim(observation) == 0:
+            values = [float(observation)]
+        else:
+            values = [float(v) for v in observation]
+
+        if any(v != v for v in values):
+            self._latencies.append(time.perf_counter_ns() - started)
+            return None, float("nan")
+
+        model, table = self._current
+        if table is not None:
+            thresholds, scores = table
+            value = float(np.float32(values[0]))
+            score = scores[bisect.bisect_left(thresholds, value)]
+        else:
+            row = pd.DataFrame([values], columns=self.features)
+            score = float(model.decision_function(row)[0])
+        label = -1 if score < 0 else 1
+
+        with self._lock:
+            self._window.append(values)
+        self._latencies.append(time.perf_counter_ns() - started)
+
+        if self.retrain_every:
+            self._since_train += 1
+            if self._since_train >= self.retrain_every:
+                self._since_train = 0
+                self._wakeup.set()
+        return label, score
+
+    def replay(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Score rows in order, returning labels on the rows without missing features.
+        """
+        subset = df[self.features].dropna()
+        labels = [self.score(row)[0] for row in subset.to_numpy(dtype=np.float64)]
+        return pd.Series(labels, index=subset.index, dtype=np.int64)
+
+    def latency(self) -> dict:
+        """
+        Scoring latency percentiles in microseconds over the recent calls.
+        """
+        samples = np.array(self._latencies, dtype=np.float64) / 1000
+        if samples.size == 0:
+            return {"count": 0, "p50_us": float("nan"), "p99_us": float("nan")}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {"count": int(samples.size), "p50_us": float(p50), "p99_us": float(p99)}
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep scoring with the previous model
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f" Background retrain failed: {self.last_error}")
+
+    def start(self) -> "StreamingAnomalyScorer":
+        """
+        Start the background retraining thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="anomaly-retrain", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
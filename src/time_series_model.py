@@ -1,6 +1,28 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
 import pandas as pd
-from prophet import Prophet
-import matplotlib.pyplot as plt
+
+from config import CACHE_DIR
+
+# Columns every forecasting backend returns
+FORECAST_COLUMNS = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+# Prophet's default uncertainty interval is 80%
+INTERVAL_Z = 1.2816
+
+# Smoothing parameter grid searched by the ETS backend
+ETS_ALPHAS = np.linspace(0.05, 1.0, 20)
+ETS_BETAS = np.array([0.0, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3])
+
+# Bounds of the on-disk forecast cache: files unused for this long are
+# dropped, then the least recently used ones until the total fits
+FORECAST_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+FORECAST_CACHE_MAX_BYTES = 256 * 2 ** 20
 
 # Prepare data for Prophet model
 def prepare_prophet_data(series: pd.Series) -> pd.DataFrame:
@@ -20,7 +42,7 @@ def prepare_prophet_data(series: pd.Series) -> pd.DataFrame:
     return df
 
 # Train and forecast using Prophet
-def forecast_with_prophet(series: pd.Series, periods: int = 90, freq: str = 'D') -> pd.DataFrame:
+def forecast_with_prophet(series: pd.Series, periods: int = 90, freq: str = 'D', **model_params) -> pd.DataFrame:
     """
     Forecasts future values using Facebook Prophet.
 
@@ -28,18 +50,226 @@ def forecast_with_prophet(series: pd.Series, periods: int = 90, freq: str = 'D')
         series (pd.Series): Time series to forecast
         periods (int): Number of future periods to forecast
         freq (str): Frequency (e.g. 'D' for daily)
+        **model_params: Extra Prophet arguments (default: daily_seasonality=True)
 
     Returns:
         pd.DataFrame: Forecast including yhat, yhat_lower, yhat_upper
     """
+    from prophet import Prophet
+
     df = prepare_prophet_data(series)
-    model = Prophet(daily_seasonality=True)
+    model = Prophet(**{'daily_seasonality': True, **model_params})
     model.fit(df)
 
     future = model.make_future_dataframe(periods=periods, freq=freq)
     forecast = model.predict(future)
     return forecast
 
+# Run Holt's linear smoothing for a whole parameter grid at once
+def _holt_grid_sse(y: np.ndarray, alphas: np.ndarray, betas: np.ndarray) -> np.ndarray:
+    """
+    One-step-ahead squared error of Holt's method for every (alpha, beta) pair.
+    The recursion runs once over time, vectorized across the grid.
+    """
+    level = np.full(alphas.shape, y[0])
+    trend = np.zeros(alphas.shape)
+    sse = np.zeros(alphas.shape)
+    gain = alphas * betas
+    for value in y[1:]:
+        err = value - (level + trend)
+        sse += err * err
+        level = level + trend + alphas * err
+        trend = trend + gain * err
+    return sse
+
+# Train and forecast using exponential smoothing
+def forecast_with_ets(series: pd.Series, periods: int = 90, freq: str = 'D',
+                      alphas: np.ndarray = ETS_ALPHAS, betas: np.ndarray = ETS_BETAS) -> pd.DataFrame:
+    """
+    Forecasts future values with Holt's linear exponential smoothing.
+
+    A lightweight alternative to Prophet: smoothing parameters are chosen by
+    a grid search on one-step-ahead error and the fit takes milliseconds.
+
+    Args:
+        series (pd.Series): Time series to forecast
+        periods (int): Number of future periods to forecast
+        freq (str): Frequency (e.g. 'D' for daily)
+        alphas (np.ndarray): Candidate level smoothing parameters
+        betas (np.ndarray): Candidate trend smoothing parameters
+
+    Returns:
+        pd.DataFrame: History and forecast with ds, yhat, yhat_lower, yhat_upper
+    """
+    df = prepare_prophet_data(series)
+    y = df['y'].to_numpy(dtype=float)
+    if len(y) < 3:
+        raise ValueError("At least 3 observations are required for exponential smoothing")
+
+    grid_a, grid_b = np.meshgrid(alphas, betas, indexing='ij')
+    sse = _holt_grid_sse(y, grid_a.ravel(), grid_b.ravel())
+    best = int(np.argmin(sse))
+    alpha, beta = grid_a.ravel()[best], grid_b.ravel()[best]
+
+    # Re-run the recursion for the chosen parameters to keep fitted values
+    fitted = np.empty_like(y)
+    level, trend = y[0], 0.0
+    fitted[0] = y[0]
+    for t in range(1, len(y)):
+        fitted[t] = level + trend
+        err = y[t] - fitted[t]
+        level = level + trend + alpha * err
+        trend = trend + alpha * beta * err
+    sigma = np.sqrt(sse[best] / (len(y) - 1))
+
+    # h-step variance of ETS(A,A,N): sigma^2 * (1 + sum_{j<h} (alpha + alpha*beta*j)^2)
+    steps = np.arange(1, periods + 1)
+    c = alpha + alpha * beta * np.arange(periods)
+    c[0] = 0.0
+    horizon_sd = sigma * np.sqrt(1 + np.cumsum(c ** 2))
+    future_yhat = level + steps * trend
+
+    future_ds = pd.date_range(df['ds'].max(), periods=periods + 1, freq=freq)[1:]
+    yhat = np.concatenate([fitted, future_yhat])
+    sd = np.concatenate([np.full(len(y), sigma), horizon_sd])
+    return pd.DataFrame({
+        'ds': pd.concat([df['ds'], pd.Series(future_ds)], ignore_index=True),
+        'yhat': yhat,
+        'yhat_lower': yhat - INTERVAL_Z * sd,
+        'yhat_upper': yhat + INTERVAL_Z * sd,
+    })
+
+FORECAST_BACKENDS = {
+    'prophet': forecast_with_prophet,
+    'ets': forecast_with_ets,
+}
+
+class ForecastCache:
+    """
+    Two-tier memo for forecasts: an in-memory LRU backed by Parquet files on disk.
+
+    The disk tier is an LRU too: a hit refreshes the file's modification
+    time, and every write prunes files unused for `max_age` seconds, then
+    the least recently used ones until the directory holds at most
+    `max_bytes`.
+
+    Args:
+        maxsize (int): Number of forecasts kept in memory
+        cache_dir (Path): Directory for the disk tier (None disables it)
+        max_age (float): Seconds a disk entry may go unused (None = no limit)
+        max_bytes (int): Size budget of the disk tier (None = no limit)
+    """
+
+    def __init__(self, maxsize: int = 64, cache_dir: Path = CACHE_DIR / "forecasts",
+                 max_age: float = FORECAST_CACHE_MAX_AGE, max_bytes: int = FORECAST_CACHE_MAX_BYTES):
+        self.maxsize = maxsize
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+
+    @staticmethod
+    def make_key(series: pd.Series, periods: int, freq: str, backend: str, params: dict) -> str:
+        h = hashlib.sha256()
+        h.update(pd.util.hash_pandas_object(series, index=True).to_numpy().tobytes())
+        h.update(json.dumps({'periods': periods, 'freq': freq, 'backend': backend, 'params': params},
+                            sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def get(self, key: str):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key].copy()
+        if self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.parquet"
+            try:
+                forecast = pd.read_parquet(path)
+                os.utime(path)
+            except FileNotFoundError:
+                # Missing, or pruned by another process in the meantime
+                return None
+            self._remember(key, forecast)
+            return forecast.copy()
+        return None
+
+    def put(self, key: str, forecast: pd.DataFrame) -> None:
+        self._remember(key, forecast)
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_dir / f"{key}.parquet.tmp"
+            forecast.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.cache_dir / f"{key}.parquet")
+            self.prune()
+
+    def prune(self) -> None:
+        """
+        Apply the disk tier's age and size limits.
+        """
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return
+        entries = []
+        for path in self.cache_dir.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        now, total = time.time(), sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            over = self.max_bytes is not None and total > self.max_bytes
+            if not expired and not over:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _remember(self, key: str, forecast: pd.DataFrame) -> None:
+        self._memory[key] = forecast.copy()
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+_FORECAST_CACHE = ForecastCache()
+
+# Forecast with a selectable backend, memoized
+def forecast_series(series: pd.Series, periods: int = 90, freq: str = 'D', backend: str = 'prophet',
+                    use_cache: bool = True, **model_params) -> pd.DataFrame:
+    """
+    Forecasts a series with the chosen backend, reusing cached results.
+
+    Results are memoized by (series hash, periods, freq, backend, model params)
+    in memory and on disk, so repeated requests return without refitting.
+
+    Args:
+        series (pd.Series): Time series to forecast
+        periods (int): Number of future periods to forecast
+        freq (str): Frequency (e.g. 'D' for daily)
+        backend (str): 'prophet' or 'ets'
+        use_cache (bool): Read and write the forecast cache
+        **model_params: Extra arguments for the backend
+
+    Returns:
+        pd.DataFrame: Forecast including ds, yhat, yhat_lower, yhat_upper
+    """
+    if backend not in FORECAST_BACKENDS:
+        raise ValueError(f"Unknown forecast backend: {backend}")
+
+    key = ForecastCache.make_key(series, periods, freq, backend, model_params) if use_cache else None
+    if key is not None:
+        cached = _FORECAST_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    forecast = FORECAST_BACKENDS[backend](series, periods=periods, freq=freq, **model_params)
+    if key is not None:
+        _FORECAST_CACHE.put(key, forecast)
+    return forecast
+
 # Plot forecast
 def plot_prophet_forecast(forecast: pd.DataFrame, title: str = "Prophet Forecast") -> None:
     """
@@ -49,6 +279,8 @@ def plot_prophet_forecast(forecast: pd.DataFrame, title: str = "Prophet Forecast
         forecast (pd.DataFrame): Prophet forecast output
         title (str): Title of the plot
     """
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.plot(forecast['ds'], forecast['yhat'], label='Prediction', color='blue')
     ax.fill_between(forecast['ds'], forecast['yhat_lower'], forecast['yhat_upper'], color='skyblue', alpha=0.3, label='Confidence Interval')
@@ -0,0 +1,152 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+from config import default_workers
+from data_loader import load_yahoo_data, load_many
+from feature_engineering import volatility_index
+from anomaly_detection import train_isolation_forest, load_or_train_isolation_forest, append_anomaly_column
+from time_series_model import forecast_series
+
+FORECAST_COLUMNS = ['yhat', 'yhat_lower', 'yhat_upper']
+
+
+# Run the single-ticker pipeline for one symbol (executed inside a worker process)
+def process_ticker(ticker: str, start_date: str, end_date: str, periods: int = 90,
+                   contamination: float = 0.05, models_dir=None, backend: str = 'prophet',
+                   use_cache: bool = True) -> pd.DataFrame:
+    """
+    Load -> volatility -> anomaly detection -> forecast for one ticker.
+
+    Args:
+        ticker (str): Ticker symbol
+        start_date (str): Start of the price history
+        end_date (str): End of the price history (exclusive)
+        periods (int): Forecast horizon in days
+        contamination (float): Expected proportion of anomalies
+        models_dir (Path): Persist/reuse models here; None always retrains
+        backend (str): Forecast backend ('prophet' or 'ets')
+        use_cache (bool): Reuse cached forecasts (see forecast_series)
+
+    Returns:
+        pd.DataFrame: One row per date with Close, Volatility, anomaly and forecast columns
+    """
+    prices = load_yahoo_data(ticker, start_date, end_date)
+    if prices.empty:
+        raise ValueError(f"No price data for {ticker}")
+    if isinstance(prices.columns, pd.MultiIndex):
+        prices.columns = [col[0] for col in prices.columns]
+
+    prices = prices[['Close']].copy()
+    prices['Volatility'] = volatility_index(prices['Close'])
+    clean = prices.dropna(subset=['Volatility'])
+
+    if models_dir is None:
+        model = train_isolation_forest(clean[['Volatility']], contamination=contamination)
+    else:
+        model = load_or_train_isolation_forest(clean[['Volatility']], contamination=contamination,
+                                               name=ticker, models_dir=models_dir)
+    anomalies = append_anomaly_column(clean.copy(), model, ['Volatility'])
+
+    forecast = forecast_series(prices['Close'], periods=periods, backend=backend, use_cache=use_cache)
+    forecast = forecast.set_index('ds')[FORECAST_COLUMNS]
+
+    table = anomalies.join(forecast, how='outer')
+    table.index.name = 'Date'
+    table.insert(0, 'Ticker', ticker)
+    return table.reset_index()
+
+
+# Same as process_ticker but never raises, so one bad symbol cannot sink the run
+def _safe_process_ticker(ticker: str, *args) -> tuple:
+    try:
+        return ticker, process_ticker(ticker, *args), None
+    except Exception as e:
+        return ticker, None, f"{type(e).__name__}: {e}"
+
+
+def run_universe(tickers: list, start_date: str, end_date: str, periods: int = 90,
+                 contamination: float = 0.05, max_workers: int = None, prefetch: bool = True,
+                 models_dir=None, backend: str = 'prophet', use_cache: bool = True) -> tuple:
+    """
+    Runs the per-ticker pipeline for a list of tickers across a process pool.
+
+    Args:
+        tickers (list): Ticker symbols
+        start_date (str): Start of the price history
+        end_date (str): End of the price history (exclusive)
+        periods (int): Forecast horizon in days
+        contamination (float): Expected proportion of anomalies
+        max_workers (int): Worker processes, defaults to the available CPUs
+        prefetch (bool): Warm the price cache with one batched download first
+        models_dir (Path): Persist/reuse per-ticker models here; None always retrains
+        backend (str): Forecast backend ('prophet' or 'ets')
+        use_cache (bool): Reuse cached forecasts
+
+    Returns:
+        tuple: (consolidated DataFrame, {ticker: error message}, throughput stats dict)
+    """
+    max_workers = max_workers or default_workers()
+    started = time.perf_counter()
+
+    # One batched download up front; workers then read prices from the disk cache
+    if prefetch:
+        load_many(tickers, start_date, end_date)
+
+    frames, errors = [], {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_safe_process_ticker, ticker, start_date, end_date, periods,
+                        contamination, models_dir, backend, use_cache): ticker
+            for ticker in tickers
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                _, table, error = future.result()
+            except Exception as e:
+                # e.g. a worker killed by the OS
+                table, error = None, f"{type(e).__name__}: {e}"
+            if error:
+                print(f" {ticker} failed: {error}")
+                errors[ticker] = error
+            else:
+                frames.append(table)
+
+    elapsed = time.perf_counter() - started
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    stats = {
+        "tickers": len(tickers),
+        "succeeded": len(frames),
+        "failed": len(errors),
+        "workers": max_workers,
+        "seconds": elapsed,
+        "tickers_per_sec": len(tickers) / elapsed if elapsed > 0 else float('nan'),
+    }
+    return table, errors, stats
+
+
+def scaling_report(tickers: list, start_date: str, end_date: str, worker_counts: list = None,
+                   periods: int = 90, backend: str = 'prophet') -> pd.DataFrame:
+    """
+    Measures throughput (tickers/sec) of run_universe for several worker counts.
+
+    Prices are prefetched once and the forecast cache is bypassed, so every
+    run pays for the same fits and measures the pool, not downloads or cache
+    hits.
+    """
+    if worker_counts is None:
+        cpus = default_workers()
+        worker_counts = sorted({1, 2, 4, 8, 16, cpus} & set(range(1, cpus + 1)))
+
+    load_many(tickers, start_date, end_date)
+    rows = []
+    for workers in worker_counts:
+        _, _, stats = run_universe(tickers, start_date, end_date, periods=periods,
+                                   max_workers=workers, prefetch=False, backend=backend, use_cache=False)
+        print(f" {workers:>3} worker(s): {stats['tickers_per_sec']:.2f} tickers/sec")
+        rows.append(stats)
+
+    report = pd.DataFrame(rows)
+    report['speedup'] = report['tickers_per_sec'] / report['tickers_per_sec'].iloc[0]
+    return report
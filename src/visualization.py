@@ -1,10 +1,66 @@
+import re
+from pathlib import Path
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objs as go
+
+from config import default_workers
+from downsampling import downsample
+
+# Plotting libraries are imported inside each function so importing this
+# module stays cheap for code paths that never draw.
+#
+# Every chart function takes an optional `save_path`. Without it the chart is
+# shown interactively as before; with it the chart is drawn on a bare
+# matplotlib Figure (Agg canvas, no pyplot window or global figure state),
+# written to the file and released, so it works on servers without a display
+# and inside worker processes.
+
+# Most points drawn per line; longer series are reduced with LTTB. Agg already
+# simplifies dense paths when rasterizing, so this mainly bounds vector output
+# (SVG/PDF) and keeps intraday-length series cheap to hand around
+MAX_PLOT_POINTS = 5000
+
+# Resolution of saved charts
+SAVE_DPI = 100
+
+# Fixed margins for saved charts. tight_layout measures every tick label and
+# cost more than drawing the data itself when rendering charts in bulk
+SAVE_MARGINS = dict(left=0.07, right=0.98, bottom=0.09, top=0.93)
+
+
+# New figure with one axes: a pyplot figure to show, or a headless one to save
+def _figure(figsize: tuple, save_path=None):
+    if save_path is None:
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=figsize)
+    else:
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize)
+    return fig, fig.add_subplot()
+
+
+# Show the figure, or write it to save_path and return the path
+def _finish(fig, save_path=None, dpi: int = SAVE_DPI, tight: bool = False):
+    if save_path is None:
+        import matplotlib.pyplot as plt
+
+        fig.tight_layout()
+        plt.show()
+        return None
+    if tight:
+        fig.tight_layout()
+    else:
+        fig.subplots_adjust(**SAVE_MARGINS)
+    save_path = Path(save_path)
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(save_path, dpi=dpi)
+    return save_path
+
 
 # Line chart for time series data
-def plot_market_index(df: pd.DataFrame, column: str = 'Close', title: str = "Market Index Over Time"):
+def plot_market_index(df: pd.DataFrame, column: str = 'Close', title: str = "Market Index Over Time",
+                      save_path=None, max_points: int = MAX_PLOT_POINTS):
     """
     Plots a simple time-series line chart.
 
@@ -12,86 +68,231 @@ def plot_market_index(df: pd.DataFrame, column: str = 'Close', title: str = "Mar
         df (pd.DataFrame): DataFrame with DateTime index
         column (str): Column to plot
         title (str): Chart title
+        save_path (Path): Write the chart here instead of showing it
+        max_points (int): Downsample longer series to about this many points (None = all)
     """
-    plt.figure(figsize=(12, 6))
-    plt.plot(df.index, df[column], label=column, color='blue')
-    plt.title(title)
-    plt.xlabel("Date")
-    plt.ylabel(column)
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    series = downsample(df[column], max_points)
+    fig, ax = _figure((12, 6), save_path)
+    ax.plot(series.index, series.to_numpy(), label=column, color='blue')
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel(column)
+    ax.grid(True)
+    ax.legend()
+    return _finish(fig, save_path)
 
 # Heatmap of risk scores
-def heatmap_of_risks(risk_df: pd.DataFrame, title: str = "Market Risk Heatmap"):
+def heatmap_of_risks(risk_df: pd.DataFrame, title: str = "Market Risk Heatmap", save_path=None):
     """
     Displays a heatmap of risk scores.
 
     Args:
         risk_df (pd.DataFrame): DataFrame of risk indicators
         title (str): Title for the heatmap
+        save_path (Path): Write the chart here instead of showing it
     """
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(risk_df.corr(), annot=True, cmap='coolwarm', fmt=".2f")
-    plt.title(title)
-    plt.tight_layout()
-    plt.show()
+    import seaborn as sns
+
+    fig, ax = _figure((10, 6), save_path)
+    sns.heatmap(risk_df.corr(), annot=True, cmap='coolwarm', fmt=".2f", ax=ax)
+    ax.set_title(title)
+    # Indicator names vary in length, so let the layout size the margins
+    return _finish(fig, save_path, tight=True)
 
 # Sentiment trend over time
-def show_sentiment_trends(df: pd.DataFrame, sentiment_col: str = 'sentiment_score'):
+def show_sentiment_trends(df: pd.DataFrame, sentiment_col: str = 'sentiment_score', save_path=None,
+                          max_points: int = MAX_PLOT_POINTS):
     """
     Plot sentiment score trend line.
 
     Args:
         df (pd.DataFrame): DataFrame with DateTime index
         sentiment_col (str): Column with sentiment scores
+        save_path (Path): Write the chart here instead of showing it
+        max_points (int): Downsample longer series to about this many points (None = all)
     """
-    plt.figure(figsize=(12, 6))
-    plt.plot(df.index, df[sentiment_col], color='purple', label='Sentiment')
-    plt.title(" Sentiment Score Over Time")
-    plt.xlabel("Date")
-    plt.ylabel("Sentiment Score")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    series = downsample(df[sentiment_col], max_points)
+    fig, ax = _figure((12, 6), save_path)
+    ax.plot(series.index, series.to_numpy(), color='purple', label='Sentiment')
+    ax.set_title(" Sentiment Score Over Time")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Sentiment Score")
+    ax.grid(True)
+    ax.legend()
+    return _finish(fig, save_path)
 
 # Anomaly visualization
-def plot_anomalies(df: pd.DataFrame, value_col: str, anomaly_col: str, title: str = "Anomalies Detected"):
+def plot_anomalies(df: pd.DataFrame, value_col: str, anomaly_col: str, title: str = "Anomalies Detected",
+                   save_path=None, max_points: int = MAX_PLOT_POINTS):
     """
     Plots time series data with anomaly markers.
 
+    The line is downsampled for drawing, but every anomaly is kept and
+    marked, so no flagged date disappears from the chart.
+
     Args:
         df (pd.DataFrame): DataFrame with values and anomaly flags
         value_col (str): Column name for values
         anomaly_col (str): Column name with anomaly (-1/1)
         title (str): Title of the plot
+        save_path (Path): Write the chart here instead of showing it
+        max_points (int): Downsample longer series to about this many points (None = all)
+    """
+    is_anomaly = (df[anomaly_col] == -1).to_numpy()
+    line = downsample(df[[value_col, anomaly_col]], max_points, column=value_col, keep=is_anomaly)
+    marks = df[is_anomaly]
+
+    fig, ax = _figure((12, 6), save_path)
+    ax.plot(line.index, line[value_col].to_numpy(), label=value_col, color='blue')
+    ax.scatter(marks.index, marks[value_col].to_numpy(), color='red', label='Anomaly', marker='x')
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel(value_col)
+    ax.grid(True)
+    ax.legend()
+    return _finish(fig, save_path)
+
+# Composite risk index over time
+def plot_risk_index(risk: pd.Series, title: str = "Market Risk Index", save_path=None,
+                    max_points: int = MAX_PLOT_POINTS):
+    """
+    Plots the 0-100 market risk score.
+
+    Args:
+        risk (pd.Series): Risk score with DateTime index
+        title (str): Title of the plot
+        save_path (Path): Write the chart here instead of showing it
+        max_points (int): Downsample longer series to about this many points (None = all)
+    """
+    series = downsample(risk.dropna(), max_points)
+    fig, ax = _figure((12, 6), save_path)
+    ax.plot(series.index, series.to_numpy(), color='darkred', label=risk.name or 'Risk')
+    ax.set_ylim(0, 100)
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Risk Score")
+    ax.grid(True)
+    ax.legend()
+    return _finish(fig, save_path)
+
+# Forecast with its uncertainty band
+def plot_forecast(forecast: pd.DataFrame, history: pd.Series = None, title: str = "Price Forecast",
+                  save_path=None, max_points: int = MAX_PLOT_POINTS):
+    """
+    Plots a forecast_series() result: yhat with the yhat_lower/yhat_upper band.
+
+    Args:
+        forecast (pd.DataFrame): Columns ds, yhat, yhat_lower, yhat_upper
+        history (pd.Series): Observed values to draw underneath (DateTime index)
+        title (str): Title of the plot
+        save_path (Path): Write the chart here instead of showing it
+        max_points (int): Downsample longer series to about this many points (None = all)
     """
-    plt.figure(figsize=(12, 6))
-    plt.plot(df.index, df[value_col], label=value_col, color='blue')
-    plt.scatter(df[df[anomaly_col] == -1].index,
-                df[df[anomaly_col] == -1][value_col],
-                color='red', label='Anomaly', marker='x')
-    plt.title(title)
-    plt.xlabel("Date")
-    plt.ylabel(value_col)
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    bands = downsample(forecast.set_index('ds')[['yhat', 'yhat_lower', 'yhat_upper']], max_points, column='yhat')
+    fig, ax = _figure((12, 6), save_path)
+    if history is not None:
+        observed = downsample(history.dropna(), max_points)
+        ax.plot(observed.index, observed.to_numpy(), color='gray', label='Observed')
+    ax.fill_between(bands.index, bands['yhat_lower'].to_numpy(), bands['yhat_upper'].to_numpy(),
+                    color='orange', alpha=0.3, label='Uncertainty')
+    ax.plot(bands.index, bands['yhat'].to_numpy(), color='darkorange', label='Forecast')
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price")
+    ax.grid(True)
+    ax.legend()
+    return _finish(fig, save_path)
 
 # Interactive plot (optional)
-def plotly_market_index(df: pd.DataFrame, column: str = 'Close', title: str = " Interactive Market Chart"):
+def plotly_market_index(df: pd.DataFrame, column: str = 'Close', title: str = " Interactive Market Chart",
+                        max_points: int = MAX_PLOT_POINTS, show: bool = True):
     """
     Uses Plotly to plot interactive line chart.
 
+    Every point is serialized into the page, so long series are downsampled
+    to keep the browser payload small.
+
     Args:
         df (pd.DataFrame): DataFrame with DateTime index
         column (str): Column to visualize
         title (str): Title of chart
+        max_points (int): Downsample longer series to about this many points (None = all)
+        show (bool): Display the figure; otherwise only return it (e.g. for st.plotly_chart)
+
+    Returns:
+        plotly.graph_objs.Figure: The chart.
     """
+    import plotly.graph_objs as go
+
+    series = downsample(df[column], max_points)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df.index, y=df[column], mode='lines', name=column))
+    fig.add_trace(go.Scatter(x=series.index, y=series.to_numpy(), mode='lines', name=column))
     fig.update_layout(title=title, xaxis_title="Date", yaxis_title=column, template='plotly_white')
-    fig.show()
+    if show:
+        fig.show()
+    return fig
+
+
+# Render one (function, kwargs) job; never raises (executed inside a worker process)
+def _render_job(job: tuple) -> tuple:
+    func, kwargs = job
+    try:
+        func(**kwargs)
+        return kwargs['save_path'], None
+    except Exception as e:
+        return kwargs.get('save_path'), f"{type(e).__name__}: {e}"
+
+
+def render_charts(jobs: list, max_workers: int = None) -> pd.DataFrame:
+    """
+    Write many charts to files using a pool of worker processes.
+
+    Args:
+        jobs (list): (chart function, kwargs) pairs; kwargs must include save_path.
+        max_workers (int): Worker processes (default: available CPUs; 1 renders in-process).
+
+    Returns:
+        pd.DataFrame: One row per job with 'path' and 'error' (None on success).
+    """
+    max_workers = max_workers or default_workers()
+    if max_workers == 1 or len(jobs) < 2:
+        results = [_render_job(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Batches amortise the pickling round-trip over several charts
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_render_job, jobs, chunksize=chunksize))
+    return pd.DataFrame(results, columns=['path', 'error'])
+
+
+def render_anomaly_charts(table: pd.DataFrame, output_dir, value_col: str = 'Volatility',
+                          anomaly_col: str = 'anomaly', ticker_col: str = 'Ticker', date_col: str = 'Date',
+                          max_points: int = MAX_PLOT_POINTS, max_workers: int = None) -> pd.DataFrame:
+    """
+    One anomaly chart per ticker from a long table such as universe_anomalies_forecast.
+
+    Args:
+        table (pd.DataFrame): Rows for many tickers (date as index or `date_col`).
+        output_dir (Path): Charts are written to <output_dir>/<ticker>.png, with
+            characters outside [A-Za-z0-9._-] replaced by '_' ('^GSPC' -> '_GSPC.png').
+        value_col, anomaly_col, ticker_col, date_col (str): Column names.
+        max_points (int): Downsampling target per chart.
+        max_workers (int): Worker processes.
+
+    Returns:
+        pd.DataFrame: render_charts() report.
+    """
+    if date_col in table.columns:
+        table = table.set_index(date_col)
+    table = table.dropna(subset=[value_col, anomaly_col])
+    jobs = []
+    for ticker, rows in table.groupby(ticker_col, sort=True, observed=True):
+        jobs.append((plot_anomalies, {
+            'df': rows[[value_col, anomaly_col]].sort_index(), 'value_col': value_col,
+            'anomaly_col': anomaly_col, 'title': f"{ticker} {value_col} anomalies",
+            'save_path': Path(output_dir) / f"{re.sub(r'[^A-Za-z0-9._-]', '_', str(ticker))}.png",
+            'max_points': max_points,
+        }))
+    return render_charts(jobs, max_workers=max_workers)
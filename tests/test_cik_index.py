@@ -0,0 +1,93 @@
+import json
+import requests
+import pytest
+
+from data_sources import sec_scraper
+from data_sources.sec_scraper import CikIndex
+
+COMPANIES = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+    "2": {"cik_str": 1652044, "ticker": "GOOGL", "title": "Alphabet Inc."},
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body: dict = None, headers: dict = None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """
+    Stands in for the shared SEC session and records every GET.
+    """
+
+    def __init__(self, response=None, error: Exception = None):
+        self.response = response
+        self.error = error
+        self.calls = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append((url, headers or {}))
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession(FakeResponse(200, COMPANIES, {"ETag": '"v1"'}))
+    monkeypatch.setattr(sec_scraper, "get_sec_session", lambda: fake)
+    return fake
+
+
+def test_lookups_hit_the_network_once(session, tmp_path):
+    index = CikIndex(path=tmp_path / "company_tickers.json", url="https://sec.test/company_tickers.json")
+    for _ in range(1000):
+        assert index.cik("aapl") == "0000320193"
+        assert index.name(789019) == "MICROSOFT CORP"
+    assert len(session.calls) == 1
+
+    # A second process starts from the disk copy without any request
+    reloaded = CikIndex(path=tmp_path / "company_tickers.json")
+    assert reloaded.resolve(["GOOGL", "NOPE"]) == {"GOOGL": "0001652044", "NOPE": None}
+    assert len(session.calls) == 1
+
+
+def test_stale_copy_is_revalidated_conditionally(session, tmp_path):
+    index = CikIndex(path=tmp_path / "company_tickers.json", max_age=0)
+    index.refresh()
+    session.response = FakeResponse(304)
+
+    assert index.refresh() is False
+    assert session.calls[-1][1]["If-None-Match"] == '"v1"'
+    assert index.cik("MSFT") == "0000789019"
+
+
+@pytest.mark.parametrize("failure", [
+    {"error": requests.ConnectionError("offline")},
+    {"response": FakeResponse(503)},
+])
+def test_failed_revalidation_serves_the_disk_copy(session, monkeypatch, tmp_path, failure):
+    path = tmp_path / "company_tickers.json"
+    CikIndex(path=path).refresh()
+
+    failing = FakeSession(**failure)
+    monkeypatch.setattr(sec_scraper, "get_sec_session", lambda: failing)
+    index = CikIndex(path=path, max_age=0)
+    for _ in range(100):
+        assert index.cik("AAPL") == "0000320193"
+    # Retried only after CIK_INDEX_RETRY, not on every lookup
+    assert len(failing.calls) == 1
+    assert json.loads(path.read_text())["tickers"]["MSFT"] == "0000789019"
+
+
+def test_failure_without_a_disk_copy_raises(monkeypatch, tmp_path):
+    monkeypatch.setattr(sec_scraper, "get_sec_session", lambda: FakeSession(error=requests.ConnectionError("offline")))
+    with pytest.raises(requests.ConnectionError):
+        CikIndex(path=tmp_path / "company_tickers.json").cik("AAPL")
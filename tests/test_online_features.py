@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engineering import volatility_index, moving_average, z_score, rolling_correlation
+from online_features import FeatureState
+
+WINDOWS = dict(vol_window=30, ma_window=20, z_window=30, corr_window=30)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range("2020-01-01", periods=400)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index)))), index=index)
+    other = pd.Series(50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index)))), index=index)
+    return prices, other
+
+
+def batch_features(prices: pd.Series, other: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Volatility": volatility_index(prices, window=WINDOWS["vol_window"]),
+        "MovingAverage": moving_average(prices, window=WINDOWS["ma_window"]),
+        "ZScore": z_score(prices, window=WINDOWS["z_window"]),
+        "Correlation": rolling_correlation(prices, other, window=WINDOWS["corr_window"]),
+    })
+
+
+def assert_matches_batch(streamed: pd.DataFrame, prices: pd.Series, other: pd.Series) -> None:
+    expected = batch_features(prices, other)
+    for column in expected.columns:
+        np.testing.assert_allclose(streamed[column].to_numpy(), expected[column].to_numpy(),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column)
+
+
+def test_update_many_matches_batch(series):
+    prices, other = series
+    assert_matches_batch(FeatureState(**WINDOWS).update_many(prices, other), prices, other)
+
+
+def test_nan_inputs_match_batch(series):
+    prices, other = series
+    prices, other = prices.copy(), other.copy()
+    prices.iloc[[50, 51, 200]] = np.nan
+    other.iloc[[120, 300]] = np.nan
+
+    streamed = FeatureState(**WINDOWS).update_many(prices, other)
+    assert_matches_batch(streamed, prices, other)
+    # Windows recover once the gap has rolled out
+    assert streamed["MovingAverage"].iloc[51 + WINDOWS["ma_window"]:200].notna().all()
+
+
+def test_save_load_resumes_midstream(series, tmp_path):
+    prices, other = series
+    split = 173
+    state = FeatureState(**WINDOWS)
+    head = state.update_many(prices.iloc[:split], other.iloc[:split])
+    state.save(tmp_path / "state.json")
+
+    resumed = FeatureState.load(tmp_path / "state.json")
+    tail = resumed.update_many(prices.iloc[split:], other.iloc[split:])
+    assert_matches_batch(pd.concat([head, tail]), prices, other)
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from sentiment import LEXICON, LexiconScorer
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return LexiconScorer()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Fed announces a rate hike", LEXICON["rate hike"]),
+    ("Markets cheer the RATE CUT", LEXICON["rate cut"]),
+    ("another hike", LEXICON["hike"]),
+    ("budget cut", LEXICON["cut"]),
+    # The bigram and a separate occurrence of its word both count, once each
+    ("rate hike today, another hike next month", (LEXICON["rate hike"] + LEXICON["hike"]) / 2),
+    ("rate cut fuels a rally", (LEXICON["rate cut"] + LEXICON["rally"]) / 2),
+    ("nothing to see here", 0.0),
+])
+def test_bigrams_are_not_double_counted(scorer, text, expected):
+    assert scorer.score([text])[0] == pytest.approx(expected, abs=1e-6)
+
+
+def test_scores_do_not_depend_on_batch_size(scorer):
+    texts = ["rate hike fears", "rally after rate cut", None, "crash", "cut cut rate cut"] * 7
+    np.testing.assert_array_equal(scorer.score(texts, batch_size=3), scorer.score(texts))